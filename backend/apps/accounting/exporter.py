@@ -0,0 +1,84 @@
+"""Streaming export of the transaction ledger."""
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator
+
+EXPORT_FIELDS = [
+    ("id", "id"),
+    ("description", "description"),
+    ("amount", "amount"),
+    ("debit_account", "debit_account_id"),
+    ("credit_account", "credit_account_id"),
+    ("category", "category_id"),
+    ("journal", "journal_id"),
+    ("date", "date"),
+]
+HEADERS = [name for name, _ in EXPORT_FIELDS]
+ROWS_PER_CHUNK = 500
+
+
+def iter_rows(queryset, chunk_size: int = 2000) -> Iterator[tuple]:
+    """Yield export tuples in ``id`` order, one keyset page at a time.
+
+    Each page is a separate ``id > last`` query, so memory stays flat even
+    on drivers such as mysqlclient that buffer a whole result set.
+    """
+    columns = [column for _, column in EXPORT_FIELDS]
+    last_id = 0
+    while True:
+        page = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list(*columns)[:chunk_size]
+        )
+        yield from page
+        if len(page) < chunk_size:
+            return
+        last_id = page[-1][0]
+
+
+def _batched(rows: Iterable[tuple]) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == ROWS_PER_CHUNK:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    """Render rows as properly quoted CSV text, a batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADERS)
+    yield buffer.getvalue()
+    for batch in _batched(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            ["" if value is None else value for value in row] for row in batch
+        )
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(rows: Iterable[tuple]) -> Iterator[str]:
+    """Render rows as newline-delimited JSON objects."""
+    for batch in _batched(rows):
+        yield "".join(
+            json.dumps(dict(zip(HEADERS, row)), default=str) + "\n" for row in batch
+        )
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,160 @@
+"""Month-by-month balance projection for a family's accounts.
+
+Amounts are carried as integer cents and each month is applied to every
+account in one pass, so a projection is a handful of list operations per
+month rather than a loop of ``Decimal`` arithmetic per account.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Account, InterestPosting, Transaction
+from .services import INTEREST_INCOME_NAME
+
+RATE_UNITS = 10_000  # Account.interest_rate has four decimal places.
+
+
+def _cents(amount) -> int:
+    return int(Decimal(amount) * 100)
+
+
+def _format(cents: int) -> str:
+    whole, part = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{whole}.{part:02d}"
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_interest(cents: int, rate: int) -> int:
+    """Interest on a positive balance, rounded half-even to the cent.
+
+    Matches ``(balance * interest_rate).quantize(Decimal("0.01"))`` as used
+    by ``post_monthly_interest``.
+    """
+    whole, rest = divmod(cents * rate, RATE_UNITS)
+    if rest * 2 > RATE_UNITS or (rest * 2 == RATE_UNITS and whole % 2):
+        whole += 1
+    return whole
+
+
+def recurring_flows(
+    family_id: int, *, lookback: int = 3, today: date | None = None
+) -> dict[int, int]:
+    """Average monthly net flow in cents per account from recurring lines.
+
+    A line recurs when the same account and description appear in every
+    one of the last ``lookback`` full months. Interest postings are left
+    out because the projection compounds interest itself.
+    """
+    today = today or timezone.localdate()
+    end = today.replace(day=1)
+    start = _add_months(end, -lookback)
+    txs = (
+        Transaction.objects.filter(family_id=family_id, date__gte=start, date__lt=end)
+        .exclude(
+            journal_id__in=InterestPosting.objects.filter(
+                family_id=family_id, journal__isnull=False
+            ).values("journal_id")
+        )
+        .annotate(month=TruncMonth("date"))
+        .order_by()
+    )
+    months: dict[tuple, set] = defaultdict(set)
+    totals: dict[tuple, int] = defaultdict(int)
+    for field, sign in (("debit_account_id", 1), ("credit_account_id", -1)):
+        for account_id, description, month, total in txs.values_list(
+            field, "description", "month"
+        ).annotate(total=Sum("amount")):
+            key = (account_id, description)
+            months[key].add(month)
+            totals[key] += sign * _cents(total)
+    flows: dict[int, int] = defaultdict(int)
+    for key, seen in months.items():
+        if len(seen) == lookback:
+            flows[key[0]] += totals[key]
+    return {account_id: round(total / lookback) for account_id, total in flows.items()}
+
+
+def project(
+    balances: list[int],
+    rates: list[int],
+    flows: list[int],
+    months: int,
+    *,
+    income_index: int | None = None,
+) -> list[list[int]]:
+    """Return the balances (cents) at the end of each projected month.
+
+    Each month first pays interest on positive balances, as the monthly
+    interest task does on the 1st, crediting the total to ``income_index``
+    when given, then adds every account's flow.
+    """
+    current = list(balances)
+    compounding = [index for index, rate in enumerate(rates) if rate > 0]
+    series = []
+    for _ in range(months):
+        interest = {
+            index: monthly_interest(current[index], rates[index])
+            for index in compounding
+            if current[index] > 0
+        }
+        current = [balance + flow for balance, flow in zip(current, flows)]
+        for index, amount in interest.items():
+            current[index] += amount
+        if income_index is not None:
+            current[income_index] -= sum(interest.values())
+        series.append(current)
+    return series
+
+
+def forecast(family_id: int, months: int, *, today: date | None = None) -> dict:
+    """Project every account of a family ``months`` months ahead.
+
+    The first projected month is next month; amounts are decimal strings.
+    """
+    today = today or timezone.localdate()
+    accounts = list(
+        Account.objects.filter(family_id=family_id)
+        .order_by("id")
+        .values_list(
+            "id", "name", "type", "interest_rate", "debit_total", "credit_total"
+        )
+    )
+    flows = recurring_flows(family_id, today=today)
+    income_index = next(
+        (
+            index
+            for index, (_, name, type_, *_rest) in enumerate(accounts)
+            if name == INTEREST_INCOME_NAME and type_ == Account.Type.INCOME
+        ),
+        None,
+    )
+    series = project(
+        [_cents(debit) - _cents(credit) for *_, debit, credit in accounts],
+        [int(rate * RATE_UNITS) for _, _, _, rate, _, _ in accounts],
+        [flows.get(account[0], 0) for account in accounts],
+        months,
+        income_index=income_index,
+    )
+    by_account = list(zip(*series)) if series else [()] * len(accounts)
+    first = _add_months(today.replace(day=1), 1)
+    return {
+        "months": [_add_months(first, offset) for offset in range(months)],
+        "accounts": [
+            {
+                "id": account_id,
+                "name": name,
+                "monthly_flow": _format(flows.get(account_id, 0)),
+                "balances": [_format(cents) for cents in balances],
+            }
+            for (account_id, name, *_), balances in zip(accounts, by_account)
+        ],
+    }
@@ -0,0 +1,165 @@
+"""Streaming CSV import of transactions."""
+
+import codecs
+import csv
+from typing import Callable, Iterable, Iterator, Mapping
+
+from django.core.exceptions import ValidationError
+from django.db import transaction as db_tx
+
+from .models import Account, Category, Journal, Transaction
+from .suggestions import suggestions
+
+MAX_REPORTED_ERRORS = 100
+# Minimum suggestion score for filling in a missing category.
+AUTO_CATEGORY_MIN_SCORE = 0.5
+
+
+def read_csv_rows(uploaded, encoding: str = "utf-8-sig") -> Iterator[dict]:
+    """Yield dict rows from an uploaded file without loading it whole."""
+    return csv.DictReader(codecs.iterdecode(uploaded, encoding))
+
+
+class TransactionImporter:
+    """Validate and bulk insert CSV rows for a single family.
+
+    Account, category and journal ids are loaded once per import, so
+    validating a row never touches the database. Rows are inserted with
+    ``bulk_create`` in chunks, each chunk in its own atomic block; invalid
+    rows are reported and skipped rather than aborting the file. With
+    ``auto_categorize`` rows without a category get the family's top
+    category suggestion when it is confident enough.
+    """
+
+    def __init__(self, family, *, chunk_size: int = 1000, auto_categorize=False):
+        self.family = family
+        self.chunk_size = chunk_size
+        self.suggester = suggestions.get(family.pk) if auto_categorize else None
+        self.account_ids = set(
+            Account.objects.filter(family=family).values_list("id", flat=True)
+        )
+        self.category_ids = set(
+            Category.objects.filter(family=family).values_list("id", flat=True)
+        )
+        self.journal_ids = set(
+            Journal.objects.filter(family=family).values_list("id", flat=True)
+        )
+        self.created = 0
+        self.failed = 0
+        self.categorized = 0
+        self.errors: list[dict] = []
+
+    def _lookup(self, row: Mapping, key: str, ids: set, errors: list, *, required):
+        raw = (row.get(key) or "").strip()
+        if not raw:
+            if required:
+                errors.append(f"{key}: this field is required.")
+            return None
+        try:
+            value = int(raw)
+        except ValueError:
+            errors.append(f"{key}: '{raw}' is not a valid id.")
+            return None
+        if value not in ids:
+            errors.append(f"{key}: {value} does not belong to this family.")
+            return None
+        return value
+
+    def parse_row(self, row: Mapping) -> Transaction:
+        """Build an unsaved transaction, raising ``ValidationError`` if bad."""
+        errors: list[str] = []
+        values = {}
+        for name in ("description", "amount", "date"):
+            raw = (row.get(name) or "").strip()
+            if name == "date" and not raw:
+                continue
+            try:
+                values[name] = Transaction._meta.get_field(name).clean(raw, None)
+            except ValidationError as exc:
+                errors.extend(f"{name}: {message}" for message in exc.messages)
+        debit = self._lookup(
+            row, "debit_account", self.account_ids, errors, required=True
+        )
+        credit = self._lookup(
+            row, "credit_account", self.account_ids, errors, required=True
+        )
+        category = self._lookup(
+            row, "category", self.category_ids, errors, required=False
+        )
+        journal = self._lookup(row, "journal", self.journal_ids, errors, required=False)
+        if debit is not None and debit == credit:
+            errors.append("Debit and credit accounts cannot be the same.")
+        if values.get("amount") is not None and values["amount"] <= 0:
+            errors.append("Transaction amount must be positive.")
+        if errors:
+            raise ValidationError(errors)
+        if category is None and self.suggester is not None:
+            category = self._suggest_category(values["description"])
+        return Transaction(
+            family=self.family,
+            debit_account_id=debit,
+            credit_account_id=credit,
+            category_id=category,
+            journal_id=journal,
+            **values,
+        )
+
+    def _suggest_category(self, description: str) -> int | None:
+        for category_id, score in self.suggester.suggest(description, limit=1):
+            if score >= AUTO_CATEGORY_MIN_SCORE and category_id in self.category_ids:
+                self.categorized += 1
+                return category_id
+        return None
+
+    def _record_error(self, row_number: int, exc: ValidationError) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": exc.messages})
+
+    def _flush(
+        self, pending: list[Transaction], start: int, consumed: int, on_chunk, claim
+    ) -> None:
+        with db_tx.atomic():
+            if claim:
+                claim(start)
+            Transaction.objects.bulk_create(pending)
+            self.created += len(pending)
+            if on_chunk:
+                on_chunk(consumed)
+
+    def run(
+        self,
+        rows: Iterable[Mapping],
+        *,
+        offset: int = 0,
+        on_chunk: Callable[[int], None] | None = None,
+        claim: Callable[[int], None] | None = None,
+    ) -> dict:
+        """Import ``rows`` and return a summary of the run.
+
+        Row numbers in the reported errors count data rows from 1, shifted
+        by ``offset`` when resuming part way through a file. ``on_chunk`` is
+        called with the total rows consumed inside each chunk's atomic
+        block, so progress recorded there commits together with the rows.
+        ``claim`` is called in the same block before the insert with the
+        rows consumed before the chunk; raising there discards the chunk.
+        """
+        pending: list[Transaction] = []
+        number = start = offset
+        for number, row in enumerate(rows, start=offset + 1):
+            try:
+                pending.append(self.parse_row(row))
+            except ValidationError as exc:
+                self._record_error(number, exc)
+            if (number - offset) % self.chunk_size == 0:
+                self._flush(pending, start, number, on_chunk, claim)
+                pending = []
+                start = number
+        if (number - offset) % self.chunk_size:
+            self._flush(pending, start, number, on_chunk, claim)
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "categorized": self.categorized,
+            "errors": self.errors,
+        }
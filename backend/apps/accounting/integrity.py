@@ -0,0 +1,168 @@
+"""Ledger invariant checks, sharded by family across worker processes."""
+
+import os
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+from typing import Iterable, Iterator, NamedTuple
+
+from django.db import connections
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Account, BalanceCheckpoint, Transaction
+
+ZERO = Decimal("0.00")
+# Offending rows reported per check and family before the rest are counted.
+MAX_ROWS_PER_CHECK = 100
+
+
+class Finding(NamedTuple):
+    family_id: int
+    check: str
+    object_id: int | None
+    detail: str
+
+
+def _row_checks(family_id: int):
+    txs = Transaction.objects.filter(family_id=family_id).order_by("id")
+    return {
+        "same_account": txs.filter(debit_account_id=F("credit_account_id")),
+        "non_positive_amount": txs.filter(amount__lte=0),
+        "foreign_account": txs.filter(
+            ~Q(debit_account__family_id=family_id)
+            | ~Q(credit_account__family_id=family_id)
+        ),
+    }
+
+
+def _monthly_totals(family_id: int) -> dict[int, list[tuple]]:
+    """Per-account ``(month, debit, credit)`` running totals, oldest first.
+
+    One grouped query per side gives both the current totals (the last
+    entry) and the totals at any checkpoint date.
+    """
+    accounts = Account.objects.filter(family_id=family_id).values("id")
+    months: dict[int, dict] = defaultdict(lambda: defaultdict(lambda: [ZERO, ZERO]))
+    for side, field in enumerate(("debit_account_id", "credit_account_id")):
+        rows = (
+            Transaction.objects.filter(**{f"{field}__in": accounts})
+            .annotate(month=TruncMonth("date"))
+            .order_by()
+            .values_list(field, "month")
+            .annotate(total=Sum("amount"))
+        )
+        for account_id, month, total in rows:
+            months[account_id][month][side] += total
+    running = {}
+    for account_id, by_month in months.items():
+        debit = credit = ZERO
+        entries = []
+        for month in sorted(by_month):
+            debit += by_month[month][0]
+            credit += by_month[month][1]
+            entries.append((month, debit, credit))
+        running[account_id] = entries
+    return running
+
+
+def _totals_through(entries: list[tuple], day) -> tuple[Decimal, Decimal]:
+    index = bisect_right(entries, day.replace(day=1), key=lambda entry: entry[0])
+    return entries[index - 1][1:] if index else (ZERO, ZERO)
+
+
+def check_family(family_id: int, *, limit: int = MAX_ROWS_PER_CHECK) -> list[Finding]:
+    """Return every invariant violation in one family's ledger.
+
+    Transactions must move money between two different accounts of their
+    own family and have a positive amount. Each account's stored totals,
+    and every balance checkpoint, must match the totals recomputed from
+    the transactions.
+    """
+    findings = []
+    for check, queryset in _row_checks(family_id).items():
+        rows = list(
+            queryset.values_list(
+                "id", "amount", "debit_account_id", "credit_account_id"
+            )[: limit + 1]
+        )
+        for pk, amount, debit_id, credit_id in rows[:limit]:
+            findings.append(
+                Finding(
+                    family_id,
+                    check,
+                    pk,
+                    f"amount {amount}, debit {debit_id}, credit {credit_id}",
+                )
+            )
+        if len(rows) > limit:
+            findings.append(
+                Finding(
+                    family_id,
+                    check,
+                    None,
+                    f"{queryset.count() - limit} more transaction(s) not listed",
+                )
+            )
+
+    running = _monthly_totals(family_id)
+    for pk, debit, credit in Account.objects.filter(family_id=family_id).values_list(
+        "id", "debit_total", "credit_total"
+    ):
+        entries = running.get(pk)
+        expected = entries[-1][1:] if entries else (ZERO, ZERO)
+        if (debit, credit) != expected:
+            findings.append(
+                Finding(
+                    family_id,
+                    "account_totals",
+                    pk,
+                    f"stored {debit}/{credit}, ledger {expected[0]}/{expected[1]}",
+                )
+            )
+    checkpoints = BalanceCheckpoint.objects.filter(
+        account__family_id=family_id
+    ).values_list("id", "account_id", "date", "debit_total", "credit_total")
+    for pk, account_id, day, debit, credit in checkpoints:
+        expected = _totals_through(running.get(account_id, []), day)
+        if (debit, credit) != tuple(expected):
+            findings.append(
+                Finding(
+                    family_id,
+                    "checkpoint",
+                    pk,
+                    f"account {account_id} @ {day}: stored {debit}/{credit}, "
+                    f"ledger {expected[0]}/{expected[1]}",
+                )
+            )
+    return findings
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+
+
+def check_ledger(
+    family_ids: Iterable[int], *, workers: int | None = None
+) -> Iterator[Finding]:
+    """Yield findings for each family as soon as its check completes.
+
+    Families are spread over ``workers`` processes (one per CPU by
+    default); with a single worker they are checked in this process.
+    """
+    family_ids = list(family_ids)
+    workers = min(workers or os.cpu_count() or 1, len(family_ids))
+    if workers <= 1:
+        for family_id in family_ids:
+            yield from check_family(family_id)
+        return
+    connections.close_all()
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(check_family, family_id) for family_id in family_ids]
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,42 @@
+"""Verify ledger invariants for every family."""
+
+from apps.families.models import Family
+from django.core.management.base import BaseCommand, CommandError
+
+from ...integrity import check_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that transactions are well formed and that stored account "
+        "totals and balance checkpoints match the ledger."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--family",
+            type=int,
+            action="append",
+            help="Only check this family id (may be repeated).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes to spread families over (default: CPU count).",
+        )
+
+    def handle(self, *args, **options):
+        family_ids = options["family"] or Family.objects.order_by("id").values_list(
+            "id", flat=True
+        )
+        found = 0
+        for finding in check_ledger(family_ids, workers=options["workers"]):
+            found += 1
+            target = f" {finding.object_id}" if finding.object_id else ""
+            self.stdout.write(
+                f"family {finding.family_id} {finding.check}{target}: "
+                f"{finding.detail}"
+            )
+        if found:
+            raise CommandError(f"{found} ledger problem(s) found")
+        self.stdout.write(self.style.SUCCESS("Ledger is consistent"))
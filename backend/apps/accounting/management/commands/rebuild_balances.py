@@ -0,0 +1,47 @@
+"""Rebuild or verify the materialised account balances."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction as db_tx
+
+from ...models import Account
+from ...services import find_balance_drift, recompute_account_totals
+
+
+class Command(BaseCommand):
+    help = "Recompute stored account totals from the transaction ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report accounts whose stored totals are out of date.",
+        )
+        parser.add_argument(
+            "--family", type=int, help="Restrict the run to a single family id."
+        )
+
+    def handle(self, *args, **options):
+        account_ids = None
+        if options["family"] is not None:
+            account_ids = list(
+                Account.objects.filter(family_id=options["family"]).values_list(
+                    "id", flat=True
+                )
+            )
+
+        if options["verify"]:
+            drift = find_balance_drift(account_ids)
+            for account, debit, credit in drift:
+                self.stdout.write(
+                    f"account {account.pk} (family {account.family_id}): "
+                    f"stored {account.debit_total}/{account.credit_total}, "
+                    f"ledger {debit}/{credit}"
+                )
+            if drift:
+                raise CommandError(f"{len(drift)} account(s) out of date")
+            self.stdout.write(self.style.SUCCESS("All account balances match"))
+            return
+
+        with db_tx.atomic():
+            changed = recompute_account_totals(account_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(changed)} account(s)"))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 07:28
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_totals(apps, schema_editor):
+    Account = apps.get_model("accounting", "Account")
+    Transaction = apps.get_model("accounting", "Transaction")
+    debits = dict(
+        Transaction.objects.order_by()
+        .values_list("debit_account_id")
+        .annotate(total=Sum("amount"))
+    )
+    credits = dict(
+        Transaction.objects.order_by()
+        .values_list("credit_account_id")
+        .annotate(total=Sum("amount"))
+    )
+    accounts = []
+    for account in Account.objects.filter(pk__in=set(debits) | set(credits)):
+        account.debit_total = debits.get(account.pk, 0)
+        account.credit_total = credits.get(account.pk, 0)
+        accounts.append(account)
+    Account.objects.bulk_update(accounts, ["debit_total", "credit_total"], 500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0002_account_assets_account_interest_rate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="credit_total",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=14
+            ),
+        ),
+        migrations.AddField(
+            model_name="account",
+            name="debit_total",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=14
+            ),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-18 07:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_dates(apps, schema_editor):
+    Transaction = apps.get_model("accounting", "Transaction")
+    Transaction.objects.update(date=TruncDate("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0003_account_totals"),
+        ("families", "0002_alter_invitation_code"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="date",
+            field=models.DateField(
+                db_index=True, default=django.utils.timezone.localdate
+            ),
+        ),
+        migrations.RunPython(backfill_dates, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="BalanceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField()),
+                ("debit_total", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("credit_total", models.DecimalField(decimal_places=2, max_digits=14)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="checkpoints",
+                        to="accounting.account",
+                    ),
+                ),
+                (
+                    "family",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(app_label)s_%(class)ss",
+                        to="families.family",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("account", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0005_importjob"),
+        ("families", "0002_alter_invitation_code"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="importjob",
+            index=models.Index(
+                fields=["family", "created_at"], name="acct_import_family_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["family", "date"], name="acct_tx_family_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["family", "category"], name="acct_tx_family_category_idx"
+            ),
+        ),
+    ]
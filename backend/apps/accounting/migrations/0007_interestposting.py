@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-18 07:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0006_tenant_indexes"),
+        ("families", "0002_alter_invitation_code"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InterestPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("period", models.DateField(help_text="First day of the month paid")),
+                (
+                    "family",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(app_label)s_%(class)ss",
+                        to="families.family",
+                    ),
+                ),
+                (
+                    "journal",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="accounting.journal",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("family", "period")},
+            },
+        ),
+    ]
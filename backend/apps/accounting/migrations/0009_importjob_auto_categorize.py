@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0008_daily_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="auto_categorize",
+            field=models.BooleanField(
+                default=False, help_text="Fill missing categories from suggestions"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+"""Full-text indexes over transaction descriptions and journal memos.
+
+MySQL gets InnoDB FULLTEXT indexes, which the engine keeps current. SQLite
+gets an FTS5 table keyed by transaction id, kept current by triggers so
+bulk inserts, cascades and raw updates are covered as well.
+"""
+
+from django.db import migrations
+
+MYSQL_FORWARD = [
+    "CREATE FULLTEXT INDEX acct_tx_description_ft"
+    " ON accounting_transaction (description)",
+    "CREATE FULLTEXT INDEX acct_journal_memo_ft ON accounting_journal (memo)",
+]
+MYSQL_BACKWARD = [
+    "DROP INDEX acct_tx_description_ft ON accounting_transaction",
+    "DROP INDEX acct_journal_memo_ft ON accounting_journal",
+]
+
+MEMO = "COALESCE((SELECT memo FROM accounting_journal WHERE id = {}), '')"
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE accounting_transaction_fts"
+    " USING fts5(description, memo, tokenize = 'unicode61')",
+    "INSERT INTO accounting_transaction_fts (rowid, description, memo)"
+    f" SELECT t.id, t.description, {MEMO.format('t.journal_id')}"
+    " FROM accounting_transaction t",
+    "CREATE TRIGGER accounting_transaction_fts_insert"
+    " AFTER INSERT ON accounting_transaction BEGIN"
+    " INSERT INTO accounting_transaction_fts (rowid, description, memo)"
+    f" VALUES (new.id, new.description, {MEMO.format('new.journal_id')});"
+    " END",
+    "CREATE TRIGGER accounting_transaction_fts_update"
+    " AFTER UPDATE OF description, journal_id ON accounting_transaction BEGIN"
+    " DELETE FROM accounting_transaction_fts WHERE rowid = old.id;"
+    " INSERT INTO accounting_transaction_fts (rowid, description, memo)"
+    f" VALUES (new.id, new.description, {MEMO.format('new.journal_id')});"
+    " END",
+    "CREATE TRIGGER accounting_transaction_fts_delete"
+    " AFTER DELETE ON accounting_transaction BEGIN"
+    " DELETE FROM accounting_transaction_fts WHERE rowid = old.id;"
+    " END",
+    "CREATE TRIGGER accounting_journal_fts_update"
+    " AFTER UPDATE OF memo ON accounting_journal BEGIN"
+    " UPDATE accounting_transaction_fts SET memo = new.memo WHERE rowid IN"
+    " (SELECT id FROM accounting_transaction WHERE journal_id = new.id);"
+    " END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER accounting_journal_fts_update",
+    "DROP TRIGGER accounting_transaction_fts_delete",
+    "DROP TRIGGER accounting_transaction_fts_update",
+    "DROP TRIGGER accounting_transaction_fts_insert",
+    "DROP TABLE accounting_transaction_fts",
+]
+
+STATEMENTS = {
+    "mysql": (MYSQL_FORWARD, MYSQL_BACKWARD),
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def run(direction):
+    def operation(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        for sql in statements[direction] if statements else ():
+            schema_editor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0009_importjob_auto_categorize"),
+    ]
+
+    operations = [
+        migrations.RunPython(run(0), run(1)),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2 on 2026-10-18 07:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0010_transaction_search"),
+        ("families", "0002_alter_invitation_code"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Budget",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=255)),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=14)),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("month", "Monthly"), ("year", "Yearly")],
+                        default="month",
+                        max_length=5,
+                    ),
+                ),
+                ("period_start", models.DateField(editable=False)),
+                (
+                    "spent",
+                    models.DecimalField(
+                        decimal_places=2, default=0, editable=False, max_digits=14
+                    ),
+                ),
+                (
+                    "notified_period",
+                    models.DateField(blank=True, editable=False, null=True),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="budgets",
+                        to="accounting.account",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="budgets",
+                        to="accounting.category",
+                    ),
+                ),
+                (
+                    "family",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(app_label)s_%(class)ss",
+                        to="families.family",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(
+                                ("account__isnull", False), ("category__isnull", True)
+                            ),
+                            models.Q(
+                                ("account__isnull", True), ("category__isnull", False)
+                            ),
+                            _connector="OR",
+                        ),
+                        name="acct_budget_category_xor_account",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 08:36
+
+from django.db import migrations
+
+
+def queue_unsummarised_days(apps, schema_editor):
+    """Queue the days above the old high-water mark; inserts queue their own."""
+    SummaryState = apps.get_model("accounting", "SummaryState")
+    StaleSummaryDay = apps.get_model("accounting", "StaleSummaryDay")
+    Transaction = apps.get_model("accounting", "Transaction")
+    state = SummaryState.objects.filter(pk=1).first()
+    days = (
+        Transaction.objects.filter(id__gt=state.last_transaction_id if state else 0)
+        .order_by()
+        .values_list("family_id", "date")
+        .distinct()
+    )
+    StaleSummaryDay.objects.bulk_create(
+        [StaleSummaryDay(family_id=family_id, date=day) for family_id, day in days],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0011_budget"),
+    ]
+
+    operations = [
+        migrations.RunPython(queue_unsummarised_days, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="summarystate",
+            name="last_transaction_id",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0012_summary_days_on_insert"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="worker",
+            field=models.CharField(
+                blank=True, help_text="Token of the task running the job", max_length=32
+            ),
+        ),
+    ]
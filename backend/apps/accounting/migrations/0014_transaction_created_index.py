@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0013_import_job_claim"),
+        ("families", "0002_alter_invitation_code"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["family", "created_at"], name="acct_tx_family_created_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,13 @@
+from collections import defaultdict
+from contextvars import ContextVar
+from decimal import Decimal
+
 from apps.families.models import FamilyScopedModel
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db import transaction as db_tx
+from django.utils import timezone
 
 
 class Account(FamilyScopedModel):
@@ -20,27 +28,35 @@ class Account(FamilyScopedModel):
     )
     assets = models.ManyToManyField("assets.Asset", blank=True, related_name="accounts")
 
+    debit_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False
+    )
+    credit_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False
+    )
+
+    # Maintained with ``F()`` deltas by transaction writes, never by ``save``.
+    TOTAL_FIELDS = ("debit_total", "credit_total")
+
+    def save(self, *args, **kwargs):
+        """Save without the totals unless they are named in ``update_fields``.
+
+        An ordinary save of an existing account would write back the totals
+        read into memory, losing deltas applied by concurrent transaction
+        writes since.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.TOTAL_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def balance(self):
-        """Current balance computed from related transactions."""
-        from django.db.models import Sum
-        from django.db.models.functions import Coalesce
-
-        debit_sum = self.debits.aggregate(
-            total=Coalesce(
-                Sum("amount"),
-                0,
-                output_field=models.DecimalField(max_digits=10, decimal_places=2),
-            )
-        )["total"]
-        credit_sum = self.credits.aggregate(
-            total=Coalesce(
-                Sum("amount"),
-                0,
-                output_field=models.DecimalField(max_digits=10, decimal_places=2),
-            )
-        )["total"]
-        return debit_sum - credit_sum
+        """Current balance read from the materialised debit/credit totals."""
+        return self.debit_total - self.credit_total
 
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return self.name
@@ -61,6 +77,170 @@ class Journal(FamilyScopedModel):
         return f"Journal {self.date}"  # type: ignore[str-format]
 
 
+# Set while ``TransactionQuerySet.delete`` reverses its rows in bulk, so the
+# per-instance ``post_delete`` reversal stays out of the way.
+reversing_in_bulk: ContextVar[bool] = ContextVar("reversing_in_bulk", default=False)
+
+
+class TransactionQuerySet(models.QuerySet):
+    """QuerySet keeping account totals and budgets in sync on bulk writes."""
+
+    LEDGER_FIELDS = {
+        "amount",
+        "debit_account",
+        "debit_account_id",
+        "credit_account",
+        "credit_account_id",
+        "date",
+    }
+    SUMMARY_FIELDS = LEDGER_FIELDS | {"category", "category_id"}
+    BUDGET_VALUES = (
+        "id",
+        "family_id",
+        "amount",
+        "debit_account_id",
+        "credit_account_id",
+        "category_id",
+        "date",
+    )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .services import (
+            apply_transactions,
+            invalidate_reports,
+            mark_summary_stale,
+        )
+
+        objs = list(objs)
+        with db_tx.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            apply_transactions(objs)
+            days = {(obj.family_id, obj.date) for obj in objs}
+            mark_summary_stale(days)
+            invalidate_reports(days)
+        return created
+
+    def bulk_create_validated(self, objs, *args, **kwargs):
+        """Validate ``objs`` like ``Transaction.save`` does, then bulk create.
+
+        The accounts of the whole batch are resolved in at most one query.
+        Nothing is written if any object is invalid; the ``ValidationError``
+        maps the index of each bad object to its messages.
+        """
+        objs = list(objs)
+        families = account_families(objs)
+        errors = {}
+        for index, obj in enumerate(objs):
+            try:
+                obj.validate(families)
+            except ValidationError as exc:
+                errors[str(index)] = exc.messages
+        if errors:
+            raise ValidationError(errors)
+        return self.bulk_create(objs, *args, **kwargs)
+
+    def delete(self):
+        """Delete the rows, reversing them with a fixed number of queries.
+
+        One grouped query sums the rows per account pair, category and
+        day; the totals, checkpoints, budgets and summary days are then
+        adjusted from the groups. Single deletes and cascades still go
+        through the ``post_delete`` handler.
+        """
+        from .services import (
+            apply_budget_deltas,
+            apply_totals_delta,
+            invalidate_checkpoints,
+            invalidate_reports,
+            mark_summary_stale,
+        )
+
+        with db_tx.atomic(using=self.db):
+            groups = list(
+                self.order_by()
+                .values(
+                    "family_id",
+                    "debit_account_id",
+                    "credit_account_id",
+                    "category_id",
+                    "date",
+                )
+                .annotate(amount=models.Sum("amount"))
+            )
+            token = reversing_in_bulk.set(True)
+            try:
+                deleted = super().delete()
+            finally:
+                reversing_in_bulk.reset(token)
+            debits: dict[int, Decimal] = defaultdict(Decimal)
+            credits: dict[int, Decimal] = defaultdict(Decimal)
+            starts = {}
+            for row in groups:
+                debits[row["debit_account_id"]] -= row["amount"]
+                credits[row["credit_account_id"]] -= row["amount"]
+                day = row["date"]
+                for account_id in (row["debit_account_id"], row["credit_account_id"]):
+                    starts[account_id] = min(day, starts.get(account_id, day))
+            apply_totals_delta(debits, credits)
+            invalidate_checkpoints(starts)
+            apply_budget_deltas([(-1, row) for row in groups])
+            days = {(row["family_id"], row["date"]) for row in groups}
+            mark_summary_stale(days)
+            invalidate_reports(days)
+        return deleted
+
+    def update(self, **kwargs):
+        if not self.SUMMARY_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+        from .services import (
+            apply_budget_deltas,
+            invalidate_checkpoints,
+            invalidate_reports,
+            mark_summary_stale,
+            recompute_account_totals,
+        )
+
+        with db_tx.atomic(using=self.db):
+            before = list(self.values(*self.BUDGET_VALUES))
+            # Earliest affected date per account, before and after the update.
+            starts = {}
+            days = set()
+            for row in before:
+                date = row["date"]
+                days.add((row["family_id"], date))
+                for account_id in (row["debit_account_id"], row["credit_account_id"]):
+                    starts[account_id] = min(date, starts.get(account_id, date))
+            if starts:
+                earliest = min(starts.values())
+                for key in (
+                    "debit_account",
+                    "debit_account_id",
+                    "credit_account",
+                    "credit_account_id",
+                ):
+                    if key in kwargs:
+                        starts[getattr(kwargs[key], "pk", kwargs[key])] = earliest
+                if "date" in kwargs:
+                    new_date = self.model._meta.get_field("date").to_python(
+                        kwargs["date"]
+                    )
+                    starts = {pk: min(d, new_date) for pk, d in starts.items()}
+                    days |= {(family_id, new_date) for family_id, _ in days}
+            rows = super().update(**kwargs)
+            after = self.model.objects.filter(
+                pk__in=[row["id"] for row in before]
+            ).values(*self.BUDGET_VALUES)
+            apply_budget_deltas(
+                [(-1, row) for row in before] + [(1, row) for row in after]
+            )
+            mark_summary_stale(days)
+            invalidate_reports(days)
+            if self.LEDGER_FIELDS.intersection(kwargs):
+                recompute_account_totals(starts)
+                invalidate_checkpoints(starts)
+        return rows
+
+
 class Transaction(FamilyScopedModel):
     description = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -76,11 +256,31 @@ class Transaction(FamilyScopedModel):
     journal = models.ForeignKey(
         Journal, on_delete=models.SET_NULL, null=True, blank=True
     )
+    date = models.DateField(default=timezone.localdate, db_index=True)
+
+    objects = TransactionQuerySet.as_manager()
+
+    RELATED_FIELDS = [
+        "family",
+        "debit_account",
+        "credit_account",
+        "category",
+        "journal",
+    ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["family", "date"], name="acct_tx_family_date_idx"),
+            models.Index(
+                fields=["family", "category"], name="acct_tx_family_category_idx"
+            ),
+            models.Index(
+                fields=["family", "created_at"], name="acct_tx_family_created_idx"
+            ),
+        ]
 
     def clean(self):
         super().clean()
-        from django.core.exceptions import ValidationError
-
         if self.debit_account_id == self.credit_account_id:
             raise ValidationError("Debit and credit accounts cannot be the same.")
         if self.amount <= 0:
@@ -89,9 +289,267 @@ class Transaction(FamilyScopedModel):
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return self.description
 
+    def validate(self, families: dict[int, int]) -> None:
+        """Check field values and the ledger invariants.
+
+        A cheaper ``full_clean``: ``families`` maps account ids to family
+        ids (see ``account_families``) and stands in for the per-foreign-key
+        existence queries. Both accounts must exist and belong to the
+        transaction's family; category and journal ids are left to the
+        database's foreign key constraints.
+        """
+        errors: dict = {}
+        try:
+            self.clean_fields(exclude=self.RELATED_FIELDS)
+        except ValidationError as exc:
+            errors = exc.update_error_dict(errors)
+        for name in ("debit_account", "credit_account"):
+            family_id = families.get(getattr(self, f"{name}_id"))
+            if family_id is None:
+                errors.setdefault(name, []).append("Account does not exist.")
+            elif family_id != self.family_id:
+                errors.setdefault(name, []).append(
+                    "Account does not belong to this family."
+                )
+        if errors:
+            raise ValidationError(errors)
+        self.clean()
+
     def save(self, *args, **kwargs):
-        # Ensure accounts belong to same family
-        if self.debit_account.family_id != self.family_id:
-            self.family = self.debit_account.family
-        self.full_clean()
-        super().save(*args, **kwargs)
+        families = account_families([self])
+        # A transaction belongs to its debit account's family.
+        family_id = families.get(self.debit_account_id)
+        if family_id is not None and family_id != self.family_id:
+            self.family_id = family_id
+        self.validate(families)
+        from .services import (
+            apply_transactions,
+            invalidate_reports,
+            mark_summary_stale,
+        )
+
+        with db_tx.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    Transaction.objects.filter(pk=self.pk)
+                    .values(
+                        "amount",
+                        "debit_account_id",
+                        "credit_account_id",
+                        "category_id",
+                        "date",
+                        "family_id",
+                    )
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            apply_transactions([self], previous=[previous] if previous else ())
+            days = [(self.family_id, self.date)]
+            if previous:
+                days.append((previous["family_id"], previous["date"]))
+            mark_summary_stale(days)
+            invalidate_reports(days)
+
+
+def account_families(transactions) -> dict[int, int]:
+    """Map the accounts of ``transactions`` to their family ids.
+
+    Accounts already loaded on a transaction cost nothing; the rest are
+    fetched together in one query.
+    """
+    families = {}
+    missing = set()
+    for tx in transactions:
+        for name in ("debit_account", "credit_account"):
+            field = Transaction._meta.get_field(name)
+            if field.is_cached(tx) and getattr(tx, name) is not None:
+                account = getattr(tx, name)
+                families[account.pk] = account.family_id
+            elif getattr(tx, field.attname) is not None:
+                missing.add(getattr(tx, field.attname))
+    missing -= families.keys()
+    if missing:
+        families.update(
+            Account.objects.filter(pk__in=missing).values_list("id", "family_id")
+        )
+    return families
+
+
+class BalanceCheckpoint(FamilyScopedModel):
+    """Account totals as of the end of ``date`` (inclusive)."""
+
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="checkpoints"
+    )
+    date = models.DateField()
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        unique_together = ("account", "date")
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return f"{self.account} @ {self.date}"  # type: ignore[str-format]
+
+
+class ImportJob(FamilyScopedModel):
+    """Background CSV import processed in committed chunks."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    file = models.FileField(upload_to="imports/%Y/%m/")
+    auto_categorize = models.BooleanField(
+        default=False, help_text="Fill missing categories from suggestions"
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_created = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    detail = models.CharField(max_length=255, blank=True)
+    worker = models.CharField(
+        max_length=32, blank=True, help_text="Token of the task running the job"
+    )
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "created_at"], name="acct_import_family_created_idx"
+            ),
+        ]
+
+    @property
+    def throughput(self) -> float:
+        """Rows processed per second since the job started."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at or timezone.now()
+        elapsed = (end - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return f"Import {self.pk} ({self.status})"  # type: ignore[str-format]
+
+
+class InterestPosting(FamilyScopedModel):
+    """Marks a family's monthly interest as paid for ``period``."""
+
+    period = models.DateField(help_text="First day of the month paid")
+    journal = models.ForeignKey(
+        Journal, on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+    class Meta:
+        unique_together = ("family", "period")
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return f"Interest {self.period}"  # type: ignore[str-format]
+
+
+class DailySummary(FamilyScopedModel):
+    """Debit and credit totals for one account and category on one day."""
+
+    date = models.DateField()
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="daily_summaries"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "date"], name="acct_summary_family_date_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return f"{self.account} @ {self.date}"  # type: ignore[str-format]
+
+
+class StaleSummaryDay(FamilyScopedModel):
+    """A day whose ``DailySummary`` rows must be rebuilt on the next run."""
+
+    date = models.DateField()
+
+    class Meta:
+        unique_together = ("family", "date")
+
+
+class SummaryState(models.Model):
+    """Singleton row locked to serialise daily summary rollup runs."""
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class Budget(FamilyScopedModel):
+    """Spending limit per period for one category or expense account.
+
+    ``spent`` is the amount spent in the period starting at
+    ``period_start``; it is adjusted as transactions post rather than
+    recomputed.
+    """
+
+    class Period(models.TextChoices):
+        MONTH = "month", "Monthly"
+        YEAR = "year", "Yearly"
+
+    name = models.CharField(max_length=255)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="budgets",
+    )
+    account = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="budgets",
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    period = models.CharField(
+        max_length=5, choices=Period.choices, default=Period.MONTH
+    )
+    period_start = models.DateField(editable=False)
+    spent = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False
+    )
+    notified_period = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(category__isnull=True, account__isnull=False)
+                | models.Q(category__isnull=False, account__isnull=True),
+                name="acct_budget_category_xor_account",
+            ),
+        ]
+
+    @property
+    def remaining(self):
+        return self.amount - self.spent
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return self.name
@@ -0,0 +1,96 @@
+"""Ranked full-text search over transaction descriptions and journal memos."""
+
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+WORD_RE = re.compile(r"\w+")
+
+
+class SearchUnavailable(Exception):
+    """The database backend has no full-text index for transactions."""
+
+
+def search_terms(text: str) -> list[str]:
+    return WORD_RE.findall(text.lower())[:16]
+
+
+def _mysql(queryset, terms, family_id):
+    # Every word is required and may be a prefix, and each one may be in
+    # the description or the memo, as in the SQLite table indexing both.
+    for term in terms:
+        word = f"{term}*"
+        queryset = queryset.filter(
+            Q(
+                id__in=RawSQL(
+                    "SELECT id FROM accounting_transaction WHERE family_id = %s"
+                    " AND MATCH (description) AGAINST (%s IN BOOLEAN MODE)",
+                    [family_id, word],
+                )
+            )
+            | Q(
+                journal_id__in=RawSQL(
+                    "SELECT id FROM accounting_journal WHERE family_id = %s"
+                    " AND MATCH (memo) AGAINST (%s IN BOOLEAN MODE)",
+                    [family_id, word],
+                )
+            )
+        )
+    query = " ".join(f"{term}*" for term in terms)
+    description = (
+        "MATCH (accounting_transaction.description) AGAINST (%s IN BOOLEAN MODE)"
+    )
+    memo = (
+        "COALESCE((SELECT MATCH (j.memo) AGAINST (%s IN BOOLEAN MODE)"
+        " FROM accounting_journal j"
+        " WHERE j.id = accounting_transaction.journal_id), 0)"
+    )
+    return queryset.annotate(
+        rank=RawSQL(
+            f"{description} + {memo}", [query, query], output_field=FloatField()
+        )
+    )
+
+
+def _sqlite(queryset, terms, family_id):
+    query = " ".join(f'"{term}"*' for term in terms)
+    return queryset.filter(
+        id__in=RawSQL(
+            "SELECT rowid FROM accounting_transaction_fts"
+            " WHERE accounting_transaction_fts MATCH %s",
+            [query],
+        )
+    ).annotate(
+        # bm25() is lower for better matches; negate it so higher ranks first.
+        rank=RawSQL(
+            "(SELECT -bm25(accounting_transaction_fts)"
+            " FROM accounting_transaction_fts"
+            " WHERE accounting_transaction_fts MATCH %s"
+            " AND rowid = accounting_transaction.id)",
+            [query],
+            output_field=FloatField(),
+        )
+    )
+
+
+BACKENDS = {"mysql": _mysql, "sqlite": _sqlite}
+
+
+def search_transactions(queryset, text: str, family_id: int | None):
+    """Filter ``queryset`` to transactions matching ``text``, best first.
+
+    Every word in ``text`` must appear in the description or the journal
+    memo, as a whole word or a prefix; different words may match different
+    fields. ``queryset`` must be limited to ``family_id``, which also
+    scopes the index lookups. Results are annotated with ``rank`` (higher
+    is better) and ordered by it.
+    """
+    backend = BACKENDS.get(connection.vendor)
+    if backend is None:
+        raise SearchUnavailable(connection.vendor)
+    terms = search_terms(text)
+    if not terms or family_id is None:
+        return queryset.none()
+    return backend(queryset, terms, family_id).order_by("-rank")
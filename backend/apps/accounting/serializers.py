@@ -1,6 +1,12 @@
+from decimal import Decimal
+
+from django.db import transaction as db_tx
 from rest_framework import serializers
 
-from .models import Account, Category, Journal, Transaction
+from .models import Account, Budget, Category, ImportJob, Journal, Transaction
+from .services import balances_as_of
+
+MAX_JOURNAL_LINES = 1000
 
 
 class AccountSerializer(serializers.ModelSerializer):
@@ -10,6 +16,21 @@ class AccountSerializer(serializers.ModelSerializer):
         model = Account
         fields = ["id", "name", "type", "interest_rate", "assets", "balance"]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        as_of = self.context.get("as_of")
+        if as_of is not None:
+            balances = self.context.setdefault("balances", {})
+            if instance.pk not in balances:
+                # Price the whole page being serialised in one go.
+                page = self.parent.instance if self.parent is not None else None
+                accounts = page if page is not None else [instance]
+                balances.update(balances_as_of([a.pk for a in accounts], as_of))
+            data["balance"] = self.fields["balance"].to_representation(
+                balances[instance.pk]
+            )
+        return data
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -23,6 +44,44 @@ class JournalSerializer(serializers.ModelSerializer):
         fields = ["id", "date", "memo"]
 
 
+class BudgetSerializer(serializers.ModelSerializer):
+    remaining = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Budget
+        fields = [
+            "id",
+            "name",
+            "category",
+            "account",
+            "amount",
+            "period",
+            "period_start",
+            "spent",
+            "remaining",
+        ]
+        read_only_fields = ["period_start", "spent"]
+
+    def validate(self, attrs):
+        category = attrs.get("category", getattr(self.instance, "category", None))
+        account = attrs.get("account", getattr(self.instance, "account", None))
+        if (category is None) == (account is None):
+            raise serializers.ValidationError("Set exactly one of category or account.")
+        if account is not None and account.type != Account.Type.EXPENSE:
+            raise serializers.ValidationError(
+                {"account": "Budgets track expense accounts only."}
+            )
+        family = self.context["family"]
+        for name, value in (("category", category), ("account", account)):
+            if value is not None and value.family_id != family.pk:
+                raise serializers.ValidationError(
+                    {name: "Does not belong to this family."}
+                )
+        return attrs
+
+
 class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
@@ -34,4 +93,161 @@ class TransactionSerializer(serializers.ModelSerializer):
             "credit_account",
             "category",
             "journal",
+            "date",
+        ]
+
+
+class JournalLineSerializer(serializers.Serializer):
+    description = serializers.CharField(max_length=255)
+    amount = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=Decimal("0.01")
+    )
+    debit_account = serializers.IntegerField()
+    credit_account = serializers.IntegerField()
+    category = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs["debit_account"] == attrs["credit_account"]:
+            raise serializers.ValidationError(
+                "Debit and credit accounts cannot be the same."
+            )
+        return attrs
+
+
+class JournalPostSerializer(serializers.Serializer):
+    """A journal and all of its lines, validated and inserted together.
+
+    Account and category ids are checked against the family with one
+    query each, and the lines are inserted with a single ``bulk_create``
+    in the same atomic block as the journal.
+    """
+
+    date = serializers.DateField()
+    memo = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    lines = JournalLineSerializer(
+        many=True, allow_empty=False, max_length=MAX_JOURNAL_LINES
+    )
+
+    def validate_lines(self, lines):
+        family = self.context["family"]
+        account_ids = set(
+            Account.objects.filter(
+                family=family,
+                pk__in={
+                    line[key]
+                    for line in lines
+                    for key in ("debit_account", "credit_account")
+                },
+            ).values_list("id", flat=True)
+        )
+        category_ids = set(
+            Category.objects.filter(
+                family=family,
+                pk__in={
+                    line["category"]
+                    for line in lines
+                    if line.get("category") is not None
+                },
+            ).values_list("id", flat=True)
+        )
+        errors = []
+        for line in lines:
+            line_errors = {}
+            for key in ("debit_account", "credit_account"):
+                if line[key] not in account_ids:
+                    line_errors[key] = ["Account does not belong to this family."]
+            category = line.get("category")
+            if category is not None and category not in category_ids:
+                line_errors["category"] = ["Category does not belong to this family."]
+            errors.append(line_errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return lines
+
+    def create(self, validated_data):
+        family = self.context["family"]
+        with db_tx.atomic():
+            journal = Journal.objects.create(
+                family=family,
+                date=validated_data["date"],
+                memo=validated_data.get("memo", ""),
+            )
+            Transaction.objects.bulk_create(
+                Transaction(
+                    family=family,
+                    journal=journal,
+                    date=journal.date,
+                    description=line["description"],
+                    amount=line["amount"],
+                    debit_account_id=line["debit_account"],
+                    credit_account_id=line["credit_account"],
+                    category_id=line.get("category"),
+                )
+                for line in validated_data["lines"]
+            )
+        return journal
+
+
+class CategorySuggestionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    score = serializers.FloatField()
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    throughput = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "file",
+            "auto_categorize",
+            "status",
+            "rows_processed",
+            "rows_created",
+            "rows_failed",
+            "throughput",
+            "errors",
+            "detail",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            field for field in fields if field not in ("file", "auto_categorize")
         ]
+        extra_kwargs = {"file": {"write_only": True}}
+
+
+class TrialBalanceLineSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    type = serializers.CharField()
+    debit = serializers.DecimalField(max_digits=14, decimal_places=2)
+    credit = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class TrialBalanceSerializer(serializers.Serializer):
+    as_of = serializers.DateField(allow_null=True)
+    accounts = TrialBalanceLineSerializer(many=True)
+    total_debit = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_credit = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class BalanceSheetLineSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    balance = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class BalanceSheetSectionSerializer(serializers.Serializer):
+    accounts = BalanceSheetLineSerializer(many=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class BalanceSheetSerializer(serializers.Serializer):
+    as_of = serializers.DateField(allow_null=True)
+    sections = serializers.DictField(child=BalanceSheetSectionSerializer())
+    net_income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    balanced = serializers.BooleanField()
@@ -0,0 +1,988 @@
+"""Service helpers for the accounting app."""
+
+import calendar
+import hashlib
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db import transaction as db_tx
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    Max,
+    Min,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncMonth, TruncYear
+from django.utils import timezone
+
+from .models import (
+    Account,
+    BalanceCheckpoint,
+    Budget,
+    DailySummary,
+    InterestPosting,
+    Journal,
+    StaleSummaryDay,
+    SummaryState,
+    Transaction,
+)
+
+TOTAL_FIELD = DecimalField(max_digits=14, decimal_places=2)
+ZERO = Decimal("0.00")
+
+
+def _delta_case(deltas: Mapping[int, Decimal]) -> Case:
+    return Case(
+        *[When(pk=pk, then=Value(amount)) for pk, amount in deltas.items()],
+        default=Value(ZERO),
+        output_field=TOTAL_FIELD,
+    )
+
+
+def apply_totals_delta(
+    debits: Mapping[int, Decimal], credits: Mapping[int, Decimal]
+) -> None:
+    """Add per-account deltas to the stored totals in a single UPDATE."""
+    debits = {pk: amount for pk, amount in debits.items() if amount}
+    credits = {pk: amount for pk, amount in credits.items() if amount}
+    account_ids = set(debits) | set(credits)
+    if not account_ids:
+        return
+    Account.objects.filter(pk__in=account_ids).update(
+        debit_total=F("debit_total") + _delta_case(debits),
+        credit_total=F("credit_total") + _delta_case(credits),
+    )
+
+
+def apply_transactions(
+    transactions: Iterable[Transaction],
+    *,
+    previous: Iterable[Mapping] = (),
+    sign: int = 1,
+) -> None:
+    """Post ``transactions`` to the account totals.
+
+    ``previous`` holds the earlier values of updated rows, which are
+    reversed first. A ``sign`` of ``-1`` reverses the transactions
+    themselves (deletes). Budget counters are adjusted the same way.
+    """
+    transactions = list(transactions)
+    debits: dict[int, Decimal] = defaultdict(Decimal)
+    credits: dict[int, Decimal] = defaultdict(Decimal)
+    starts: dict[int, date] = {}
+    date_field = Transaction._meta.get_field("date")
+    rows = [(-1, row) for row in previous] + [(sign, vars(tx)) for tx in transactions]
+    rows = [
+        (
+            row_sign,
+            {
+                **row,
+                "amount": Decimal(str(row["amount"])),
+                "date": date_field.to_python(row["date"]),
+            },
+        )
+        for row_sign, row in rows
+    ]
+    for row_sign, row in rows:
+        amount = row["amount"] * row_sign
+        debits[row["debit_account_id"]] += amount
+        credits[row["credit_account_id"]] += amount
+        day = row["date"]
+        for account_id in (row["debit_account_id"], row["credit_account_id"]):
+            starts[account_id] = min(day, starts.get(account_id, day))
+    apply_totals_delta(debits, credits)
+    invalidate_checkpoints(starts)
+    apply_budget_deltas(rows)
+    _sync_cached_accounts(transactions, debits, credits)
+
+
+def _sync_cached_accounts(transactions, debits, credits) -> None:
+    """Mirror the deltas onto account instances already loaded in memory."""
+    cached: dict[int, Account] = {}
+    for tx in transactions:
+        for name in ("debit_account", "credit_account"):
+            if Transaction._meta.get_field(name).is_cached(tx):
+                account = getattr(tx, name)
+                cached[id(account)] = account
+    for account in cached.values():
+        account.debit_total += debits.get(account.pk, ZERO)
+        account.credit_total += credits.get(account.pk, ZERO)
+
+
+def compute_account_totals(
+    account_ids: Iterable[int] | None = None,
+    *,
+    after: date | None = None,
+    through: date | None = None,
+) -> dict[int, tuple[Decimal, Decimal]]:
+    """Return ``{account_id: (debit_total, credit_total)}`` from the ledger.
+
+    ``after``/``through`` limit the sum to transactions dated in that
+    half-open window.
+    """
+    txs = Transaction.objects.order_by()
+    if after is not None:
+        txs = txs.filter(date__gt=after)
+    if through is not None:
+        txs = txs.filter(date__lte=through)
+    debit_rows = credit_rows = txs
+    if account_ids is not None:
+        account_ids = list(account_ids)
+        debit_rows = debit_rows.filter(debit_account_id__in=account_ids)
+        credit_rows = credit_rows.filter(credit_account_id__in=account_ids)
+    totals: dict[int, list[Decimal]] = defaultdict(lambda: [ZERO, ZERO])
+    for account_id, total in debit_rows.values_list("debit_account_id").annotate(
+        total=Sum("amount")
+    ):
+        totals[account_id][0] = total
+    for account_id, total in credit_rows.values_list("credit_account_id").annotate(
+        total=Sum("amount")
+    ):
+        totals[account_id][1] = total
+    return {pk: (debit, credit) for pk, (debit, credit) in totals.items()}
+
+
+def find_balance_drift(
+    account_ids: Iterable[int] | None = None, *, batch_size: int = 500
+) -> list[tuple[Account, Decimal, Decimal]]:
+    """Return ``(account, debit_total, credit_total)`` for stale accounts.
+
+    The totals in each tuple are the values recomputed from the ledger.
+    """
+    accounts = Account.objects.only("id", "family", "debit_total", "credit_total")
+    if account_ids is not None:
+        account_ids = list(account_ids)
+        accounts = accounts.filter(pk__in=account_ids)
+    totals = compute_account_totals(account_ids)
+    drift = []
+    for account in accounts.order_by("id").iterator(chunk_size=batch_size):
+        debit, credit = totals.get(account.pk, (ZERO, ZERO))
+        if account.debit_total != debit or account.credit_total != credit:
+            drift.append((account, debit, credit))
+    return drift
+
+
+def recompute_account_totals(
+    account_ids: Iterable[int] | None = None, *, batch_size: int = 500
+) -> list[Account]:
+    """Rebuild stored totals from the ledger, returning the accounts changed."""
+    changed = []
+    for account, debit, credit in find_balance_drift(
+        account_ids, batch_size=batch_size
+    ):
+        account.debit_total, account.credit_total = debit, credit
+        changed.append(account)
+    Account.objects.bulk_update(
+        changed, ["debit_total", "credit_total"], batch_size=batch_size
+    )
+    return changed
+
+
+# ===== Balance checkpoints =====
+
+
+def checkpoint_period_end(day: date) -> date:
+    """Return the last day of the checkpoint period containing ``day``."""
+    months = settings.BALANCE_CHECKPOINT_MONTHS
+    index = (day.year * 12 + day.month - 1) // months * months + months - 1
+    year, month = divmod(index, 12)
+    return date(year, month + 1, calendar.monthrange(year, month + 1)[1])
+
+
+def last_checkpoint_date(today: date | None = None) -> date:
+    """Return the end of the most recent fully closed checkpoint period."""
+    today = today or timezone.localdate()
+    return _previous_period_end(checkpoint_period_end(today))
+
+
+def _previous_period_end(period_end: date) -> date:
+    months = settings.BALANCE_CHECKPOINT_MONTHS
+    first = period_end.replace(day=1)
+    for _ in range(months):
+        first = (first - timedelta(days=1)).replace(day=1)
+    return checkpoint_period_end(first)
+
+
+def invalidate_checkpoints(starts: Mapping[int, date]) -> None:
+    """Drop checkpoints at or after the given date for each account.
+
+    Transactions dated in the open period never reach a checkpoint, so the
+    common case of posting today's transactions issues no query. The
+    accounts are locked first, so a ``write_balance_checkpoints`` run
+    holding them finishes before its rows are judged.
+    """
+    cutoff = last_checkpoint_date()
+    by_date: dict[date, list[int]] = defaultdict(list)
+    for account_id, day in starts.items():
+        if day is not None and day <= cutoff:
+            by_date[day].append(account_id)
+    if not by_date:
+        return
+    with db_tx.atomic():
+        _lock_accounts({pk for account_ids in by_date.values() for pk in account_ids})
+        for day, account_ids in by_date.items():
+            BalanceCheckpoint.objects.filter(
+                account_id__in=account_ids, date__gte=day
+            ).delete()
+
+
+def _lock_accounts(account_ids: Iterable[int]) -> dict[int, int]:
+    """Lock accounts in primary key order; return ``{account_id: family_id}``."""
+    return dict(
+        Account.objects.select_for_update()
+        .filter(pk__in=list(account_ids))
+        .order_by("pk")
+        .values_list("pk", "family_id")
+    )
+
+
+def _checkpoint_rows(latest: Mapping[int, date]) -> dict[int, list[Decimal]]:
+    by_date: dict[date, list[int]] = defaultdict(list)
+    for account_id, day in latest.items():
+        by_date[day].append(account_id)
+    totals = {}
+    for day, account_ids in by_date.items():
+        for account_id, debit, credit in BalanceCheckpoint.objects.filter(
+            account_id__in=account_ids, date=day
+        ).values_list("account_id", "debit_total", "credit_total"):
+            totals[account_id] = [debit, credit]
+    return totals
+
+
+def write_balance_checkpoints(
+    today: date | None = None, *, batch_size: int = 500
+) -> int:
+    """Write missing checkpoints up to the last closed period.
+
+    Accounts are processed ``batch_size`` at a time, each batch in one
+    transaction that locks its accounts before reading the ledger. A
+    back-dated write invalidating their checkpoints (which locks the same
+    rows) therefore either lands before the totals are computed or waits
+    and trims the rows this run wrote. Returns the number of rows written.
+    """
+    cutoff = last_checkpoint_date(today)
+    account_ids = list(Account.objects.order_by("pk").values_list("pk", flat=True))
+    written = 0
+    for index in range(0, len(account_ids), batch_size):
+        with db_tx.atomic():
+            families = _lock_accounts(account_ids[index : index + batch_size])
+            written += _write_checkpoints(families, cutoff, batch_size)
+    return written
+
+
+def _write_checkpoints(
+    families: Mapping[int, int], cutoff: date, batch_size: int
+) -> int:
+    """Write the missing checkpoints of ``families``' accounts up to ``cutoff``.
+
+    Each account resumes from its latest surviving checkpoint (invalidation
+    only ever trims the tail), so a batch costs two grouped queries per
+    period that still needs writing.
+    """
+    latest = dict(
+        BalanceCheckpoint.objects.filter(account_id__in=list(families))
+        .order_by()
+        .values_list("account_id")
+        .annotate(latest=Max("date"))
+    )
+    running = _checkpoint_rows(latest)
+    first_dates: dict[int, date] = {}
+    for field in ("debit_account_id", "credit_account_id"):
+        for account_id, first in (
+            Transaction.objects.filter(**{f"{field}__in": list(families)})
+            .order_by()
+            .values_list(field)
+            .annotate(first=Min("date"))
+        ):
+            first_dates[account_id] = min(first, first_dates.get(account_id, first))
+
+    resume = {}
+    for account_id in families:
+        if account_id in latest:
+            start = checkpoint_period_end(latest[account_id] + timedelta(days=1))
+        elif account_id in first_dates:
+            start = checkpoint_period_end(first_dates[account_id])
+        else:
+            start = cutoff
+        if start <= cutoff:
+            resume[account_id] = start
+    if not resume:
+        return 0
+
+    written = 0
+    period = min(resume.values())
+    while period <= cutoff:
+        delta = compute_account_totals(
+            resume, after=_previous_period_end(period), through=period
+        )
+        checkpoints = []
+        for account_id, start in resume.items():
+            if start > period:
+                continue
+            totals = running.setdefault(account_id, [ZERO, ZERO])
+            debit, credit = delta.get(account_id, (ZERO, ZERO))
+            totals[0] += debit
+            totals[1] += credit
+            checkpoints.append(
+                BalanceCheckpoint(
+                    family_id=families[account_id],
+                    account_id=account_id,
+                    date=period,
+                    debit_total=totals[0],
+                    credit_total=totals[1],
+                )
+            )
+        BalanceCheckpoint.objects.bulk_create(
+            checkpoints, batch_size=batch_size, ignore_conflicts=True
+        )
+        written += len(checkpoints)
+        period = checkpoint_period_end(period + timedelta(days=1))
+    return written
+
+
+def balances_as_of(account_ids: Iterable[int], as_of: date) -> dict[int, Decimal]:
+    """Return each account's balance at the end of ``as_of``.
+
+    Starts from the nearest checkpoint on or before ``as_of`` and adds the
+    transactions dated after it, so only a short window of the ledger is
+    summed.
+    """
+    account_ids = list(account_ids)
+    latest = dict(
+        BalanceCheckpoint.objects.filter(account_id__in=account_ids, date__lte=as_of)
+        .order_by()
+        .values_list("account_id")
+        .annotate(latest=Max("date"))
+    )
+    totals = _checkpoint_rows(latest)
+    groups: dict[date | None, list[int]] = defaultdict(list)
+    for account_id in account_ids:
+        groups[latest.get(account_id)].append(account_id)
+    for after, ids in groups.items():
+        delta = compute_account_totals(ids, after=after, through=as_of)
+        for account_id, (debit, credit) in delta.items():
+            current = totals.setdefault(account_id, [ZERO, ZERO])
+            current[0] += debit
+            current[1] += credit
+    return {
+        account_id: (
+            totals[account_id][0] - totals[account_id][1]
+            if account_id in totals
+            else ZERO
+        )
+        for account_id in account_ids
+    }
+
+
+# ===== Daily summary =====
+
+SUMMARY_PERIODS = {"month": TruncMonth, "year": TruncYear}
+
+
+def mark_summary_stale(days: Iterable[tuple[int, date]]) -> None:
+    """Queue ``(family_id, date)`` pairs to be rebuilt by the next rollup.
+
+    Called in the same database transaction as every insert, edit and
+    delete, so a day is queued exactly when its change commits. (A
+    high-water mark on ``Transaction.id`` would miss rows whose id was
+    allocated before, but committed after, a rollup run.)
+    """
+    date_field = Transaction._meta.get_field("date")
+    stale = {(family_id, date_field.to_python(day)) for family_id, day in days}
+    StaleSummaryDay.objects.bulk_create(
+        [StaleSummaryDay(family_id=family_id, date=day) for family_id, day in stale],
+        ignore_conflicts=True,
+    )
+
+
+def _days_filter(days: Mapping[int, Iterable[date]]) -> Q:
+    condition = Q()
+    for family_id, dates in days.items():
+        condition |= Q(family_id=family_id, date__in=sorted(dates))
+    return condition
+
+
+def _rebuild_summary_days(days: Mapping[int, Iterable[date]], batch_size: int) -> int:
+    """Replace the summary rows of the given days from the ledger."""
+    condition = _days_filter(days)
+    DailySummary.objects.filter(condition).delete()
+    txs = Transaction.objects.filter(condition).order_by()
+    rows: dict[tuple, list] = {}
+    for field, slot in (("debit_account_id", 0), ("credit_account_id", 1)):
+        for family_id, day, account_id, category_id, total, count in txs.values_list(
+            "family_id", "date", field, "category_id"
+        ).annotate(total=Sum("amount"), count=Count("id")):
+            row = rows.setdefault(
+                (family_id, day, account_id, category_id), [ZERO, ZERO, 0]
+            )
+            row[slot] += total
+            row[2] += count
+    summaries = []
+    for (family_id, day, account_id, category_id), totals in rows.items():
+        debit, credit, count = totals
+        summaries.append(
+            DailySummary(
+                family_id=family_id,
+                date=day,
+                account_id=account_id,
+                category_id=category_id,
+                debit_total=debit,
+                credit_total=credit,
+                count=count,
+            )
+        )
+    DailySummary.objects.bulk_create(summaries, batch_size=batch_size)
+    return len(rows)
+
+
+def update_daily_summary(
+    *, families_per_batch: int = 100, batch_size: int = 500
+) -> int:
+    """Bring ``DailySummary`` up to date and return the rows written.
+
+    Only the days queued by ``mark_summary_stale`` are rebuilt. Each is
+    recomputed from the ledger with two grouped queries, so re-running is
+    always safe. The queued rows are locked while the run reads the
+    ledger: a write queuing the same day again waits, then queues it
+    afresh for the next run instead of being folded into this one unseen.
+    """
+    with db_tx.atomic():
+        state, _ = SummaryState.objects.select_for_update().get_or_create(pk=1)
+        days: dict[int, set[date]] = defaultdict(set)
+        stale_ids = []
+        for (
+            pk,
+            family_id,
+            day,
+        ) in StaleSummaryDay.objects.select_for_update().values_list(
+            "id", "family_id", "date"
+        ):
+            stale_ids.append(pk)
+            days[family_id].add(day)
+
+        written = 0
+        family_ids = sorted(days)
+        for index in range(0, len(family_ids), families_per_batch):
+            batch = family_ids[index : index + families_per_batch]
+            written += _rebuild_summary_days(
+                {family_id: days[family_id] for family_id in batch}, batch_size
+            )
+        StaleSummaryDay.objects.filter(id__in=stale_ids).delete()
+        state.save()
+    return written
+
+
+def summary_totals(
+    family_id: int,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    period: str = "month",
+    group_by: Iterable[str] = ("account",),
+    account_types: Iterable[str] | None = None,
+    exclude_days: Iterable[date] = (),
+):
+    """Return per-period debit/credit totals read from ``DailySummary``.
+
+    ``period`` is ``"month"`` or ``"year"``; ``group_by`` names the
+    summary columns (``account``, ``category``) or lookups (such as
+    ``account__type``) to break totals down by. ``account_types`` limits
+    the rows to accounts of those types, and ``exclude_days`` leaves out
+    days whose summary rows are out of date.
+    """
+    rows = DailySummary.objects.filter(family_id=family_id)
+    if start is not None:
+        rows = rows.filter(date__gte=start)
+    if end is not None:
+        rows = rows.filter(date__lte=end)
+    if account_types is not None:
+        rows = rows.filter(account__type__in=list(account_types))
+    exclude_days = list(exclude_days)
+    if exclude_days:
+        rows = rows.exclude(date__in=exclude_days)
+    columns = [name if "__" in name else f"{name}_id" for name in group_by]
+    return (
+        rows.annotate(period=SUMMARY_PERIODS[period]("date"))
+        .order_by("period", *columns)
+        .values("period", *columns)
+        .annotate(
+            debit_total=Sum("debit_total"),
+            credit_total=Sum("credit_total"),
+            count=Sum("count"),
+        )
+    )
+
+
+# ===== Reports =====
+
+REPORT_CACHE_TIMEOUT = 60 * 60
+REPORT_TYPES = {Account.Type.INCOME: "income", Account.Type.EXPENSE: "expense"}
+
+
+def _report_version_key(family_id: int, month: date) -> str:
+    return f"accounting:report-version:{family_id}:{month:%Y-%m}"
+
+
+def invalidate_reports(days: Iterable[tuple[int, date]]) -> None:
+    """Expire cached reports covering the given ``(family_id, date)`` days.
+
+    Every family and month has a version token that is part of the report
+    cache key; tokens are replaced once the surrounding database
+    transaction commits, so a report computed from uncommitted rows is
+    never cached under the new token.
+    """
+    date_field = Transaction._meta.get_field("date")
+    keys = {
+        _report_version_key(family_id, date_field.to_python(day).replace(day=1))
+        for family_id, day in days
+    }
+    if keys:
+        db_tx.on_commit(
+            lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None)
+        )
+
+
+def report_periods(start: date, end: date, period: str = "month") -> list[date]:
+    """Return the first day of every month or year between the two dates."""
+    first = start.replace(month=1, day=1) if period == "year" else start.replace(day=1)
+    step = 12 if period == "year" else 1
+    periods = []
+    while first <= end:
+        periods.append(first)
+        index = first.year * 12 + first.month - 1 + step
+        first = date(index // 12, index % 12 + 1, 1)
+    return periods
+
+
+def pending_summary_days(family_id: int) -> set[date]:
+    """Days of ``family_id`` that ``DailySummary`` does not reflect yet."""
+    return set(
+        StaleSummaryDay.objects.filter(family_id=family_id).values_list(
+            "date", flat=True
+        )
+    )
+
+
+def _compute_category_report(
+    family_id: int, start: date, end: date, period: str
+) -> dict:
+    trunc = SUMMARY_PERIODS[period]
+    pending = sorted(pending_summary_days(family_id))
+    # (period, category_id, account type) -> [debit, credit]
+    cells: dict[tuple, list[Decimal]] = defaultdict(lambda: [ZERO, ZERO])
+    for row in summary_totals(
+        family_id,
+        start=start,
+        end=end,
+        period=period,
+        group_by=("category", "account__type"),
+        account_types=REPORT_TYPES,
+        exclude_days=pending,
+    ):
+        cell = cells[row["period"], row["category_id"], row["account__type"]]
+        cell[0] += row["debit_total"]
+        cell[1] += row["credit_total"]
+    live = [day for day in pending if start <= day <= end]
+    if live:
+        txs = Transaction.objects.filter(family_id=family_id, date__in=live)
+        for field, slot in (("debit_account", 0), ("credit_account", 1)):
+            for bucket, category_id, account_type, total in (
+                txs.filter(**{f"{field}__type__in": list(REPORT_TYPES)})
+                .annotate(bucket=trunc("date"))
+                .order_by()
+                .values_list("bucket", "category_id", f"{field}__type")
+                .annotate(total=Sum("amount"))
+            ):
+                cells[bucket, category_id, account_type][slot] += total
+
+    periods = report_periods(start, end, period)
+    column = {bucket: index for index, bucket in enumerate(periods)}
+    rows: dict[int | None, dict] = {}
+    for (bucket, category_id, account_type), (debit, credit) in cells.items():
+        row = rows.setdefault(
+            category_id,
+            {name: [ZERO] * len(periods) for name in REPORT_TYPES.values()},
+        )
+        kind = REPORT_TYPES[account_type]
+        amount = debit - credit if kind == "expense" else credit - debit
+        row[kind][column[bucket]] += amount
+    return {
+        "periods": [bucket.isoformat() for bucket in periods],
+        "categories": {
+            category_id: {
+                kind: [str(amount) for amount in amounts]
+                for kind, amounts in row.items()
+            }
+            for category_id, row in rows.items()
+        },
+    }
+
+
+def category_report(
+    family_id: int, start: date, end: date, period: str = "month"
+) -> dict:
+    """Income and expense per category and period between two dates.
+
+    Totals come from ``DailySummary``, with days the rollup has not caught
+    up with yet read from ``Transaction``. Results are cached per family
+    and dropped when a transaction dated in one of the covered months is
+    created, changed or deleted.
+    """
+    months = report_periods(start, end, "month")
+    keys = [_report_version_key(family_id, month) for month in months]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    token = hashlib.sha1(
+        ":".join(str(versions[key]) for key in keys).encode()
+    ).hexdigest()
+    cache_key = f"accounting:report:{family_id}:{start}:{end}:{period}:{token}"
+    report = cache.get(cache_key)
+    if report is None:
+        report = _compute_category_report(family_id, start, end, period)
+        cache.set(cache_key, report, REPORT_CACHE_TIMEOUT)
+    return report
+
+
+CREDIT_NORMAL_TYPES = {
+    Account.Type.LIABILITY,
+    Account.Type.EQUITY,
+    Account.Type.INCOME,
+}
+
+
+def account_balances(family_id: int, as_of: date | None = None) -> list[dict]:
+    """Return ``id``/``name``/``type``/``balance`` for every family account.
+
+    Without ``as_of`` the stored totals are read in a single query; with a
+    date the balances come from ``balances_as_of``, so the query count does
+    not depend on the number of accounts either way. Balances are debit
+    minus credit.
+    """
+    rows = list(
+        Account.objects.filter(family_id=family_id)
+        .annotate(balance=F("debit_total") - F("credit_total"))
+        .order_by("type", "name", "id")
+        .values("id", "name", "type", "balance")
+    )
+    if as_of is not None:
+        historic = balances_as_of([row["id"] for row in rows], as_of)
+        for row in rows:
+            row["balance"] = historic[row["id"]]
+    for row in rows:
+        row["balance"] = Decimal(row["balance"]).quantize(Decimal("0.01"))
+    return rows
+
+
+def trial_balance(family_id: int, as_of: date | None = None) -> dict:
+    """List each account's balance in the debit or credit column."""
+    accounts = []
+    total_debit = total_credit = ZERO
+    for row in account_balances(family_id, as_of):
+        debit = max(row["balance"], ZERO)
+        credit = max(-row["balance"], ZERO)
+        total_debit += debit
+        total_credit += credit
+        accounts.append(
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "type": row["type"],
+                "debit": debit,
+                "credit": credit,
+            }
+        )
+    return {
+        "accounts": accounts,
+        "total_debit": total_debit,
+        "total_credit": total_credit,
+    }
+
+
+def balance_sheet(family_id: int, as_of: date | None = None) -> dict:
+    """Group account balances by ``Account.Type``.
+
+    Balances are shown on each type's normal side (credit minus debit for
+    liabilities, equity and income). ``net_income`` is income less
+    expenses, so assets equal liabilities plus equity plus net income.
+    """
+    sections = {value: {"accounts": [], "total": ZERO} for value in Account.Type.values}
+    for row in account_balances(family_id, as_of):
+        balance = row["balance"]
+        if row["type"] in CREDIT_NORMAL_TYPES:
+            balance = -balance
+        section = sections[row["type"]]
+        section["accounts"].append(
+            {"id": row["id"], "name": row["name"], "balance": balance}
+        )
+        section["total"] += balance
+    totals = {name: section["total"] for name, section in sections.items()}
+    net_income = totals[Account.Type.INCOME] - totals[Account.Type.EXPENSE]
+    return {
+        "sections": sections,
+        "net_income": net_income,
+        "balanced": totals[Account.Type.ASSET]
+        == totals[Account.Type.LIABILITY] + totals[Account.Type.EQUITY] + net_income,
+    }
+
+
+# ===== Budgets =====
+
+
+def budget_period_start(period: str, day: date) -> date:
+    """Return the first day of the budget period containing ``day``."""
+    if period == Budget.Period.YEAR:
+        return day.replace(month=1, day=1)
+    return day.replace(day=1)
+
+
+def budget_period_end(period: str, start: date) -> date:
+    if period == Budget.Period.YEAR:
+        return date(start.year, 12, 31)
+    return start.replace(day=calendar.monthrange(start.year, start.month)[1])
+
+
+def _budget_spend(budget: Budget, row: Mapping) -> Decimal:
+    if budget.category_id is not None:
+        return row["amount"] if row["category_id"] == budget.category_id else ZERO
+    if row["debit_account_id"] == budget.account_id:
+        return row["amount"]
+    if row["credit_account_id"] == budget.account_id:
+        return -row["amount"]
+    return ZERO
+
+
+def apply_budget_deltas(rows: Iterable[tuple[int, Mapping]]) -> None:
+    """Adjust ``Budget.spent`` for posted (``1``) or reversed (``-1``) rows.
+
+    One query finds the budgets the rows touch and one UPDATE applies all
+    the deltas. A budget whose period has rolled over is recomputed
+    instead, which already includes the rows being posted.
+    """
+    date_field = Transaction._meta.get_field("date")
+    rows = [
+        (
+            sign,
+            {
+                **row,
+                "amount": Decimal(str(row["amount"])),
+                "date": date_field.to_python(row["date"]),
+            },
+        )
+        for sign, row in rows
+    ]
+    if not rows:
+        return
+    accounts = set()
+    for _, row in rows:
+        accounts.update((row["debit_account_id"], row["credit_account_id"]))
+    categories = {row["category_id"] for _, row in rows} - {None}
+    budgets = list(
+        Budget.objects.filter(
+            family_id__in={row["family_id"] for _, row in rows}
+        ).filter(Q(category_id__in=categories) | Q(account_id__in=accounts))
+    )
+    if not budgets:
+        return
+    today = timezone.localdate()
+    stale = []
+    deltas: dict[int, Decimal] = defaultdict(Decimal)
+    for budget in budgets:
+        if budget.period_start != budget_period_start(budget.period, today):
+            stale.append(budget)
+            continue
+        end = budget_period_end(budget.period, budget.period_start)
+        for sign, row in rows:
+            if budget.period_start <= row["date"] <= end:
+                deltas[budget.pk] += sign * _budget_spend(budget, row)
+    recompute_budgets(stale, today=today)
+    deltas = {pk: amount for pk, amount in deltas.items() if amount}
+    if deltas:
+        Budget.objects.filter(pk__in=deltas).update(
+            spent=F("spent") + _delta_case(deltas)
+        )
+
+
+def recompute_budgets(
+    budgets: Iterable[Budget], *, today: date | None = None
+) -> list[Budget]:
+    """Recount each budget's current period from the ledger.
+
+    Budgets sharing a period are counted together with three grouped
+    queries. Saves and returns the budgets whose counter or period
+    changed.
+    """
+    today = today or timezone.localdate()
+    groups: dict[tuple[date, date], list[Budget]] = defaultdict(list)
+    for budget in budgets:
+        start = budget_period_start(budget.period, today)
+        groups[start, budget_period_end(budget.period, start)].append(budget)
+    changed = []
+    for (start, end), group in groups.items():
+        txs = Transaction.objects.filter(date__range=(start, end)).order_by()
+        categories = [b.category_id for b in group if b.category_id is not None]
+        accounts = [b.account_id for b in group if b.account_id is not None]
+        by_category = dict(
+            txs.filter(category_id__in=categories)
+            .values_list("category_id")
+            .annotate(total=Sum("amount"))
+        )
+        debits = dict(
+            txs.filter(debit_account_id__in=accounts)
+            .values_list("debit_account_id")
+            .annotate(total=Sum("amount"))
+        )
+        credits = dict(
+            txs.filter(credit_account_id__in=accounts)
+            .values_list("credit_account_id")
+            .annotate(total=Sum("amount"))
+        )
+        for budget in group:
+            if budget.category_id is not None:
+                spent = by_category.get(budget.category_id, ZERO)
+            else:
+                spent = debits.get(budget.account_id, ZERO) - credits.get(
+                    budget.account_id, ZERO
+                )
+            if budget.spent != spent or budget.period_start != start:
+                budget.spent = spent
+                budget.period_start = start
+                changed.append(budget)
+    Budget.objects.bulk_update(changed, ["spent", "period_start"], batch_size=500)
+    return changed
+
+
+def over_budget_notifications(today: date | None = None) -> int:
+    """Notify each family's parents once per period about overspent budgets.
+
+    Reads the stored counters only. Returns the number of budgets reported.
+    """
+    from apps.families.models import Membership
+    from apps.notifications.models import Notification
+
+    today = today or timezone.localdate()
+    over = [
+        budget
+        for budget in Budget.objects.filter(spent__gt=F("amount")).exclude(
+            notified_period=F("period_start")
+        )
+        if budget.period_start == budget_period_start(budget.period, today)
+    ]
+    if not over:
+        return 0
+    parents: dict[int, list[int]] = defaultdict(list)
+    for family_id, user_id in Membership.objects.filter(
+        family_id__in={budget.family_id for budget in over},
+        role=Membership.Role.PARENT,
+    ).values_list("family_id", "user_id"):
+        parents[family_id].append(user_id)
+    Notification.objects.bulk_create(
+        Notification(
+            user_id=user_id,
+            message=f"Budget '{budget.name}' is over: spent {budget.spent} "
+            f"of {budget.amount}.",
+        )
+        for budget in over
+        for user_id in parents[budget.family_id]
+    )
+    for budget in over:
+        budget.notified_period = budget.period_start
+    Budget.objects.bulk_update(over, ["notified_period"])
+    return len(over)
+
+
+# ===== Interest =====
+
+INTEREST_INCOME_NAME = "Interest Income"
+
+
+def post_monthly_interest(period: date | None = None) -> int:
+    """Credit one month of interest to every eligible account.
+
+    Postings are dated the last day of ``period``'s month, or today while
+    that month is still open, and earn interest on the balance as of that
+    date, so a retried or backfilled month pays what it would have paid
+    on time. Balances come from ``balances_as_of``, income accounts are
+    resolved once per family and each family's postings are bulk inserted
+    in one atomic block together with an ``InterestPosting`` marker, so
+    re-running the same month is a no-op. Returns the number of
+    transactions created.
+    """
+    period = (period or timezone.localdate()).replace(day=1)
+    period_end = period.replace(day=calendar.monthrange(period.year, period.month)[1])
+    posted_on = min(period_end, timezone.localdate())
+    paid = set(
+        InterestPosting.objects.filter(period=period).values_list(
+            "family_id", flat=True
+        )
+    )
+    accounts = list(
+        Account.objects.filter(interest_rate__gt=0)
+        .exclude(family_id__in=paid)
+        .values_list("id", "family_id", "interest_rate")
+    )
+    balances = balances_as_of((account_id for account_id, _, _ in accounts), posted_on)
+    eligible: dict[int, list[tuple[int, Decimal]]] = defaultdict(list)
+    for account_id, family_id, rate in accounts:
+        interest = (balances[account_id] * rate).quantize(Decimal("0.01"))
+        if interest > 0:
+            eligible[family_id].append((account_id, interest))
+    if not eligible:
+        return 0
+
+    income_accounts = {}
+    for account_id, family_id in Account.objects.filter(
+        family_id__in=eligible, name=INTEREST_INCOME_NAME, type=Account.Type.INCOME
+    ).values_list("id", "family_id"):
+        income_accounts.setdefault(family_id, account_id)
+
+    created = 0
+    for family_id, postings in eligible.items():
+        try:
+            with db_tx.atomic():
+                marker = InterestPosting.objects.create(
+                    family_id=family_id, period=period
+                )
+                if family_id not in income_accounts:
+                    income_accounts[family_id] = Account.objects.create(
+                        family_id=family_id,
+                        name=INTEREST_INCOME_NAME,
+                        type=Account.Type.INCOME,
+                    ).pk
+                marker.journal = Journal.objects.create(
+                    family_id=family_id,
+                    date=posted_on,
+                    memo=f"Monthly interest {period:%Y-%m}",
+                )
+                marker.save(update_fields=["journal"])
+                Transaction.objects.bulk_create(
+                    Transaction(
+                        family_id=family_id,
+                        description="Monthly Interest",
+                        amount=interest,
+                        debit_account_id=account_id,
+                        credit_account_id=income_accounts[family_id],
+                        journal=marker.journal,
+                        date=posted_on,
+                    )
+                    for account_id, interest in postings
+                )
+        except IntegrityError:
+            # Another run claimed this family and month first.
+            continue
+        created += len(postings)
+    return created
@@ -0,0 +1,22 @@
+"""Signal handlers for the accounting app."""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Transaction, reversing_in_bulk
+from .services import apply_transactions, invalidate_reports, mark_summary_stale
+
+
+@receiver(post_delete, sender=Transaction)
+def reverse_deleted_transaction(sender, instance, **kwargs):
+    """Remove a deleted transaction from its totals and daily summary.
+
+    Runs for instance deletes and cascades; ``TransactionQuerySet.delete``
+    reverses its rows in bulk instead.
+    """
+    if reversing_in_bulk.get():
+        return
+    apply_transactions([instance], sign=-1)
+    day = [(instance.family_id, instance.date)]
+    mark_summary_stale(day)
+    invalidate_reports(day)
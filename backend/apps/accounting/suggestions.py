@@ -0,0 +1,172 @@
+"""In-memory category suggestions learned from past transactions."""
+
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from .models import Transaction
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+# Seconds between incremental refreshes and full rebuilds of an index.
+REFRESH_SECONDS = 30
+REBUILD_SECONDS = 60 * 60
+# Incremental refreshes re-read rows created this long before the newest
+# one seen, so a row that committed after a newer one is still picked up.
+OVERLAP_SECONDS = 5 * 60
+# Most index tokens a partial query token may expand to.
+MAX_PREFIX_MATCHES = 20
+
+
+def tokenize(text: str) -> set[str]:
+    """Lower-cased word tokens of at least two characters."""
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+class SuggestionIndex:
+    """Token to category frequencies for one family's transactions.
+
+    ``refresh`` folds in categorised transactions created since the
+    newest one seen, less an ``OVERLAP_SECONDS`` window, so keeping the
+    index current costs one small query. Rows in the window are deduped by
+    id. A row committed more than the window after it was created waits
+    for the hourly rebuild. Lookups never touch the database.
+    """
+
+    def __init__(self, family_id: int):
+        self.family_id = family_id
+        self.tokens: dict[str, Counter] = defaultdict(Counter)
+        self.documents = 0
+        self.watermark: datetime | None = None
+        # Ids already folded in that are still inside the overlap window.
+        self._recent: dict[int, datetime] = {}
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+        self._sorted_tokens: list[str] | None = None
+        self._lock = threading.Lock()
+
+    def add(self, description: str, category_id: int) -> None:
+        for token in tokenize(description):
+            self.tokens[token][category_id] += 1
+        self.documents += 1
+        self._sorted_tokens = None
+
+    def refresh(self, *, full: bool = False) -> None:
+        """Load categorised transactions added since the previous refresh.
+
+        ``full`` discards the index first, picking up edited and deleted
+        transactions as well.
+        """
+        overlap = timedelta(seconds=OVERLAP_SECONDS)
+        with self._lock:
+            if full:
+                self.tokens = defaultdict(Counter)
+                self.documents = 0
+                self.watermark = None
+                self._recent = {}
+                self._sorted_tokens = None
+            rows = Transaction.objects.filter(
+                family_id=self.family_id, category__isnull=False
+            )
+            if self.watermark is not None:
+                rows = rows.filter(created_at__gte=self.watermark - overlap)
+            rows = rows.order_by("created_at", "id").values_list(
+                "id", "created_at", "description", "category_id"
+            )
+            for pk, created_at, description, category_id in rows.iterator(
+                chunk_size=2000
+            ):
+                if pk in self._recent:
+                    continue
+                self.add(description, category_id)
+                self._recent[pk] = created_at
+                self.watermark = created_at
+            if self.watermark is not None:
+                cutoff = self.watermark - overlap
+                self._recent = {
+                    pk: created_at
+                    for pk, created_at in self._recent.items()
+                    if created_at >= cutoff
+                }
+            self.refreshed_at = time.monotonic()
+            if full:
+                self.built_at = self.refreshed_at
+
+    def _matches(self, token: str) -> list[str]:
+        if token in self.tokens:
+            return [token]
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.tokens)
+        start = bisect_left(self._sorted_tokens, token)
+        matches = []
+        for candidate in self._sorted_tokens[start : start + MAX_PREFIX_MATCHES]:
+            if not candidate.startswith(token):
+                break
+            matches.append(candidate)
+        return matches
+
+    def suggest(self, description: str, limit: int = 3) -> list[tuple[int, float]]:
+        """Return up to ``limit`` ``(category_id, score)`` pairs, best first.
+
+        Each token votes for the categories it was seen with, weighted by
+        how rare the token is; a token only known as a prefix of indexed
+        tokens votes at half weight. Scores are shares of the total vote.
+        """
+        scores: Counter = Counter()
+        with self._lock:
+            for token in tokenize(description):
+                for match in self._matches(token):
+                    counts = self.tokens[match]
+                    seen = sum(counts.values())
+                    weight = math.log(1 + self.documents / seen)
+                    if match != token:
+                        weight /= 2
+                    for category_id, count in counts.items():
+                        scores[category_id] += weight * count / seen
+        total = sum(scores.values())
+        return [
+            (category_id, round(score / total, 3))
+            for category_id, score in scores.most_common(limit)
+        ]
+
+
+class SuggestionCache:
+    """Per-family ``SuggestionIndex`` objects with LRU eviction."""
+
+    def __init__(self, max_families: int | None = None):
+        self.max_families = max_families
+        self._indexes: OrderedDict[int, SuggestionIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, family_id: int) -> SuggestionIndex:
+        """Return the family's index, refreshing it when it is due."""
+        limit = self.max_families or settings.CATEGORY_SUGGESTION_FAMILIES
+        with self._lock:
+            index = self._indexes.get(family_id)
+            if index is None:
+                index = self._indexes[family_id] = SuggestionIndex(family_id)
+            self._indexes.move_to_end(family_id)
+            while len(self._indexes) > limit:
+                self._indexes.popitem(last=False)
+        now = time.monotonic()
+        if not index.built_at or now - index.built_at > REBUILD_SECONDS:
+            index.refresh(full=True)
+        elif now - index.refreshed_at > REFRESH_SECONDS:
+            index.refresh()
+        return index
+
+    def forget(self, family_id: int) -> None:
+        with self._lock:
+            self._indexes.pop(family_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+suggestions = SuggestionCache()
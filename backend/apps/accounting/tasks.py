@@ -1,36 +1,157 @@
-from decimal import Decimal
+import uuid
+from datetime import date, timedelta
+from itertools import islice
 
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction as db_tx
+from django.utils import timezone
 
-from .models import Account, Transaction
+from . import services
+from .importer import TransactionImporter, read_csv_rows
+from .models import Budget, ImportJob
 
 
 @shared_task
 def daily_summary():
-    """Placeholder task updating account balances."""
+    """Roll new and changed transactions into ``DailySummary``."""
+    services.update_daily_summary()
     return "ok"
 
 
 @shared_task
-def pay_monthly_interest():
-    """Credit monthly interest to accounts with an interest rate."""
-    for account in Account.objects.filter(interest_rate__gt=0):
-        balance = account.balance
-        if balance <= 0:
-            continue
-        interest = (Decimal(balance) * account.interest_rate).quantize(Decimal("0.01"))
-        if interest <= 0:
-            continue
-        income_account, _ = Account.objects.get_or_create(
-            family=account.family,
-            name="Interest Income",
-            type=Account.Type.INCOME,
+def reconcile_budgets():
+    """Recount every budget's spend from the ledger, fixing any drift."""
+    services.recompute_budgets(Budget.objects.all())
+    return "ok"
+
+
+@shared_task
+def notify_over_budget():
+    """Notify parents about budgets that went over their limit."""
+    services.over_budget_notifications()
+    return "ok"
+
+
+@shared_task
+def pay_monthly_interest(period=None):
+    """Credit monthly interest to accounts with an interest rate.
+
+    ``period`` is an optional ISO date within the month to pay; a month
+    that was already paid for a family is skipped.
+    """
+    services.post_monthly_interest(date.fromisoformat(period) if period else None)
+    return "ok"
+
+
+@shared_task
+def write_balance_checkpoints():
+    """Write account balance checkpoints for closed periods.
+
+    Runs daily so checkpoints dropped by back-dated transactions are
+    rebuilt promptly.
+    """
+    services.write_balance_checkpoints()
+    return "ok"
+
+
+class ImportSuperseded(Exception):
+    """Another worker took over the import job."""
+
+
+def _claim_import_job(job_id: int, worker: str) -> ImportJob | None:
+    """Take the job for ``worker``; ``None`` while another worker holds it.
+
+    A running job is held as long as its heartbeat is younger than
+    ``TRANSACTION_IMPORT_LEASE_SECONDS``; after that it is assumed lost
+    and may be taken over.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.TRANSACTION_IMPORT_LEASE_SECONDS)
+    with db_tx.atomic():
+        job = ImportJob.objects.select_for_update().get(pk=job_id)
+        if (
+            job.status == ImportJob.Status.RUNNING
+            and job.heartbeat_at is not None
+            and job.heartbeat_at > now - lease
+        ):
+            return None
+        if job.status != ImportJob.Status.COMPLETED:
+            job.status = ImportJob.Status.RUNNING
+            job.worker = worker
+            job.heartbeat_at = now
+            job.started_at = job.started_at or now
+            job.save(update_fields=["status", "worker", "heartbeat_at", "started_at"])
+    return job
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, max_retries=None)
+def run_import_job(self, job_id):
+    """Process an ``ImportJob``, resuming after its last committed chunk.
+
+    The job is claimed under a row lock, and every chunk re-locks it and
+    checks that this worker still owns it at the offset it expects, so a
+    redelivered task never inserts the same rows twice. A delivery that
+    finds the job held retries once the holder's lease could have lapsed.
+    """
+    worker = uuid.uuid4().hex
+    job = _claim_import_job(job_id, worker)
+    if job is None:
+        raise self.retry(countdown=settings.TRANSACTION_IMPORT_LEASE_SECONDS)
+    if job.status == ImportJob.Status.COMPLETED:
+        return "ok"
+
+    importer = TransactionImporter(
+        job.family,
+        chunk_size=settings.TRANSACTION_IMPORT_CHUNK_SIZE,
+        auto_categorize=job.auto_categorize,
+    )
+    importer.created = job.rows_created
+    importer.failed = job.rows_failed
+    importer.errors = list(job.errors)
+
+    def claim(start):
+        held = (
+            ImportJob.objects.select_for_update()
+            .filter(pk=job.pk)
+            .values_list("worker", "rows_processed")
+            .get()
         )
-        Transaction.objects.create(
-            family=account.family,
-            description="Monthly Interest",
-            amount=interest,
-            debit_account=account,
-            credit_account=income_account,
+        if held != (worker, start):
+            raise ImportSuperseded(job.pk)
+
+    def checkpoint(consumed):
+        job.rows_processed = consumed
+        job.rows_created = importer.created
+        job.rows_failed = importer.failed
+        job.errors = importer.errors
+        job.heartbeat_at = timezone.now()
+        job.save(
+            update_fields=[
+                "rows_processed",
+                "rows_created",
+                "rows_failed",
+                "errors",
+                "heartbeat_at",
+            ]
         )
+
+    try:
+        with job.file.open("rb") as handle:
+            rows = islice(read_csv_rows(handle), job.rows_processed, None)
+            importer.run(
+                rows, offset=job.rows_processed, on_chunk=checkpoint, claim=claim
+            )
+    except ImportSuperseded:
+        return "superseded"
+    except Exception as exc:
+        job.status = ImportJob.Status.FAILED
+        job.detail = str(exc)[:255]
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "detail", "finished_at"])
+        raise
+    job.status = ImportJob.Status.COMPLETED
+    job.finished_at = timezone.now()
+    job.file.delete(save=False)
+    job.save(update_fields=["status", "finished_at", "file"])
     return "ok"
@@ -1,13 +1,59 @@
+import csv
+import gzip
+import json
+import threading
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from tempfile import mkdtemp
+from unittest.mock import patch
 
 from apps.core.models import User
 from apps.families.models import Family, Membership
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 
-from .models import Account, Category, Journal, Transaction
-from .tasks import pay_monthly_interest
+from .forecast import RATE_UNITS, project
+from .importer import read_csv_rows
+from .integrity import check_family
+from .models import (
+    Account,
+    BalanceCheckpoint,
+    Budget,
+    Category,
+    ImportJob,
+    Journal,
+    StaleSummaryDay,
+    Transaction,
+)
+from .services import (
+    balances_as_of,
+    compute_account_totals,
+    over_budget_notifications,
+    pending_summary_days,
+    summary_totals,
+    update_daily_summary,
+    write_balance_checkpoints,
+)
+from .suggestions import SuggestionCache, suggestions
+from .tasks import (
+    pay_monthly_interest,
+    reconcile_budgets,
+    run_import_job,
+)
 
 
 class AccountingModelTests(TestCase):
@@ -56,6 +102,593 @@ class AccountingModelTests(TestCase):
         self.assertEqual(debit.balance, Decimal("50.00"))
         self.assertEqual(credit.balance, Decimal("-50.00"))
 
+    def test_balance_tracks_updates_and_deletes(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        bank = Account.objects.create(
+            family=self.family, name="Bank", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        tx = Transaction.objects.create(
+            family=self.family,
+            description="Payday",
+            amount="50.00",
+            debit_account=cash,
+            credit_account=income,
+        )
+        tx.amount = Decimal("80.00")
+        tx.debit_account = bank
+        tx.save()
+        cash.refresh_from_db()
+        bank.refresh_from_db()
+        income.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("0.00"))
+        self.assertEqual(bank.balance, Decimal("80.00"))
+        self.assertEqual(income.balance, Decimal("-80.00"))
+
+        tx.delete()
+        bank.refresh_from_db()
+        income.refresh_from_db()
+        self.assertEqual(bank.balance, Decimal("0.00"))
+        self.assertEqual(income.balance, Decimal("0.00"))
+
+    def test_account_save_keeps_concurrent_totals(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        stale = Account.objects.get(pk=cash.pk)
+        Transaction.objects.create(
+            family=self.family,
+            description="Payday",
+            amount="50.00",
+            debit_account=cash,
+            credit_account=income,
+        )
+        stale.name = "Wallet"
+        stale.save()
+        cash.refresh_from_db()
+        self.assertEqual(cash.name, "Wallet")
+        self.assertEqual(cash.balance, Decimal("50.00"))
+
+    def test_balance_tracks_bulk_paths(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    family=self.family,
+                    description=f"tx {i}",
+                    amount=Decimal("10.00"),
+                    debit_account=cash,
+                    credit_account=income,
+                )
+                for i in range(3)
+            ]
+        )
+        self.assertEqual(cash.balance, Decimal("30.00"))
+        Transaction.objects.filter(description="tx 0").update(amount=Decimal("5"))
+        cash.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("25.00"))
+        Transaction.objects.filter(description="tx 1").delete()
+        cash.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("15.00"))
+
+        # Cascading the debit side away must still unwind the credit side.
+        cash.delete()
+        income.refresh_from_db()
+        self.assertEqual(income.balance, Decimal("0.00"))
+
+    def test_queryset_delete_reverses_in_fixed_queries(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        today = timezone.localdate()
+
+        def post(count):
+            Transaction.objects.bulk_create(
+                Transaction(
+                    family=self.family,
+                    description=f"tx {i}",
+                    amount=Decimal("1.00"),
+                    debit_account=cash,
+                    credit_account=income,
+                    date=today - timedelta(days=i % 3),
+                )
+                for i in range(count)
+            )
+
+        queries = []
+        for count in (10, 100):
+            post(count)
+            with CaptureQueriesContext(connection) as ctx:
+                Transaction.objects.all().delete()
+            queries.append(len(ctx))
+        self.assertEqual(queries[0], queries[1])
+        cash.refresh_from_db()
+        income.refresh_from_db()
+        self.assertEqual((cash.balance, income.balance), (0, 0))
+        self.assertEqual(
+            set(StaleSummaryDay.objects.values_list("date", flat=True)),
+            {today - timedelta(days=i) for i in range(3)},
+        )
+
+    def test_save_skips_foreign_key_queries_for_loaded_accounts(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        values = {"description": "Payday", "amount": "50.00"}
+        # Savepoint, insert, totals update, budget lookup, summary queue,
+        # release.
+        with self.assertNumQueries(6):
+            Transaction.objects.create(
+                family=self.family, debit_account=cash, credit_account=income, **values
+            )
+        # Bare ids add one query resolving both accounts.
+        with self.assertNumQueries(7):
+            Transaction.objects.create(
+                family_id=self.family.pk,
+                debit_account_id=cash.pk,
+                credit_account_id=income.pk,
+                **values,
+            )
+
+        other = Family.objects.create(name="Jones", owner=self.user)
+        foreign = Account.objects.create(
+            family=other, name="Theirs", type=Account.Type.ASSET
+        )
+        for debit, credit, amount in [
+            (cash, cash, "1.00"),
+            (cash, income, "0"),
+            (cash, foreign, "1.00"),
+        ]:
+            with self.assertRaises(ValidationError):
+                Transaction.objects.create(
+                    family=self.family,
+                    description="bad",
+                    amount=amount,
+                    debit_account=debit,
+                    credit_account=credit,
+                )
+        cash.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("100.00"))
+
+    def test_bulk_create_validated(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+
+        def batch(*amounts):
+            return [
+                Transaction(
+                    family_id=self.family.pk,
+                    description="pay",
+                    amount=amount,
+                    debit_account_id=cash.pk,
+                    credit_account_id=income.pk,
+                )
+                for amount in amounts
+            ]
+
+        with self.assertRaises(ValidationError) as caught:
+            Transaction.objects.bulk_create_validated(batch("5.00", "-1.00", "abc"))
+        self.assertEqual(sorted(caught.exception.message_dict), ["1", "2"])
+        self.assertFalse(Transaction.objects.exists())
+
+        # One query resolves the accounts of the whole batch.
+        with CaptureQueriesContext(connection) as queries:
+            Transaction.objects.bulk_create_validated(batch(*["1.00"] * 50))
+        account_queries = [
+            q for q in queries.captured_queries if "accounting_account" in q["sql"]
+        ]
+        self.assertEqual(len(account_queries), 2)  # lookup and totals update
+        cash.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("50.00"))
+
+    def test_rebuild_balances_command(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description="Payday",
+            amount="50.00",
+            debit_account=cash,
+            credit_account=income,
+        )
+        call_command("rebuild_balances", "--verify", stdout=StringIO())
+        Account.objects.filter(pk=cash.pk).update(debit_total=0)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_balances", "--verify", stdout=StringIO())
+        call_command("rebuild_balances", stdout=StringIO())
+        cash.refresh_from_db()
+        self.assertEqual(cash.balance, Decimal("50.00"))
+
+    def test_balance_checkpoints_and_backdating(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        for day, amount in [(15, "10.00"), (40, "20.00"), (70, "30.00")]:
+            Transaction.objects.create(
+                family=self.family,
+                description="pay",
+                amount=amount,
+                debit_account=cash,
+                credit_account=income,
+                date=date.fromordinal(date(2025, 1, 1).toordinal() + day),
+            )
+        written = write_balance_checkpoints(today=date(2025, 4, 10))
+        self.assertEqual(written, 6)
+        checkpoint = BalanceCheckpoint.objects.get(account=cash, date="2025-02-28")
+        self.assertEqual(checkpoint.debit_total, Decimal("30.00"))
+        self.assertEqual(
+            balances_as_of([cash.pk], date(2025, 3, 1))[cash.pk], Decimal("30.00")
+        )
+
+        # A back-dated transaction drops the checkpoints it lands before.
+        Transaction.objects.create(
+            family=self.family,
+            description="late",
+            amount="5.00",
+            debit_account=cash,
+            credit_account=income,
+            date="2025-02-01",
+        )
+        self.assertEqual(
+            list(
+                BalanceCheckpoint.objects.filter(account=cash).values_list(
+                    "date", flat=True
+                )
+            ),
+            [date(2025, 1, 31)],
+        )
+        self.assertEqual(
+            balances_as_of([cash.pk, income.pk], date(2025, 3, 1)),
+            {cash.pk: Decimal("35.00"), income.pk: Decimal("-35.00")},
+        )
+        self.assertEqual(write_balance_checkpoints(today=date(2025, 4, 10)), 4)
+        checkpoint = BalanceCheckpoint.objects.get(account=cash, date="2025-03-31")
+        self.assertEqual(checkpoint.debit_total, Decimal("65.00"))
+
+    def test_check_ledger_reports_broken_invariants(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        other = Family.objects.create(name="Jones", owner=self.user)
+        foreign = Account.objects.create(
+            family=other, name="Theirs", type=Account.Type.ASSET
+        )
+        txs = [
+            Transaction.objects.create(
+                family=self.family,
+                description="pay",
+                amount="10.00",
+                debit_account=cash,
+                credit_account=income,
+                date=day,
+            )
+            for day in ("2025-01-10", "2025-02-10", "2025-03-10", "2025-04-10")
+        ]
+        write_balance_checkpoints(today=date(2025, 4, 20))
+        self.assertEqual(check_family(self.family.pk), [])
+        call_command("check_ledger", "--workers", "1", stdout=StringIO())
+
+        Transaction.objects.filter(pk=txs[0].pk).update(credit_account=cash)
+        Transaction.objects.filter(pk=txs[1].pk).update(amount=0)
+        Transaction.objects.filter(pk=txs[2].pk).update(credit_account=foreign)
+        Account.objects.filter(pk=income.pk).update(credit_total=99)
+        BalanceCheckpoint.objects.create(
+            family=self.family,
+            account=cash,
+            date="2025-02-28",
+            debit_total="1.00",
+            credit_total="0.00",
+        )
+        findings = check_family(self.family.pk)
+        self.assertEqual(
+            sorted((f.check, f.object_id) for f in findings),
+            [
+                ("account_totals", income.pk),
+                ("checkpoint", BalanceCheckpoint.objects.get(date="2025-02-28").pk),
+                ("foreign_account", txs[2].pk),
+                ("non_positive_amount", txs[1].pk),
+                ("same_account", txs[0].pk),
+            ],
+        )
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "5 ledger problem(s) found"):
+            call_command(
+                "check_ledger",
+                "--family",
+                str(self.family.pk),
+                "--workers",
+                "1",
+                stdout=out,
+            )
+        self.assertIn(f"same_account {txs[0].pk}", out.getvalue())
+
+    def test_daily_summary_rolls_up_incrementally(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        food = Account.objects.create(
+            family=self.family, name="Food", type=Account.Type.EXPENSE
+        )
+        groceries = Category.objects.create(family=self.family, name="Groceries")
+        txs = [
+            Transaction.objects.create(
+                family=self.family,
+                description="shop",
+                amount=amount,
+                debit_account=food,
+                credit_account=cash,
+                category=groceries,
+                date=day,
+            )
+            for day, amount in [
+                ("2025-01-05", "10.00"),
+                ("2025-01-05", "5.00"),
+                ("2025-02-10", "7.50"),
+            ]
+        ]
+        self.assertEqual(update_daily_summary(), 4)
+        self.assertEqual(
+            list(summary_totals(self.family.pk, group_by=("account", "category"))),
+            [
+                {
+                    "period": date(2025, 1, 1),
+                    "account_id": cash.pk,
+                    "category_id": groceries.pk,
+                    "debit_total": Decimal("0.00"),
+                    "credit_total": Decimal("15.00"),
+                    "count": 2,
+                },
+                {
+                    "period": date(2025, 1, 1),
+                    "account_id": food.pk,
+                    "category_id": groceries.pk,
+                    "debit_total": Decimal("15.00"),
+                    "credit_total": Decimal("0.00"),
+                    "count": 2,
+                },
+                {
+                    "period": date(2025, 2, 1),
+                    "account_id": cash.pk,
+                    "category_id": groceries.pk,
+                    "debit_total": Decimal("0.00"),
+                    "credit_total": Decimal("7.50"),
+                    "count": 1,
+                },
+                {
+                    "period": date(2025, 2, 1),
+                    "account_id": food.pk,
+                    "category_id": groceries.pk,
+                    "debit_total": Decimal("7.50"),
+                    "credit_total": Decimal("0.00"),
+                    "count": 1,
+                },
+            ],
+        )
+        self.assertEqual(update_daily_summary(), 0)
+
+        # Edits, deletes and new rows are all picked up on the next run.
+        txs[0].date = date(2025, 2, 10)
+        txs[0].category = None
+        txs[0].save()
+        txs[1].delete()
+        Transaction.objects.filter(pk=txs[2].pk).update(amount="8.00")
+        Transaction.objects.create(
+            family=self.family,
+            description="shop",
+            amount="1.00",
+            debit_account=food,
+            credit_account=cash,
+            date="2025-03-01",
+        )
+        update_daily_summary()
+        yearly = summary_totals(self.family.pk, period="year")
+        self.assertEqual(
+            [(row["account_id"], row["debit_total"], row["count"]) for row in yearly],
+            [(cash.pk, Decimal("0.00"), 3), (food.pk, Decimal("19.00"), 3)],
+        )
+        by_category = summary_totals(
+            self.family.pk, start=date(2025, 2, 1), group_by=("category",)
+        )
+        self.assertEqual(
+            {
+                (row["period"], row["category_id"]): row["credit_total"]
+                for row in by_category
+            },
+            {
+                (date(2025, 2, 1), None): Decimal("10.00"),
+                (date(2025, 2, 1), groceries.pk): Decimal("8.00"),
+                (date(2025, 3, 1), None): Decimal("1.00"),
+            },
+        )
+        self.assertFalse(StaleSummaryDay.objects.exists())
+
+        # A row committed after a run with an id below rows that run saw
+        # (ids are allocated at insert, not commit) is still rolled up.
+        Transaction.objects.create(
+            id=txs[1].pk,
+            family=self.family,
+            description="late",
+            amount="2.00",
+            debit_account=food,
+            credit_account=cash,
+            date="2025-03-01",
+        )
+        self.assertEqual(pending_summary_days(self.family.pk), {date(2025, 3, 1)})
+        update_daily_summary()
+        march = summary_totals(self.family.pk, start=date(2025, 3, 1))
+        self.assertEqual(
+            {row["account_id"]: row["debit_total"] for row in march},
+            {cash.pk: Decimal("0.00"), food.pk: Decimal("3.00")},
+        )
+
+    def test_suggestion_cache_refreshes_incrementally_and_evicts(self):
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        food = Account.objects.create(
+            family=self.family, name="Food", type=Account.Type.EXPENSE
+        )
+        pizza = Category.objects.create(family=self.family, name="Pizza")
+        cache = SuggestionCache(max_families=1)
+
+        def post(description, **extra):
+            Transaction.objects.create(
+                family=self.family,
+                description=description,
+                amount="1.00",
+                debit_account=food,
+                credit_account=cash,
+                category=pizza,
+                **extra,
+            )
+
+        post("Dominos pizza")
+        index = cache.get(self.family.pk)
+        self.assertEqual(index.suggest("dominos"), [(pizza.pk, 1.0)])
+        post("Crust pizza")
+        self.assertEqual(index.suggest("crust"), [])
+        index.refresh()
+        self.assertEqual(index.documents, 2)
+        self.assertEqual(index.suggest("crust"), [(pizza.pk, 1.0)])
+
+        # A row created before the newest one seen but committed after it
+        # is picked up once, inside the overlap window.
+        post("Slice pizza", created_at=index.watermark - timedelta(minutes=1))
+        index.refresh()
+        index.refresh()
+        self.assertEqual(index.documents, 3)
+        self.assertEqual(index.suggest("slice"), [(pizza.pk, 1.0)])
+
+        other = Family.objects.create(name="Other", owner=self.user)
+        cache.get(other.pk)
+        self.assertIsNot(cache.get(self.family.pk), index)
+
+    def test_budget_counters_follow_every_write_path(self):
+        from apps.notifications.models import Notification
+
+        today = timezone.localdate()
+        cash = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        food = Account.objects.create(
+            family=self.family, name="Food", type=Account.Type.EXPENSE
+        )
+        dining = Category.objects.create(family=self.family, name="Dining")
+        by_account = Budget.objects.create(
+            family=self.family,
+            name="Food",
+            account=food,
+            amount="100.00",
+            period_start=today.replace(day=1),
+        )
+        by_category = Budget.objects.create(
+            family=self.family,
+            name="Dining",
+            category=dining,
+            amount="30.00",
+            period_start=today.replace(day=1),
+        )
+
+        def spent():
+            return [
+                Budget.objects.get(pk=budget.pk).spent
+                for budget in (by_account, by_category)
+            ]
+
+        tx = Transaction.objects.create(
+            family=self.family,
+            description="Dinner",
+            amount="25.00",
+            debit_account=food,
+            credit_account=cash,
+            category=dining,
+        )
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    family=self.family,
+                    description="Groceries",
+                    amount="40.00",
+                    debit_account=food,
+                    credit_account=cash,
+                ),
+                # Outside the current period: not counted.
+                Transaction(
+                    family=self.family,
+                    description="Old dinner",
+                    amount="99.00",
+                    debit_account=food,
+                    credit_account=cash,
+                    category=dining,
+                    date=today.replace(day=1) - timedelta(days=1),
+                ),
+            ]
+        )
+        self.assertEqual(spent(), [Decimal("65.00"), Decimal("25.00")])
+        tx.amount = Decimal("35.00")
+        tx.save()
+        self.assertEqual(spent(), [Decimal("75.00"), Decimal("35.00")])
+        Transaction.objects.filter(description="Groceries").update(category=dining)
+        self.assertEqual(spent(), [Decimal("75.00"), Decimal("75.00")])
+        Transaction.objects.filter(description="Groceries").delete()
+        self.assertEqual(spent(), [Decimal("35.00"), Decimal("35.00")])
+
+        self.assertEqual(over_budget_notifications(), 1)
+        self.assertEqual(over_budget_notifications(), 0)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+
+        Budget.objects.filter(pk=by_account.pk).update(spent=0)
+        reconcile_budgets()
+        self.assertEqual(spent(), [Decimal("35.00"), Decimal("35.00")])
+
+    def test_forecast_projection_matches_interest_posting(self):
+        balances = [10_000_00, -500_00, 123_45, 0]
+        rates = [Decimal("0.0125"), Decimal("0.01"), Decimal("0.0033"), Decimal("0")]
+        flows = [-200_00, 300_00, 1_05, -7]
+        series = project(
+            balances, [int(rate * RATE_UNITS) for rate in rates], flows, 24
+        )
+        expected = [Decimal(cents) / 100 for cents in balances]
+        for month in series:
+            for index, rate in enumerate(rates):
+                if expected[index] > 0:
+                    interest = (expected[index] * rate).quantize(Decimal("0.01"))
+                    expected[index] += interest
+                expected[index] += Decimal(flows[index]) / 100
+            self.assertEqual([Decimal(c) / 100 for c in month], expected)
+
     def test_invalid_transaction_same_account(self):
         acct = Account.objects.create(
             family=self.family, name="Cash", type=Account.Type.ASSET
@@ -91,6 +724,156 @@ class AccountingModelTests(TestCase):
             Transaction.objects.filter(description="Monthly Interest").exists()
         )
 
+    def test_monthly_interest_is_set_based_and_idempotent(self):
+        income = Account.objects.create(
+            family=self.family, name="Interest Income", type=Account.Type.INCOME
+        )
+        overdrawn = Account.objects.create(
+            family=self.family,
+            name="Overdrawn",
+            type=Account.Type.ASSET,
+            interest_rate=Decimal("0.01"),
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description="withdrawal",
+            amount="50.00",
+            debit_account=income,
+            credit_account=overdrawn,
+            date="2025-01-01",
+        )
+
+        def add_savings(count):
+            for i in range(count):
+                account = Account.objects.create(
+                    family=self.family,
+                    name=f"Savings {i}",
+                    type=Account.Type.ASSET,
+                    interest_rate=Decimal("0.01"),
+                )
+                Transaction.objects.create(
+                    family=self.family,
+                    description="deposit",
+                    amount="100.00",
+                    debit_account=account,
+                    credit_account=income,
+                    date="2025-01-01",
+                )
+
+        add_savings(2)
+        with CaptureQueriesContext(connection) as march:
+            pay_monthly_interest("2025-03-15")
+        pay_monthly_interest("2025-03-01")
+        add_savings(8)
+        with CaptureQueriesContext(connection) as april:
+            pay_monthly_interest("2025-04-01")
+        # The query count does not grow with the number of accounts.
+        self.assertEqual(len(march.captured_queries), len(april.captured_queries))
+
+        interest = Transaction.objects.filter(description="Monthly Interest")
+        self.assertEqual(interest.count(), 12)
+        self.assertFalse(interest.filter(debit_account=overdrawn).exists())
+        first = Account.objects.get(pk=interest.earliest("id").debit_account_id)
+        self.assertEqual(first.balance, Decimal("102.01"))
+        self.assertEqual(Account.objects.filter(name="Interest Income").count(), 1)
+        self.assertEqual(
+            set(interest.values_list("date", flat=True)),
+            {date(2025, 3, 31), date(2025, 4, 30)},
+        )
+
+    def test_backfilled_interest_uses_period_end_balance(self):
+        savings = Account.objects.create(
+            family=self.family,
+            name="Savings",
+            type=Account.Type.ASSET,
+            interest_rate=Decimal("0.01"),
+        )
+        income = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        for amount, day in [("100.00", "2025-01-10"), ("900.00", "2025-02-10")]:
+            Transaction.objects.create(
+                family=self.family,
+                description="deposit",
+                amount=amount,
+                debit_account=savings,
+                credit_account=income,
+                date=day,
+            )
+        pay_monthly_interest("2025-01-20")
+        posting = Transaction.objects.get(description="Monthly Interest")
+        self.assertEqual(posting.date, date(2025, 1, 31))
+        self.assertEqual(posting.amount, Decimal("1.00"))
+        self.assertEqual(posting.journal.date, date(2025, 1, 31))
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class CheckpointConcurrencyTests(TransactionTestCase):
+    """Runs on databases with row locks; SQLite serialises writers anyway."""
+
+    def test_backdated_write_during_checkpoint_run(self):
+        owner = User.objects.create_user("race@example.com", "pass")
+        family = Family.objects.create(name="Race", owner=owner)
+        cash = Account.objects.create(
+            family=family, name="Cash", type=Account.Type.ASSET
+        )
+        income = Account.objects.create(
+            family=family, name="Income", type=Account.Type.INCOME
+        )
+
+        def post(amount, day):
+            Transaction.objects.create(
+                family=family,
+                description="pay",
+                amount=amount,
+                debit_account=cash,
+                credit_account=income,
+                date=day,
+            )
+
+        post("10.00", date(2025, 1, 15))
+        computed, release = threading.Event(), threading.Event()
+
+        def pause_after_computing(*args, **kwargs):
+            totals = compute_account_totals(*args, **kwargs)
+            computed.set()
+            release.wait(10)
+            return totals
+
+        def in_thread(target, *args):
+            def run():
+                try:
+                    target(*args)
+                finally:
+                    connection.close()
+
+            thread = threading.Thread(target=run)
+            thread.start()
+            return thread
+
+        with patch(
+            "apps.accounting.services.compute_account_totals",
+            side_effect=pause_after_computing,
+        ):
+            writer = in_thread(write_balance_checkpoints, date(2025, 4, 10))
+            self.assertTrue(computed.wait(10))
+            poster = in_thread(post, "5.00", date(2025, 2, 1))
+            # The back-dated write waits on the run's account locks.
+            poster.join(0.5)
+            self.assertTrue(poster.is_alive())
+            release.set()
+            writer.join(10)
+            poster.join(10)
+
+        self.assertEqual(
+            balances_as_of([cash.pk], date(2025, 3, 31))[cash.pk], Decimal("15.00")
+        )
+        for checkpoint in BalanceCheckpoint.objects.filter(account=cash):
+            debit, _ = compute_account_totals([cash.pk], through=checkpoint.date)[
+                cash.pk
+            ]
+            self.assertEqual(checkpoint.debit_total, debit)
+
 
 class AccountingAPITests(TestCase):
     def setUp(self):
@@ -108,6 +891,317 @@ class AccountingAPITests(TestCase):
             family=self.family, name="Income", type=Account.Type.INCOME
         )
 
+    def test_account_list_query_count_is_constant(self):
+        from apps.assets.models import Asset
+
+        def list_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get("/api/accounts/")
+            self.assertEqual(resp.status_code, 200)
+            return len(ctx.captured_queries), resp
+
+        baseline, _ = list_queries()
+        asset = Asset.objects.create(family=self.family, name="Coin", symbol="c")
+        for i in range(10):
+            account = Account.objects.create(
+                family=self.family, name=f"Acct {i}", type=Account.Type.ASSET
+            )
+            account.assets.add(asset)
+            Transaction.objects.create(
+                family=self.family,
+                description="move",
+                amount="5.00",
+                debit_account=account,
+                credit_account=self.credit,
+            )
+        count, resp = list_queries()
+        self.assertEqual(count, baseline)
+        self.assertEqual(len(resp.data["results"]), 12)
+        self.assertEqual(resp.data["results"][2]["balance"], "5.00")
+        self.assertEqual(resp.data["results"][2]["assets"], [asset.id])
+
+    def test_account_balance_as_of(self):
+        Transaction.objects.create(
+            family=self.family,
+            description="Old",
+            amount="20.00",
+            debit_account=self.debit,
+            credit_account=self.credit,
+            date="2025-01-10",
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description="New",
+            amount="5.00",
+            debit_account=self.debit,
+            credit_account=self.credit,
+            date="2025-03-10",
+        )
+        write_balance_checkpoints(today=date(2025, 4, 1))
+        resp = self.client.get("/api/accounts/?as_of=2025-02-15")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["results"][0]["balance"], "20.00")
+        resp = self.client.get(f"/api/accounts/{self.debit.id}/")
+        self.assertEqual(resp.data["balance"], "25.00")
+        resp = self.client.get("/api/accounts/?as_of=yesterday")
+        self.assertEqual(resp.status_code, 400)
+
+        # Writes answer with the balance of the account they created.
+        resp = self.client.post(
+            "/api/accounts/?as_of=2025-02-15", {"name": "Savings", "type": "asset"}
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["balance"], "0.00")
+        resp = self.client.patch(
+            f"/api/accounts/{self.debit.id}/?as_of=2025-02-15", {"name": "Wallet"}
+        )
+        self.assertEqual(resp.data["balance"], "20.00")
+
+    def test_account_balance_as_of_only_prices_the_page(self):
+        for index in range(3):
+            Account.objects.create(
+                family=self.family, name=f"A{index}", type=Account.Type.ASSET
+            )
+        with patch(
+            "apps.accounting.serializers.balances_as_of", wraps=balances_as_of
+        ) as priced:
+            resp = self.client.get("/api/accounts/?as_of=2025-02-15&page_size=2")
+        self.assertEqual(len(resp.data["results"]), 2)
+        priced.assert_called_once()
+        self.assertEqual(
+            sorted(priced.call_args.args[0]),
+            sorted(row["id"] for row in resp.data["results"]),
+        )
+
+    def test_category_report_matrix_is_cached_and_invalidated(self):
+        cache.clear()
+        food = Account.objects.create(
+            family=self.family, name="Food", type=Account.Type.EXPENSE
+        )
+        salary = Category.objects.create(family=self.family, name="Salary")
+        groceries = Category.objects.create(family=self.family, name="Groceries")
+
+        def post(amount, day, debit, credit, category=None):
+            Transaction.objects.create(
+                family=self.family,
+                description="tx",
+                amount=amount,
+                debit_account=debit,
+                credit_account=credit,
+                category=category,
+                date=day,
+            )
+
+        post("1000.00", "2025-01-31", self.debit, self.credit, salary)
+        post("40.00", "2025-01-10", food, self.debit, groceries)
+        update_daily_summary()
+        # Not rolled up yet: read straight from the ledger.
+        post("25.00", "2025-02-03", food, self.debit, groceries)
+        post("5.00", "2025-02-04", food, self.debit)
+
+        url = "/api/reports/?start=2025-01-01&end=2025-03-31"
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.data["periods"], ["2025-01-01", "2025-02-01", "2025-03-01"]
+        )
+        rows = {row["name"]: row for row in resp.data["categories"]}
+        self.assertEqual(list(rows), ["Groceries", "Salary", "Uncategorised"])
+        self.assertEqual(rows["Groceries"]["expense"], ["40.00", "25.00", "0.00"])
+        self.assertEqual(rows["Salary"]["income"], ["1000.00", "0.00", "0.00"])
+        self.assertEqual(rows["Uncategorised"]["expense"], ["0.00", "5.00", "0.00"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).data, resp.data)
+        self.assertFalse(
+            any("accounting_dailysummary" in q["sql"] for q in ctx.captured_queries)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post("10.00", "2025-03-15", food, self.debit, groceries)
+        rows = {row["name"]: row for row in self.client.get(url).data["categories"]}
+        self.assertEqual(rows["Groceries"]["expense"], ["40.00", "25.00", "10.00"])
+
+        yearly = self.client.get(url + "&period=year").data
+        self.assertEqual(yearly["periods"], ["2025-01-01"])
+        self.assertEqual(self.client.get("/api/reports/?period=week").status_code, 400)
+
+    def test_trial_balance_and_balance_sheet(self):
+        loan = Account.objects.create(
+            family=self.family, name="Loan", type=Account.Type.LIABILITY
+        )
+        rent = Account.objects.create(
+            family=self.family, name="Rent", type=Account.Type.EXPENSE
+        )
+        for amount, debit, credit, day in [
+            ("1000.00", self.debit, self.credit, "2025-01-10"),
+            ("500.00", self.debit, loan, "2025-02-01"),
+            ("300.00", rent, self.debit, "2025-02-15"),
+        ]:
+            Transaction.objects.create(
+                family=self.family,
+                description="tx",
+                amount=amount,
+                debit_account=debit,
+                credit_account=credit,
+                date=day,
+            )
+        for i in range(10):
+            Account.objects.create(
+                family=self.family, name=f"Spare {i}", type=Account.Type.ASSET
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/reports/trial-balance/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertLess(len(ctx.captured_queries), 5)
+        self.assertEqual(resp.data["total_debit"], "1500.00")
+        self.assertEqual(resp.data["total_credit"], "1500.00")
+        cash = next(row for row in resp.data["accounts"] if row["name"] == "Cash")
+        self.assertEqual((cash["debit"], cash["credit"]), ("1200.00", "0.00"))
+
+        sheet = self.client.get("/api/reports/balance-sheet/").data
+        self.assertTrue(sheet["balanced"])
+        self.assertEqual(sheet["sections"]["asset"]["total"], "1200.00")
+        self.assertEqual(sheet["sections"]["liability"]["total"], "500.00")
+        self.assertEqual(sheet["net_income"], "700.00")
+
+        sheet = self.client.get("/api/reports/balance-sheet/?as_of=2025-01-31").data
+        self.assertEqual(sheet["as_of"], "2025-01-31")
+        self.assertEqual(sheet["sections"]["asset"]["total"], "1000.00")
+        self.assertEqual(sheet["sections"]["liability"]["total"], "0.00")
+        self.assertTrue(sheet["balanced"])
+
+    def test_post_journal_batch(self):
+        other = Family.objects.create(name="Other", owner=self.user)
+        foreign = Account.objects.create(
+            family=other, name="Foreign", type=Account.Type.ASSET
+        )
+        food = Category.objects.create(family=self.family, name="Food")
+
+        def lines(count):
+            return [
+                {
+                    "description": f"line {i}",
+                    "amount": "2.50",
+                    "debit_account": self.debit.id,
+                    "credit_account": self.credit.id,
+                    "category": food.id,
+                }
+                for i in range(count)
+            ]
+
+        def post(payload):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.post("/api/journals/batch/", payload, format="json")
+            return resp, len(ctx.captured_queries)
+
+        resp, few = post({"date": "2025-05-01", "memo": "split", "lines": lines(2)})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(resp.data["transactions"]), 2)
+        resp, many = post({"date": "2025-05-02", "lines": lines(40)})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(many, few)
+        self.assertEqual(resp.data["transactions"][0]["date"], "2025-05-02")
+        self.debit.refresh_from_db()
+        self.assertEqual(self.debit.balance, Decimal("105.00"))
+
+        bad = lines(3)
+        bad[2]["amount"] = "0"
+        resp, _ = post({"date": "2025-05-03", "lines": bad})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("amount", resp.data["lines"][2])
+        bad = lines(3)
+        bad[1]["credit_account"] = foreign.id
+        resp, _ = post({"date": "2025-05-03", "lines": bad})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data["lines"][0], {})
+        self.assertIn("credit_account", resp.data["lines"][1])
+        # A falsy id is still an id: 0 is no category of this family.
+        bad = lines(1)
+        bad[0]["category"] = 0
+        resp, _ = post({"date": "2025-05-03", "lines": bad})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("category", resp.data["lines"][0])
+        self.assertEqual(Journal.objects.filter(family=self.family).count(), 2)
+        self.assertEqual(Transaction.objects.filter(family=self.family).count(), 42)
+
+    def test_budget_api_and_status(self):
+        food = Account.objects.create(
+            family=self.family, name="Food", type=Account.Type.EXPENSE
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description="Lunch",
+            amount="12.00",
+            debit_account=food,
+            credit_account=self.debit,
+        )
+        resp = self.client.post(
+            "/api/budgets/", {"name": "Food", "account": food.id, "amount": "50.00"}
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["spent"], "12.00")
+        self.assertEqual(resp.data["remaining"], "38.00")
+        resp = self.client.post(
+            "/api/budgets/",
+            {"name": "Cash", "account": self.debit.id, "amount": "50.00"},
+        )
+        self.assertEqual(resp.status_code, 400)
+
+        for i in range(5):
+            Budget.objects.create(
+                family=self.family,
+                name=f"Extra {i}",
+                account=food,
+                amount="1.00",
+                period_start=timezone.localdate().replace(day=1),
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/budgets/status/")
+        self.assertEqual(len(resp.data), 6)
+        self.assertEqual(resp.data[0]["spent"], "12.00")
+        self.assertLessEqual(len(ctx.captured_queries), 3)
+
+    def test_forecast_endpoint(self):
+        savings = Account.objects.create(
+            family=self.family,
+            name="Savings",
+            type=Account.Type.ASSET,
+            interest_rate=Decimal("0.01"),
+        )
+        month = timezone.localdate().replace(day=1)
+        for _ in range(3):
+            month = (month - timedelta(days=1)).replace(day=1)
+            Transaction.objects.create(
+                family=self.family,
+                description="Salary",
+                amount="100.00",
+                debit_account=savings,
+                credit_account=self.credit,
+                date=month,
+            )
+        Transaction.objects.create(
+            family=self.family,
+            description="Bonus",
+            amount="1000.00",
+            debit_account=self.debit,
+            credit_account=self.credit,
+            date=month,
+        )
+        resp = self.client.get("/api/reports/forecast/?months=2")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["months"]), 2)
+        rows = {row["name"]: row for row in resp.data["accounts"]}
+        self.assertEqual(rows["Savings"]["monthly_flow"], "100.00")
+        # 300 + 3.00 interest + 100, then 403 + 4.03 interest + 100.
+        self.assertEqual(rows["Savings"]["balances"], ["403.00", "507.03"])
+        self.assertEqual(rows["Cash"]["balances"], ["1000.00", "1000.00"])
+        self.assertEqual(rows["Income"]["balances"], ["-1400.00", "-1500.00"])
+        self.assertEqual(
+            self.client.get("/api/reports/forecast/?months=0").status_code, 400
+        )
+
     def test_import_and_export_csv(self):
         csv_content = (
             "description,amount,debit_account,credit_account\n"
@@ -123,6 +1217,132 @@ class AccountingAPITests(TestCase):
         content = b"".join(resp.streaming_content).decode()
         self.assertIn("Pay", content)
 
+    def test_import_csv_reports_row_errors(self):
+        other = Family.objects.create(name="Other", owner=self.user)
+        foreign = Account.objects.create(
+            family=other, name="Foreign", type=Account.Type.ASSET
+        )
+        category = Category.objects.create(family=self.family, name="Food")
+        csv_content = (
+            "description,amount,debit_account,credit_account,category,date\n"
+            f'"Pizza, large",12.50,{self.debit.id},{self.credit.id},{category.id},'
+            "2025-01-05\n"
+            f"Leak,5.00,{foreign.id},{self.credit.id},,\n"
+            f"Rent,7.50,{self.debit.id},{self.credit.id},,\n"
+            f"Bad,-1,{self.debit.id},{self.debit.id},,\n"
+        )
+        file = SimpleUploadedFile(
+            "tx.csv", csv_content.encode(), content_type="text/csv"
+        )
+        response = self.client.post("/api/transactions/import_csv/", {"file": file})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual([e["row"] for e in response.data["errors"]], [2, 4])
+        self.assertIn("does not belong", response.data["errors"][0]["errors"][0])
+        self.assertEqual(len(response.data["errors"][1]["errors"]), 2)
+        tx = Transaction.objects.get(description="Pizza, large")
+        self.assertEqual(tx.category, category)
+        self.assertEqual(tx.date, date(2025, 1, 5))
+        self.debit.refresh_from_db()
+        self.assertEqual(self.debit.balance, Decimal("20.00"))
+
+    def test_category_suggestions_and_import_autofill(self):
+        suggestions.clear()
+        groceries = Category.objects.create(family=self.family, name="Groceries")
+        fuel = Category.objects.create(family=self.family, name="Fuel")
+        for description, category in [
+            ("Woolworths Metro 123", groceries),
+            ("WOOLWORTHS supermarket", groceries),
+            ("Shell petrol station", fuel),
+            ("Woolworths petrol", fuel),
+        ]:
+            Transaction.objects.create(
+                family=self.family,
+                description=description,
+                amount="10.00",
+                debit_account=self.debit,
+                credit_account=self.credit,
+                category=category,
+            )
+
+        resp = self.client.get("/api/categories/suggest/?description=woolworths 99")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([row["name"] for row in resp.data], ["Groceries", "Fuel"])
+        self.assertGreater(resp.data[0]["score"], 0.5)
+        # Partial words match indexed tokens by prefix.
+        resp = self.client.get("/api/categories/suggest/?description=petr")
+        self.assertEqual(resp.data[0]["name"], "Fuel")
+        with CaptureQueriesContext(connection) as ctx:
+            suggestions.get(self.family.pk).suggest("shell")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        csv_content = (
+            "description,amount,debit_account,credit_account,category\n"
+            f"Woolworths Metro,5.00,{self.debit.id},{self.credit.id},\n"
+            f"Shell,5.00,{self.debit.id},{self.credit.id},{groceries.id}\n"
+            f"Unknown shop,5.00,{self.debit.id},{self.credit.id},\n"
+        )
+        file = SimpleUploadedFile("tx.csv", csv_content.encode())
+        resp = self.client.post(
+            "/api/transactions/import_csv/", {"file": file, "auto_categorize": "1"}
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["categorized"], 1)
+        imported = dict(
+            Transaction.objects.filter(amount="5.00").values_list(
+                "description", "category_id"
+            )
+        )
+        self.assertEqual(
+            imported,
+            {
+                "Woolworths Metro": groceries.id,
+                "Shell": groceries.id,
+                "Unknown shop": None,
+            },
+        )
+
+    def test_export_formats_and_filters(self):
+        other = Account.objects.create(
+            family=self.family, name="Bank", type=Account.Type.ASSET
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description='Pizza, "large"',
+            amount="12.50",
+            debit_account=self.debit,
+            credit_account=self.credit,
+            date="2025-01-05",
+        )
+        Transaction.objects.create(
+            family=self.family,
+            description="Transfer",
+            amount="3.00",
+            debit_account=other,
+            credit_account=self.credit,
+            date="2025-02-05",
+        )
+        resp = self.client.get("/api/transactions/export/")
+        rows = list(csv.reader(b"".join(resp.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:3], ["id", "description", "amount"])
+        self.assertEqual(rows[1][1], 'Pizza, "large"')
+        self.assertEqual(len(rows), 3)
+
+        resp = self.client.get(
+            "/api/transactions/export/",
+            {"output": "ndjson", "gzip": "1", "account": str(other.id)},
+        )
+        self.assertEqual(resp["Content-Type"], "application/gzip")
+        lines = gzip.decompress(b"".join(resp.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["description"], "Transfer")
+
+        resp = self.client.get("/api/transactions/export/", {"end": "2025-01-31"})
+        self.assertNotIn("Transfer", b"".join(resp.streaming_content).decode())
+        resp = self.client.get("/api/transactions/export/", {"output": "xml"})
+        self.assertEqual(resp.status_code, 400)
+
     def test_filter_transactions_by_category(self):
         cat1 = Category.objects.create(family=self.family, name="Food")
         cat2 = Category.objects.create(family=self.family, name="Fun")
@@ -144,5 +1364,212 @@ class AccountingAPITests(TestCase):
         )
         resp = self.client.get(f"/api/transactions/?category={cat1.id}")
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["category"], cat1.id)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["category"], cat1.id)
+
+
+@override_settings(MEDIA_ROOT=mkdtemp(), TRANSACTION_IMPORT_CHUNK_SIZE=2)
+class TransactionSearchTests(TransactionTestCase):
+    """Search reads full-text indexes, which only see committed rows.
+
+    InnoDB's FULLTEXT index ignores rows of an open transaction, so these
+    tests commit their data instead of running inside ``TestCase``'s
+    rollback.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user("parent@example.com", "pass")
+        self.family = Family.objects.create(name="Jones", owner=self.user)
+        Membership.objects.create(
+            user=self.user, family=self.family, role=Membership.Role.PARENT
+        )
+        self.client.force_authenticate(user=self.user)
+        self.debit = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        self.credit = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+
+    def test_search_transactions(self):
+        other = Family.objects.create(name="Other", owner=self.user)
+        other_cash = Account.objects.create(
+            family=other, name="Cash", type=Account.Type.ASSET
+        )
+        other_income = Account.objects.create(
+            family=other, name="Income", type=Account.Type.INCOME
+        )
+        holiday = Journal.objects.create(
+            family=self.family, date="2025-01-01", memo="Summer holiday"
+        )
+
+        def tx(description, journal=None, family=None):
+            family = family or self.family
+            return Transaction(
+                family=family,
+                description=description,
+                amount="1.00",
+                debit_account=self.debit if family == self.family else other_cash,
+                credit_account=(self.credit if family == self.family else other_income),
+                journal=journal,
+            )
+
+        Transaction.objects.bulk_create(
+            [
+                tx("Pizza pizza pizza"),
+                tx("Pizza and pasta"),
+                tx("Groceries"),
+                tx("Hotel", journal=holiday),
+                tx("Pizza", family=other),
+            ]
+        )
+        groceries = Transaction.objects.get(description="Groceries")
+
+        def search(q, **params):
+            resp = self.client.get("/api/transactions/search/", {"q": q, **params})
+            self.assertEqual(resp.status_code, 200)
+            return resp.data
+
+        self.assertEqual(
+            [row["description"] for row in search("PIZZA")["results"]],
+            ["Pizza pizza pizza", "Pizza and pasta"],
+        )
+        self.assertEqual(len(search("piz pas")["results"]), 1)
+        self.assertEqual(search("holiday")["results"][0]["description"], "Hotel")
+        # Words may match different fields, on every backend.
+        self.assertEqual(len(search("hotel summer")["results"]), 1)
+        page = search("pizza", page_size=1)
+        self.assertEqual(len(page["results"]), 1)
+        rest = self.client.get(page["next"]).data
+        self.assertEqual(rest["results"][0]["description"], "Pizza and pasta")
+        self.assertIsNone(rest["next"])
+
+        # The index follows updates, memo edits and deletes.
+        groceries.description = "Weekly shop"
+        groceries.save()
+        self.assertEqual(search("groceries")["results"], [])
+        self.assertEqual(len(search("weekly")["results"]), 1)
+        holiday.memo = "Winter trip"
+        holiday.save()
+        self.assertEqual(search("holiday")["results"], [])
+        self.assertEqual(len(search("winter")["results"]), 1)
+        Transaction.objects.filter(description__startswith="Pizza").delete()
+        self.assertEqual(search("pizza")["results"], [])
+        self.assertEqual(search("")["results"], [])
+
+
+class ImportJobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user("parent@example.com", "pass")
+        self.family = Family.objects.create(name="Jones", owner=self.user)
+        Membership.objects.create(
+            user=self.user, family=self.family, role=Membership.Role.PARENT
+        )
+        self.client.force_authenticate(user=self.user)
+        self.debit = Account.objects.create(
+            family=self.family, name="Cash", type=Account.Type.ASSET
+        )
+        self.credit = Account.objects.create(
+            family=self.family, name="Income", type=Account.Type.INCOME
+        )
+        rows = [f"Row {i},1.00,{self.debit.id},{self.credit.id}" for i in range(5)]
+        rows[3] = f"Broken,abc,{self.debit.id},{self.credit.id}"
+        self.csv = (
+            "description,amount,debit_account,credit_account\n" + "\n".join(rows) + "\n"
+        ).encode()
+
+    @patch("apps.accounting.views.run_import_job.delay")
+    def test_create_job_and_report_progress(self, mock_delay):
+        file = SimpleUploadedFile("tx.csv", self.csv, content_type="text/csv")
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post("/api/import-jobs/", {"file": file})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["status"], ImportJob.Status.PENDING)
+        mock_delay.assert_called_once_with(resp.data["id"])
+
+        run_import_job(resp.data["id"])
+        resp = self.client.get(f"/api/import-jobs/{resp.data['id']}/")
+        self.assertEqual(resp.data["status"], ImportJob.Status.COMPLETED)
+        self.assertEqual(resp.data["rows_processed"], 5)
+        self.assertEqual(resp.data["rows_created"], 4)
+        self.assertEqual(resp.data["rows_failed"], 1)
+        self.assertEqual(resp.data["errors"][0]["row"], 4)
+        self.assertIn("throughput", resp.data)
+
+    @patch("apps.accounting.views.run_import_job.delay")
+    @override_settings(TRANSACTION_IMPORT_SYNC_MAX_BYTES=10)
+    def test_large_import_csv_is_queued(self, mock_delay):
+        file = SimpleUploadedFile("tx.csv", self.csv, content_type="text/csv")
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post("/api/transactions/import_csv/", {"file": file})
+        self.assertEqual(resp.status_code, 202)
+        mock_delay.assert_called_once_with(resp.data["id"])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_resume_after_last_committed_chunk(self):
+        job = ImportJob.objects.create(
+            family=self.family,
+            user=self.user,
+            file=SimpleUploadedFile("tx.csv", self.csv),
+            status=ImportJob.Status.RUNNING,
+            rows_processed=2,
+            rows_created=2,
+        )
+        run_import_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.COMPLETED)
+        self.assertEqual(job.rows_processed, 5)
+        self.assertEqual(job.rows_created, 4)
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("description", flat=True)),
+            ["Row 2", "Row 4"],
+        )
+
+    def test_held_job_is_not_imported_twice(self):
+        job = ImportJob.objects.create(
+            family=self.family,
+            user=self.user,
+            file=SimpleUploadedFile("tx.csv", self.csv),
+            status=ImportJob.Status.RUNNING,
+            worker="first",
+            heartbeat_at=timezone.now(),
+        )
+        # A redelivery while the first worker's lease is live waits.
+        with self.assertRaises(Retry):
+            run_import_job(job.id)
+        self.assertFalse(Transaction.objects.exists())
+
+        # Once the lease lapses the job is taken over.
+        ImportJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        run_import_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.COMPLETED)
+        self.assertEqual(Transaction.objects.count(), 4)
+
+    @override_settings(TRANSACTION_IMPORT_CHUNK_SIZE=2)
+    def test_superseded_worker_stops_before_its_next_chunk(self):
+        job = ImportJob.objects.create(
+            family=self.family,
+            user=self.user,
+            file=SimpleUploadedFile("tx.csv", self.csv),
+        )
+
+        def rows(handle):
+            for number, row in enumerate(read_csv_rows(handle)):
+                if number == 2:
+                    # Another worker takes the job over mid-run.
+                    ImportJob.objects.filter(pk=job.pk).update(worker="second")
+                yield row
+
+        with patch("apps.accounting.tasks.read_csv_rows", rows):
+            self.assertEqual(run_import_job(job.id), "superseded")
+        job.refresh_from_db()
+        self.assertEqual((job.worker, job.rows_processed), ("second", 2))
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("description", flat=True)),
+            ["Row 0", "Row 1"],
+        )
@@ -1,25 +1,72 @@
-import csv
-
 from apps.families.mixins import FamilyQuerySetMixin
+from django.conf import settings
+from django.db import transaction as db_tx
+from django.db.models import Q
 from django.http import StreamingHttpResponse
-from rest_framework import permissions, status, viewsets
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from .models import Account, Category, Journal, Transaction
+from .exporter import csv_chunks, gzip_chunks, iter_rows, ndjson_chunks
+from .forecast import forecast
+from .importer import TransactionImporter, read_csv_rows
+from .models import Account, Budget, Category, ImportJob, Journal, Transaction
+from .search import SearchUnavailable, search_transactions
 from .serializers import (
     AccountSerializer,
+    BalanceSheetSerializer,
+    BudgetSerializer,
     CategorySerializer,
+    CategorySuggestionSerializer,
+    ImportJobSerializer,
+    JournalPostSerializer,
     JournalSerializer,
     TransactionSerializer,
+    TrialBalanceSerializer,
+)
+from .services import (
+    balance_sheet,
+    budget_period_start,
+    category_report,
+    recompute_budgets,
+    trial_balance,
 )
+from .suggestions import suggestions
+from .tasks import run_import_job
+
+REPORT_PERIODS = ("month", "year")
+MAX_FORECAST_MONTHS = 600
+EXPORT_FORMATS = {
+    "csv": (csv_chunks, "text/csv", "csv"),
+    "ndjson": (ndjson_chunks, "application/x-ndjson", "ndjson"),
+}
+
+
+def _parse_date_param(params, name):
+    try:
+        value = parse_date(params[name])
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Expected a YYYY-MM-DD date."})
+    return value
 
 
 class AccountViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
-    queryset = Account.objects.all().order_by("id")
+    queryset = Account.objects.prefetch_related("assets").order_by("id")
     serializer_class = AccountSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        params = self.request.query_params if self.request else {}
+        if params.get("as_of"):
+            context["as_of"] = _parse_date_param(params, "as_of")
+        return context
+
     def perform_create(self, serializer):
         serializer.save(family=self.request.user.membership_set.first().family)
 
@@ -32,6 +79,26 @@ class CategoryViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(family=self.request.user.membership_set.first().family)
 
+    @action(detail=False, methods=["get"])
+    def suggest(self, request):
+        """Suggest categories for the ``description`` query param."""
+        family = self.get_family()
+        description = request.query_params.get("description", "")
+        if family is None or not description.strip():
+            return Response([])
+        ranked = suggestions.get(family.pk).suggest(description)
+        names = dict(
+            self.get_queryset()
+            .filter(pk__in=[pk for pk, _ in ranked])
+            .values_list("id", "name")
+        )
+        data = [
+            {"id": pk, "name": names[pk], "score": score}
+            for pk, score in ranked
+            if pk in names
+        ]
+        return Response(CategorySuggestionSerializer(data, many=True).data)
+
 
 class JournalViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     queryset = Journal.objects.all().order_by("-date")
@@ -41,6 +108,20 @@ class JournalViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(family=self.request.user.membership_set.first().family)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Create a journal with all of its transaction lines at once."""
+        serializer = JournalPostSerializer(
+            data=request.data, context={"family": self.get_family()}
+        )
+        serializer.is_valid(raise_exception=True)
+        journal = serializer.save()
+        data = JournalSerializer(journal).data
+        data["transactions"] = TransactionSerializer(
+            journal.transaction_set.order_by("id"), many=True
+        ).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
 
 class TransactionViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all().order_by("id")
@@ -57,6 +138,21 @@ class TransactionViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(family=self.request.user.membership_set.first().family)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranked full-text search; ``q`` matches descriptions and memos."""
+        family = self.get_family()
+        try:
+            queryset = search_transactions(
+                self.get_queryset().order_by(),
+                request.query_params.get("q", ""),
+                family.pk if family else None,
+            )
+        except SearchUnavailable:
+            raise ValidationError({"q": "Search is not available on this database."})
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
     @action(detail=False, methods=["post"])
     def import_csv(self, request):
         family = request.user.membership_set.first().family
@@ -65,51 +161,196 @@ class TransactionViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
             return Response(
                 {"detail": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
             )
-        decoded = uploaded.read().decode("utf-8").splitlines()
-        reader = csv.DictReader(decoded)
-        created = 0
-        for row in reader:
-            Transaction.objects.create(
+        auto_categorize = request.data.get("auto_categorize") in ("1", "true")
+        if uploaded.size > settings.TRANSACTION_IMPORT_SYNC_MAX_BYTES:
+            job = ImportJob.objects.create(
                 family=family,
-                description=row["description"],
-                amount=row["amount"],
-                debit_account_id=row["debit_account"],
-                credit_account_id=row["credit_account"],
-                category_id=row.get("category") or None,
-                journal_id=row.get("journal") or None,
+                user=request.user,
+                file=uploaded,
+                auto_categorize=auto_categorize,
             )
-            created += 1
-        return Response({"created": created}, status=status.HTTP_201_CREATED)
+            db_tx.on_commit(lambda: run_import_job.delay(job.id))
+            return Response(
+                ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+            )
+        importer = TransactionImporter(family, auto_categorize=auto_categorize)
+        result = importer.run(read_csv_rows(uploaded))
+        return Response(result, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=["get"])
-    def export_csv(self, request):
+    def export(self, request):
+        """Stream the family's ledger as CSV or NDJSON, optionally gzipped.
+
+        Query params: ``output`` (``csv`` or ``ndjson``), ``gzip=1``,
+        ``start``/``end`` dates and ``account`` (comma separated ids).
+        """
         family = request.user.membership_set.first().family
         queryset = Transaction.objects.filter(family=family).order_by("id")
+        params = request.query_params
+        for param, lookup in (("start", "date__gte"), ("end", "date__lte")):
+            if params.get(param):
+                queryset = queryset.filter(**{lookup: _parse_date_param(params, param)})
+        if params.get("account"):
+            try:
+                accounts = [int(pk) for pk in params["account"].split(",")]
+            except ValueError:
+                raise ValidationError({"account": "Expected comma separated ids."})
+            queryset = queryset.filter(
+                Q(debit_account_id__in=accounts) | Q(credit_account_id__in=accounts)
+            )
+
+        output = params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Choose one of {list(EXPORT_FORMATS)}."})
+        render, content_type, extension = EXPORT_FORMATS[output]
+        chunks = render(iter_rows(queryset))
+        filename = f"transactions.{extension}"
+        if params.get("gzip") in ("1", "true"):
+            chunks = gzip_chunks(chunks)
+            content_type = "application/gzip"
+            filename += ".gz"
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
 
-        headers = [
-            "id",
-            "description",
-            "amount",
-            "debit_account",
-            "credit_account",
-            "category",
-            "journal",
+    @action(detail=False, methods=["get"])
+    def export_csv(self, request):
+        return self.export(request)
+
+
+class BudgetViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
+    """Budgets with spend counters maintained as transactions post."""
+
+    queryset = Budget.objects.all().order_by("id")
+    serializer_class = BudgetSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["family"] = self.get_family()
+        return context
+
+    def perform_create(self, serializer):
+        period = serializer.validated_data.get("period", Budget.Period.MONTH)
+        budget = serializer.save(
+            family=self.get_family(),
+            period_start=budget_period_start(period, timezone.localdate()),
+        )
+        recompute_budgets([budget])
+
+    def perform_update(self, serializer):
+        recompute_budgets([serializer.save()])
+
+    @action(detail=False, methods=["get"])
+    def status(self, request):
+        """Every budget's spend for the current period, read from counters."""
+        budgets = list(self.get_queryset())
+        today = timezone.localdate()
+        recompute_budgets(
+            [
+                b
+                for b in budgets
+                if b.period_start != budget_period_start(b.period, today)
+            ],
+            today=today,
+        )
+        return Response(BudgetSerializer(budgets, many=True).data)
+
+
+class ImportJobViewSet(
+    FamilyQuerySetMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Queue background CSV imports and report their progress."""
+
+    queryset = ImportJob.objects.all().order_by("-created_at")
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        job = serializer.save(
+            family=self.request.user.membership_set.first().family,
+            user=self.request.user,
+        )
+        db_tx.on_commit(lambda: run_import_job.delay(job.id))
+
+
+class ReportViewSet(FamilyQuerySetMixin, viewsets.ViewSet):
+    """Category report, trial balance, balance sheet and forecast."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        """Return a category x period matrix.
+
+        Query params: ``start``/``end`` dates (default: this year to date)
+        and ``period`` (``month`` or ``year``).
+        """
+        family = self.get_family()
+        if family is None:
+            return Response({"periods": [], "categories": []})
+        params = request.query_params
+        today = timezone.localdate()
+        start = (
+            _parse_date_param(params, "start")
+            if params.get("start")
+            else today.replace(month=1, day=1)
+        )
+        end = _parse_date_param(params, "end") if params.get("end") else today
+        if start > end:
+            raise ValidationError({"end": "Must not be before start."})
+        period = params.get("period", "month")
+        if period not in REPORT_PERIODS:
+            raise ValidationError({"period": f"Choose one of {list(REPORT_PERIODS)}."})
+
+        report = category_report(family.pk, start, end, period)
+        names = dict(
+            Category.objects.filter(
+                family=family, pk__in=[pk for pk in report["categories"] if pk]
+            ).values_list("id", "name")
+        )
+        categories = [
+            {"id": pk, "name": names.get(pk, "Uncategorised"), **row}
+            for pk, row in sorted(
+                report["categories"].items(),
+                key=lambda item: (item[0] is None, names.get(item[0], "")),
+            )
         ]
+        return Response({"periods": report["periods"], "categories": categories})
 
-        def generate():
-            yield ",".join(headers) + "\n"
-            for tx in queryset:
-                row = [
-                    str(tx.id),
-                    tx.description,
-                    str(tx.amount),
-                    str(tx.debit_account_id),
-                    str(tx.credit_account_id),
-                    str(tx.category_id or ""),
-                    str(tx.journal_id or ""),
-                ]
-                yield ",".join(row) + "\n"
-
-        response = StreamingHttpResponse(generate(), content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=transactions.csv"
-        return response
+    @action(detail=False, methods=["get"])
+    def forecast(self, request):
+        """Project account balances ``months`` ahead (default 12)."""
+        family = self.get_family()
+        try:
+            months = int(request.query_params.get("months", 12))
+        except ValueError:
+            months = 0
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            raise ValidationError(
+                {"months": f"Expected 1 to {MAX_FORECAST_MONTHS} months."}
+            )
+        if family is None:
+            return Response({"months": [], "accounts": []})
+        return Response(forecast(family.pk, months))
+
+    def _as_of_report(self, request, build, serializer_class):
+        family = self.get_family()
+        as_of = None
+        if request.query_params.get("as_of"):
+            as_of = _parse_date_param(request.query_params, "as_of")
+        report = {"as_of": as_of, **build(family and family.pk, as_of)}
+        return Response(serializer_class(report).data)
+
+    @action(detail=False, methods=["get"], url_path="trial-balance")
+    def trial_balance(self, request):
+        """Account balances in debit/credit columns (optional ``as_of``)."""
+        return self._as_of_report(request, trial_balance, TrialBalanceSerializer)
+
+    @action(detail=False, methods=["get"], url_path="balance-sheet")
+    def balance_sheet(self, request):
+        """Account balances grouped by type (optional ``as_of``)."""
+        return self._as_of_report(request, balance_sheet, BalanceSheetSerializer)
@@ -0,0 +1,219 @@
+"""Pooled, rate-limited HTTP client shared by the price providers."""
+
+import math
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+# Responses worth retrying: throttling and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Longest one ``get_json`` call spends on its attempts and backoff sleeps.
+RETRY_BUDGET_SECONDS = 30.0
+
+
+class ProviderError(Exception):
+    """A provider request failed, after any retries it was allowed."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is free; return the wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the caller's place in the queue.
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class SharedRateLimit:
+    """Request quota counted in the Django cache, so every process shares it.
+
+    Time is cut into windows of ``capacity / rate`` seconds, each allowing
+    ``capacity`` requests: the same average rate and burst as a
+    ``TokenBucket``, but summed over all web and Celery workers. Each
+    request is one atomic ``incr`` (INCR on Redis) of the current window's
+    counter; a caller over the limit sleeps until the next window.
+    """
+
+    def __init__(self, key: str, rate: float, capacity: float = 1):
+        self.key = key
+        self.capacity = max(1, int(capacity))
+        self.window = self.capacity / rate
+
+    def acquire(self) -> float:
+        """Take one request from the quota, sleeping until one is free."""
+        waited = 0.0
+        while True:
+            now = time.time()
+            window = int(now // self.window)
+            key = f"{self.key}:{window}"
+            cache.add(key, 0, math.ceil(self.window) + 1)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                # Expired between ``add`` and ``incr``; start the window again.
+                continue
+            if count <= self.capacity:
+                return waited
+            pause = (window + 1) * self.window - now
+            time.sleep(pause)
+            waited += pause
+
+
+class ProviderClient:
+    """Keep-alive session with a rate limit and backoff for one provider.
+
+    Requests share one connection pool, take a slot from the provider's
+    quota (a ``SharedRateLimit``, counted across processes), and retry
+    429 and 5xx responses (and connection errors) with exponential
+    backoff, honouring ``Retry-After``. Retries stop once they would run
+    past ``retry_budget`` seconds. ``stats`` reports the counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        requests_per_minute: float,
+        burst: int = 1,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        timeout: float = 10.0,
+        retry_budget: float = RETRY_BUDGET_SECONDS,
+        pool_size: int = 10,
+    ):
+        self.name = name
+        self.bucket = SharedRateLimit(
+            f"provider-quota:{name}", requests_per_minute / 60, burst
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retry_budget = retry_budget
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._counts: Counter = Counter()
+        self._latency_max = 0.0
+        self._lock = threading.Lock()
+
+    def _count(self, **amounts: float) -> None:
+        with self._lock:
+            self._counts.update(amounts)
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response is not None and response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2**attempt, self.max_backoff)
+
+    def _send(self, url: str, params: Optional[Mapping], timeout: float):
+        waited = self.bucket.acquire()
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+        except requests.RequestException as exc:
+            response, error = None, exc
+        else:
+            error = None
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._counts.update(
+                requests=1,
+                rate_limited=bool(waited),
+                wait_seconds=waited,
+                latency_seconds=elapsed,
+                throttled=response is not None and response.status_code == 429,
+            )
+            self._latency_max = max(self._latency_max, elapsed)
+        return response, error
+
+    def get_json(self, url: str, params: Optional[Mapping] = None) -> Any:
+        """GET ``url`` and decode the JSON body, raising ``ProviderError``.
+
+        A retry is only sent if its backoff and a timeout trimmed to what
+        is left fit in ``retry_budget``, so callers holding a lock for
+        the call can size it from the budget.
+        """
+        started = time.monotonic()
+        timeout = self.timeout
+        for attempt in range(self.max_retries + 1):
+            response, error = self._send(url, params, timeout)
+            if error is None and response.status_code not in RETRY_STATUSES:
+                break
+            if attempt == self.max_retries:
+                break
+            delay = self._delay(attempt, response)
+            left = self.retry_budget - (time.monotonic() - started) - delay
+            if left <= 0:
+                break
+            timeout = min(self.timeout, left)
+            self._count(retries=1)
+            time.sleep(delay)
+        try:
+            if error is not None:
+                raise error
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            self._count(failures=1)
+            raise ProviderError(f"{self.name}: {exc}") from exc
+        self._count(successes=1)
+        return data
+
+    def stats(self) -> Dict[str, float]:
+        """Request counters, latency and connection pool reuse.
+
+        ``pool_hit_rate`` is the share of requests sent over a connection
+        that was already open.
+        """
+        connections = sent = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            sent += pool.num_requests
+        with self._lock:
+            counts = dict(self._counts)
+            latency_max = self._latency_max
+        attempts = counts.get("requests", 0)
+        return {
+            "requests": attempts,
+            "successes": counts.get("successes", 0),
+            "failures": counts.get("failures", 0),
+            "retries": counts.get("retries", 0),
+            "throttled": counts.get("throttled", 0),
+            "rate_limited": counts.get("rate_limited", 0),
+            "rate_limit_wait_seconds": round(counts.get("wait_seconds", 0.0), 3),
+            "latency_avg_ms": round(
+                counts.get("latency_seconds", 0.0) / attempts * 1000 if attempts else 0,
+                2,
+            ),
+            "latency_max_ms": round(latency_max * 1000, 2),
+            "connections_opened": connections,
+            "pool_hit_rate": round(1 - connections / sent, 3) if sent else 0.0,
+        }
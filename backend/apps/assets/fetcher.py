@@ -0,0 +1,76 @@
+"""Concurrent price fetching across providers with asyncio."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, List, Mapping, NamedTuple, Sequence
+
+FetchBatch = Callable[[List[str]], Mapping[str, Decimal]]
+
+
+class ProviderJob(NamedTuple):
+    """The symbol batches one provider should price in one refresh."""
+
+    name: str
+    fetch_batch: FetchBatch
+    batches: Sequence[List[str]]
+    concurrency: int
+    timeout: float
+
+
+class FetchResult(NamedTuple):
+    prices: Dict[str, Dict[str, Decimal]]  # provider name -> symbol -> price
+    failed: Dict[str, int]  # provider name -> batches that raised
+    timed_out: Dict[str, int]  # provider name -> batches still running
+
+
+async def _run_job(job: ProviderJob, loop, executor, result: FetchResult) -> None:
+    semaphore = asyncio.Semaphore(job.concurrency)
+
+    async def run(batch):
+        async with semaphore:
+            return await loop.run_in_executor(executor, job.fetch_batch, batch)
+
+    tasks = [asyncio.ensure_future(run(batch)) for batch in job.batches]
+    done, pending = await asyncio.wait(tasks, timeout=job.timeout)
+    for task in pending:
+        task.cancel()
+    prices = result.prices.setdefault(job.name, {})
+    for task in done:
+        if task.exception() is not None:
+            result.failed[job.name] = result.failed.get(job.name, 0) + 1
+        else:
+            prices.update(task.result())
+    if pending:
+        result.timed_out[job.name] = len(pending)
+
+
+async def _run_jobs(jobs: Sequence[ProviderJob], executor) -> FetchResult:
+    result = FetchResult({}, {}, {})
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(_run_job(job, loop, executor, result) for job in jobs))
+    return result
+
+
+def fetch_concurrently(jobs: Sequence[ProviderJob]) -> FetchResult:
+    """Run every provider's batches at once and collect what came back.
+
+    Each provider gets its own semaphore of ``concurrency`` batches in
+    flight and its own ``timeout``: batches still running when it expires
+    are abandoned and counted in ``timed_out`` without holding up the
+    other providers. Wall time therefore follows the slowest provider's
+    batches rather than the number of symbols.
+
+    The blocking provider clients run on a thread pool sized to the sum
+    of the providers' concurrency.
+    """
+    jobs = [job for job in jobs if job.batches]
+    if not jobs:
+        return FetchResult({}, {}, {})
+    workers = sum(min(job.concurrency, len(job.batches)) for job in jobs)
+    executor = ThreadPoolExecutor(workers, thread_name_prefix="price-fetch")
+    try:
+        return asyncio.run(_run_jobs(jobs, executor))
+    finally:
+        # Abandoned batches finish in the background; nothing waits on them.
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0003_exchangeorder_exchangetrade"),
+        ("families", "0002_alter_invitation_code"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="exchangeorder",
+            index=models.Index(
+                fields=["family", "asset", "side", "status", "price"],
+                name="assets_order_book_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exchangetrade",
+            index=models.Index(
+                fields=["family", "asset", "timestamp"],
+                name="assets_trade_family_asset_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="price",
+            index=models.Index(
+                fields=["family", "asset", "timestamp"],
+                name="assets_price_family_asset_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="price",
+            index=models.Index(
+                fields=["family", "timestamp"], name="assets_price_family_ts_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0004_tenant_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="provider",
+            field=models.CharField(
+                blank=True,
+                help_text="Preferred price provider; blank follows PRICE_PROVIDERS",
+                max_length=20,
+            ),
+        ),
+    ]
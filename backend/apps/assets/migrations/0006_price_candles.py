@@ -0,0 +1,91 @@
+# Generated by Django 5.2 on 2026-10-18 08:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0005_asset_provider"),
+        ("families", "0002_alter_invitation_code"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceCandle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("1h", "Hourly"), ("1d", "Daily")], max_length=2
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("open", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("high", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("low", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("close", models.DecimalField(decimal_places=4, max_digits=12)),
+                ("samples", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="price",
+            index=models.Index(fields=["timestamp"], name="assets_price_ts_idx"),
+        ),
+        migrations.AddField(
+            model_name="pricecandle",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="candles",
+                to="assets.asset",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pricecandle",
+            name="family",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(app_label)s_%(class)ss",
+                to="families.family",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pricecandle",
+            index=models.Index(
+                fields=["family", "asset", "resolution", "start"],
+                name="assets_candle_family_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pricecandle",
+            index=models.Index(
+                fields=["resolution", "start"], name="assets_candle_res_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pricecandle",
+            constraint=models.UniqueConstraint(
+                fields=("asset", "resolution", "start"),
+                name="assets_candle_bucket_uniq",
+            ),
+        ),
+    ]
@@ -6,6 +6,11 @@ from django.db import models
 class Asset(FamilyScopedModel):
     name = models.CharField(max_length=255)
     symbol = models.CharField(max_length=20)
+    provider = models.CharField(
+        max_length=20,
+        blank=True,
+        help_text="Preferred price provider; blank follows PRICE_PROVIDERS",
+    )
     current_price = models.DecimalField(
         max_digits=12, decimal_places=4, null=True, blank=True
     )
@@ -20,10 +25,58 @@ class Price(FamilyScopedModel):
     value = models.DecimalField(max_digits=12, decimal_places=4)
     timestamp = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "asset", "timestamp"],
+                name="assets_price_family_asset_idx",
+            ),
+            models.Index(
+                fields=["family", "timestamp"], name="assets_price_family_ts_idx"
+            ),
+            # Rollups and retention scan ticks by age across families.
+            models.Index(fields=["timestamp"], name="assets_price_ts_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return f"{self.asset} @ {self.timestamp}"  # type: ignore[str-format]
 
 
+class PriceCandle(FamilyScopedModel):
+    """Open/high/low/close rollup of an asset's prices over one bucket."""
+
+    HOUR = "1h"
+    DAY = "1d"
+    RESOLUTION_CHOICES = [(HOUR, "Hourly"), (DAY, "Daily")]
+
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, related_name="candles")
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    start = models.DateTimeField()
+    open = models.DecimalField(max_digits=12, decimal_places=4)
+    high = models.DecimalField(max_digits=12, decimal_places=4)
+    low = models.DecimalField(max_digits=12, decimal_places=4)
+    close = models.DecimalField(max_digits=12, decimal_places=4)
+    samples = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["asset", "resolution", "start"],
+                name="assets_candle_bucket_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["family", "asset", "resolution", "start"],
+                name="assets_candle_family_idx",
+            ),
+            models.Index(fields=["resolution", "start"], name="assets_candle_res_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - simple repr
+        return f"{self.asset} {self.resolution} @ {self.start}"
+
+
 class AssetTransactionLink(FamilyScopedModel):
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
     transaction = models.ForeignKey(Transaction, on_delete=models.CASCADE)
@@ -62,6 +115,14 @@ class ExchangeOrder(FamilyScopedModel):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "asset", "side", "status", "price"],
+                name="assets_order_book_idx",
+            ),
+        ]
+
     def __str__(self):  # pragma: no cover
         return f"{self.side} {self.asset.symbol} {self.quantity} @ {self.price} ({self.status})"
 
@@ -82,5 +143,13 @@ class ExchangeTrade(FamilyScopedModel):
     quantity = models.DecimalField(max_digits=12, decimal_places=4)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "asset", "timestamp"],
+                name="assets_trade_family_asset_idx",
+            ),
+        ]
+
     def __str__(self):  # pragma: no cover
         return f"Trade {self.quantity} {self.asset.symbol} @ {self.price}"
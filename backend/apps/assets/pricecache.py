@@ -0,0 +1,177 @@
+"""Shared price cache keyed by provider symbol, with single-flight fetches."""
+
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from django.core.cache import cache
+
+from .client import RETRY_BUDGET_SECONDS
+
+# How long a stale price may still be served while it is refetched.
+STALE_GRACE_SECONDS = 60 * 60
+# Shared entries outlive any useful freshness window; readers check age.
+ENTRY_SECONDS = 24 * 60 * 60
+# Upper bound on one upstream fetch: the provider client's retry budget,
+# plus time for the local fallback providers after it.
+FETCH_SECONDS = RETRY_BUDGET_SECONDS + 5
+# The cross-worker lock outlives any fetch, so no duplicate one can start.
+LOCK_SECONDS = int(FETCH_SECONDS * 2)
+# How long a miss waits for a fetch running in another worker.
+WAIT_SECONDS = 10
+POLL_SECONDS = 0.05
+
+Entry = Tuple[Decimal, float]  # (price, fetched at as a Unix timestamp)
+Fetch = Callable[[str], Optional[Decimal]]
+
+
+def _key(symbol: str) -> str:
+    return f"asset-price:{symbol}"
+
+
+def _lock_key(symbol: str) -> str:
+    return f"asset-price-lock:{symbol}"
+
+
+class PriceCache:
+    """Two-tier price cache: process memory in front of the Django cache.
+
+    Fresh entries are returned as they are. A stale entry still inside
+    the grace window is returned straight away while one background
+    thread refetches it. Misses are coalesced: threads of one process
+    queue on a per-symbol lock, and workers across processes take a lock
+    in the shared cache, so at most one upstream fetch per symbol is in
+    flight. Workers that lose the race wait for the winner's result.
+    """
+
+    def __init__(self):
+        self._local: Dict[str, Entry] = {}
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._revalidating: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    def _read(self, symbol: str, since: float) -> Optional[Entry]:
+        """Return the newest known entry, preferring a local one from ``since``."""
+        local = self._local.get(symbol)
+        if local is not None and local[1] >= since:
+            return local
+        shared = cache.get(_key(symbol))
+        if shared is None:
+            return local
+        entry = (Decimal(shared[0]), shared[1])
+        if local is None or entry[1] > local[1]:
+            self._local[symbol] = entry
+            return entry
+        return local
+
+    def store(
+        self, prices: Mapping[str, Decimal], fetched_at: Optional[float] = None
+    ) -> Dict[str, Entry]:
+        """Record freshly fetched prices in both tiers."""
+        fetched_at = fetched_at or time.time()
+        entries = {
+            symbol.lower(): (value, fetched_at) for symbol, value in prices.items()
+        }
+        self._local.update(entries)
+        cache.set_many(
+            {_key(symbol): (str(value), at) for symbol, (value, at) in entries.items()},
+            ENTRY_SECONDS,
+        )
+        return entries
+
+    def get(self, symbol: str, fetch: Fetch, *, max_age: float) -> Optional[Entry]:
+        """Return ``(price, fetched_at)`` for ``symbol``, fetching if needed.
+
+        ``None`` means there is no price at all: the fetch failed, or
+        another worker's fetch did not finish within ``WAIT_SECONDS``.
+        """
+        symbol = symbol.lower()
+        now = time.time()
+        entry = self._read(symbol, now - max_age)
+        if entry is not None and entry[1] >= now - max_age:
+            return entry
+        if entry is not None and entry[1] >= now - max_age - STALE_GRACE_SECONDS:
+            self._revalidate(symbol, fetch)
+            return entry
+        return self._load(symbol, fetch, now - max_age) or entry
+
+    def refresh(self, symbol: str, fetch: Fetch) -> Optional[Entry]:
+        """Fetch ``symbol`` now, or wait for a fetch already in flight."""
+        symbol = symbol.lower()
+        return self._load(symbol, fetch, time.time())
+
+    def _fetch(self, symbol: str, fetch: Fetch) -> Tuple[bool, Optional[Entry]]:
+        """Fetch under the cross-worker lock; ``(False, None)`` if it is held.
+
+        The lock holds a token of its own, and is only released while it
+        still holds it: a fetch that outlived ``LOCK_SECONDS`` must not
+        release the lock of the worker that took it over.
+        """
+        token = uuid.uuid4().hex
+        if not cache.add(_lock_key(symbol), token, LOCK_SECONDS):
+            return False, None
+        started = time.monotonic()
+        try:
+            value = fetch(symbol)
+            if value is None:
+                return True, None
+            return True, self.store({symbol: value})[symbol]
+        finally:
+            if (
+                time.monotonic() - started < LOCK_SECONDS
+                and cache.get(_lock_key(symbol)) == token
+            ):
+                cache.delete(_lock_key(symbol))
+
+    def _load(self, symbol: str, fetch: Fetch, since: float) -> Optional[Entry]:
+        with self._symbol_lock(symbol):
+            # Another thread of this process may have just fetched it.
+            entry = self._local.get(symbol)
+            if entry is not None and entry[1] >= since:
+                return entry
+            fetched, entry = self._fetch(symbol, fetch)
+            if fetched:
+                return entry
+            deadline = time.monotonic() + WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(POLL_SECONDS)
+                entry = self._read(symbol, since)
+                if entry is not None and entry[1] >= since:
+                    return entry
+            return None
+
+    def _revalidate(self, symbol: str, fetch: Fetch) -> None:
+        with self._lock:
+            running = self._revalidating.get(symbol)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._background_fetch, args=(symbol, fetch), daemon=True
+            )
+            self._revalidating[symbol] = thread
+        thread.start()
+
+    def _background_fetch(self, symbol: str, fetch: Fetch) -> None:
+        with self._symbol_lock(symbol):
+            self._fetch(symbol, fetch)
+
+    def wait(self) -> None:
+        """Block until background refetches started so far have finished."""
+        with self._lock:
+            threads = list(self._revalidating.values())
+        for thread in threads:
+            thread.join()
+
+    def clear(self) -> None:
+        """Forget the in-process entries (the shared tier is untouched)."""
+        with self._lock:
+            self._local.clear()
+
+
+price_cache = PriceCache()
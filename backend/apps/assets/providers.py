@@ -0,0 +1,202 @@
+"""Price providers and the registry that picks them per asset."""
+
+import csv
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .client import ProviderClient, ProviderError
+
+
+class PriceProvider:
+    """Source of current prices for batches of provider symbols.
+
+    ``fetch_batch`` takes up to ``batch_size`` lower-cased symbols and
+    returns the prices it knows, leaving unknown symbols out. It raises
+    ``ProviderError`` when the whole batch failed.
+    """
+
+    name = ""
+    batch_size = 250
+    concurrency = 1
+    timeout = 60.0
+
+    def fetch_batch(self, symbols: List[str]) -> Dict[str, Decimal]:
+        raise NotImplementedError
+
+
+class CoinGeckoProvider(PriceProvider):
+    name = "coingecko"
+    url = "https://api.coingecko.com/api/v3/simple/price"
+
+    def __init__(self):
+        self.client = ProviderClient(
+            self.name,
+            requests_per_minute=settings.COINGECKO_REQUESTS_PER_MINUTE,
+            burst=settings.COINGECKO_BURST,
+        )
+
+    @property
+    def concurrency(self) -> int:
+        return settings.COINGECKO_CONCURRENCY
+
+    @property
+    def timeout(self) -> float:
+        return settings.COINGECKO_FETCH_TIMEOUT
+
+    def fetch_batch(self, symbols: List[str]) -> Dict[str, Decimal]:
+        data = self.client.get_json(
+            self.url, params={"ids": ",".join(symbols), "vs_currencies": "usd"}
+        )
+        prices = {}
+        for symbol in symbols:
+            value = data.get(symbol, {}).get("usd")
+            if value is not None:
+                prices[symbol] = Decimal(str(value))
+        return prices
+
+
+class StaticFileProvider(PriceProvider):
+    """Prices from a ``symbol,price`` CSV file, for shares and collectibles.
+
+    The file (``PRICE_STATIC_FILE``) is re-read whenever it changes on
+    disk; without one the provider knows no prices.
+    """
+
+    name = "static"
+    batch_size = 10_000
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._loaded: Tuple[Optional[str], float] = (None, 0.0)
+        self._prices: Dict[str, Decimal] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path or settings.PRICE_STATIC_FILE
+
+    def _load(self) -> Dict[str, Decimal]:
+        path = self.path
+        if not path:
+            return {}
+        try:
+            mtime = os.stat(path).st_mtime
+            with self._lock:
+                if self._loaded != (path, mtime):
+                    with open(path, newline="", encoding="utf-8") as handle:
+                        self._prices = {
+                            row["symbol"].strip().lower(): Decimal(row["price"].strip())
+                            for row in csv.DictReader(handle)
+                            if row.get("symbol") and row.get("price")
+                        }
+                    self._loaded = (path, mtime)
+                return self._prices
+        except (OSError, ArithmeticError, KeyError, ValueError) as exc:
+            raise ProviderError(f"{self.name}: {exc}") from exc
+
+    def fetch_batch(self, symbols: List[str]) -> Dict[str, Decimal]:
+        prices = self._load()
+        return {symbol: prices[symbol] for symbol in symbols if symbol in prices}
+
+
+class FakeProvider(PriceProvider):
+    """Deterministic, realistic-looking prices for any symbol.
+
+    Each symbol gets a base price and a set of slow cycles from a hash of
+    its name, plus per-step noise, so a price depends only on the symbol
+    and the time and series of any length are cheap to compute. Meant for
+    development and load tests; ``delay`` simulates network latency.
+    """
+
+    name = "fake"
+    batch_size = 1000
+    concurrency = 8
+    interval = timedelta(minutes=30)
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    @staticmethod
+    def _shape(symbol: str):
+        rng = random.Random(zlib.crc32(symbol.encode()))
+        base = math.exp(rng.uniform(math.log(0.05), math.log(50_000)))
+        cycles = [
+            (rng.uniform(0.02, 0.25), rng.uniform(50, 5_000), rng.uniform(0, math.tau))
+            for _ in range(3)
+        ]
+        return zlib.crc32(symbol.encode()), base, rng.uniform(0.002, 0.02), cycles
+
+    @staticmethod
+    def _price(shape, step: int) -> Decimal:
+        seed, base, noise, cycles = shape
+        drift = sum(
+            amplitude * math.sin(math.tau * step / period + phase)
+            for amplitude, period, phase in cycles
+        )
+        jitter = random.Random(seed * 1_000_003 + step).gauss(0, noise)
+        return Decimal(f"{base * math.exp(drift + jitter):.4f}")
+
+    def _step(self, when: datetime) -> int:
+        return int(when.timestamp() // self.interval.total_seconds())
+
+    def price_at(self, symbol: str, when: datetime) -> Decimal:
+        return self._price(self._shape(symbol.lower()), self._step(when))
+
+    def series(
+        self, symbol: str, start: datetime, steps: int
+    ) -> List[Tuple[datetime, Decimal]]:
+        """``steps`` consecutive ``(timestamp, price)`` ticks from ``start``."""
+        shape = self._shape(symbol.lower())
+        first = self._step(start)
+        step_seconds = self.interval.total_seconds()
+        return [
+            (
+                datetime.fromtimestamp((first + i) * step_seconds, tz=start.tzinfo),
+                self._price(shape, first + i),
+            )
+            for i in range(steps)
+        ]
+
+    def fetch_batch(self, symbols: List[str]) -> Dict[str, Decimal]:
+        if self.delay:
+            time.sleep(self.delay)
+        step = int(time.time() // self.interval.total_seconds())
+        return {symbol: self._price(self._shape(symbol), step) for symbol in symbols}
+
+
+PROVIDERS: Dict[str, PriceProvider] = {}
+
+
+def register(provider: PriceProvider) -> PriceProvider:
+    """Add ``provider`` to the registry, replacing one of the same name."""
+    PROVIDERS[provider.name] = provider
+    return provider
+
+
+def get_provider(name: str) -> PriceProvider:
+    try:
+        return PROVIDERS[name]
+    except KeyError:
+        raise ProviderError(f"unknown price provider {name!r}") from None
+
+
+def provider_chain(preferred: str = "") -> Tuple[str, ...]:
+    """Providers to try in order: ``preferred`` first, then ``PRICE_PROVIDERS``."""
+    chain = [preferred] if preferred else []
+    chain += [name for name in settings.PRICE_PROVIDERS if name != preferred]
+    return tuple(chain)
+
+
+register(CoinGeckoProvider())
+register(StaticFileProvider())
+if settings.PRICE_FAKE_PROVIDER:
+    register(FakeProvider())
@@ -0,0 +1,207 @@
+"""Compaction of raw price ticks into hourly and daily OHLC candles."""
+
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Price, PriceCandle
+
+RESOLUTIONS = {
+    PriceCandle.HOUR: timedelta(hours=1),
+    PriceCandle.DAY: timedelta(days=1),
+}
+# Candles written per upsert statement.
+UPSERT_BATCH_SIZE = 1000
+
+# (asset_id, family_id, timestamp, open, high, low, close, samples)
+Tick = Tuple[int, int, datetime, Decimal, Decimal, Decimal, Decimal, int]
+
+
+def bucket_start(when: datetime, resolution: str) -> datetime:
+    """Start of the ``resolution`` bucket holding ``when``, in UTC."""
+    step = RESOLUTIONS[resolution].total_seconds()
+    return datetime.fromtimestamp(when.timestamp() // step * step, tz=dt_timezone.utc)
+
+
+def _source(resolution: str) -> Tuple[Optional[str], Iterable]:
+    """The finer resolution a candle is built from, and a queryset of it."""
+    if resolution == PriceCandle.HOUR:
+        return None, Price.objects.all()
+    return PriceCandle.HOUR, PriceCandle.objects.filter(resolution=PriceCandle.HOUR)
+
+
+def _ticks(
+    resolution: str, since: Optional[datetime], until: datetime
+) -> Iterator[Tick]:
+    finer, queryset = _source(resolution)
+    field = "timestamp" if finer is None else "start"
+    queryset = queryset.filter(**{f"{field}__lt": until})
+    if since is not None:
+        queryset = queryset.filter(**{f"{field}__gte": since})
+    if finer is None:
+        rows = queryset.order_by("asset_id", "timestamp").values_list(
+            "asset_id", "family_id", "timestamp", "value"
+        )
+        for asset_id, family_id, timestamp, value in rows.iterator(chunk_size=5000):
+            yield asset_id, family_id, timestamp, value, value, value, value, 1
+        return
+    rows = queryset.order_by("asset_id", "start").values_list(
+        "asset_id", "family_id", "start", "open", "high", "low", "close", "samples"
+    )
+    yield from rows.iterator(chunk_size=5000)
+
+
+def _candles(ticks: Iterable[Tick], resolution: str) -> Iterator[PriceCandle]:
+    """Fold ticks ordered by asset and time into one candle per bucket."""
+    candle = None
+    for asset_id, family_id, when, open_, high, low, close, samples in ticks:
+        start = bucket_start(when, resolution)
+        if candle is None or (candle.asset_id, candle.start) != (asset_id, start):
+            if candle is not None:
+                yield candle
+            candle = PriceCandle(
+                family_id=family_id,
+                asset_id=asset_id,
+                resolution=resolution,
+                start=start,
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                samples=samples,
+            )
+            continue
+        candle.high = max(candle.high, high)
+        candle.low = min(candle.low, low)
+        candle.close = close
+        candle.samples += samples
+    if candle is not None:
+        yield candle
+
+
+def _latest_start(resolution: str) -> Optional[datetime]:
+    return PriceCandle.objects.filter(resolution=resolution).aggregate(
+        latest=Max("start")
+    )["latest"]
+
+
+def rollup_prices(resolution: str, *, now: Optional[datetime] = None) -> int:
+    """Build ``resolution`` candles for every bucket completed before ``now``.
+
+    Hourly candles are built from raw ``Price`` ticks and daily ones from
+    hourly candles. The run resumes at the newest existing candle, which
+    is rebuilt in case late ticks landed in it, and upserts on the
+    ``(asset, resolution, start)`` key, so repeated runs are idempotent.
+    Returns the number of candles written.
+    """
+    until = bucket_start(now or timezone.now(), resolution)
+    since = _latest_start(resolution)
+    written = 0
+    batch: List[PriceCandle] = []
+    for candle in _candles(_ticks(resolution, since, until), resolution):
+        batch.append(candle)
+        if len(batch) >= UPSERT_BATCH_SIZE:
+            written += _upsert(batch)
+            batch = []
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(candles: List[PriceCandle]) -> int:
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target; the bucket
+    # constraint is the only unique key a new candle can collide with.
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["asset", "resolution", "start"]
+    else:
+        unique_fields = None
+    PriceCandle.objects.bulk_create(
+        candles,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=["open", "high", "low", "close", "samples", "updated_at"],
+    )
+    return len(candles)
+
+
+def delete_in_chunks(queryset, *, chunk_size: int, pause: float = 0.0) -> int:
+    """Delete the rows of ``queryset`` ``chunk_size`` primary keys at a time.
+
+    Each chunk is its own short statement and transaction, so writers
+    are never blocked behind one long delete; ``pause`` spaces the chunks
+    out further on a busy database. Returns the number of rows deleted.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += model.objects.filter(pk__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+
+def prune_prices(
+    *, now: Optional[datetime] = None, chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """Delete history older than ``PRICE_RETENTION_DAYS`` for each resolution.
+
+    Rows are only removed once the next coarser resolution has rolled
+    them up: the cutoff never passes the start of that resolution's
+    newest candle, which the next rollup rebuilds from its ticks.
+    Returns the rows deleted per resolution.
+    """
+    now = now or timezone.now()
+    chunk_size = chunk_size or settings.PRICE_DELETE_CHUNK_SIZE
+    retention = settings.PRICE_RETENTION_DAYS
+    levels = [
+        ("raw", Price.objects.all(), "timestamp", PriceCandle.HOUR),
+        (
+            PriceCandle.HOUR,
+            PriceCandle.objects.filter(resolution=PriceCandle.HOUR),
+            "start",
+            PriceCandle.DAY,
+        ),
+        (
+            PriceCandle.DAY,
+            PriceCandle.objects.filter(resolution=PriceCandle.DAY),
+            "start",
+            None,
+        ),
+    ]
+    deleted = {}
+    for level, queryset, field, coarser in levels:
+        days = retention.get(level, 0)
+        if not days:
+            continue
+        cutoff = now - timedelta(days=days)
+        if coarser is not None:
+            rolled_up = _latest_start(coarser)
+            if rolled_up is None:
+                continue
+            cutoff = min(cutoff, rolled_up)
+        deleted[level] = delete_in_chunks(
+            queryset.filter(**{f"{field}__lt": cutoff}), chunk_size=chunk_size
+        )
+    return deleted
+
+
+def compact_prices(*, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Roll up hourly then daily candles, then prune expired history."""
+    now = now or timezone.now()
+    written = {
+        resolution: rollup_prices(resolution, now=now) for resolution in RESOLUTIONS
+    }
+    deleted = prune_prices(now=now)
+    return {
+        **{f"{level}_written": count for level, count in written.items()},
+        **{f"{level}_deleted": count for level, count in deleted.items()},
+    }
@@ -1,12 +1,25 @@
 from rest_framework import serializers
 
-from .models import Asset, AssetTransactionLink, Price, ExchangeOrder, ExchangeTrade
+from .models import (
+    Asset,
+    AssetTransactionLink,
+    Price,
+    PriceCandle,
+    ExchangeOrder,
+    ExchangeTrade,
+)
+from .providers import PROVIDERS
 
 
 class AssetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Asset
-        fields = ["id", "name", "symbol", "current_price"]
+        fields = ["id", "name", "symbol", "provider", "current_price"]
+
+    def validate_provider(self, value):
+        if value and value not in PROVIDERS:
+            raise serializers.ValidationError(f"Unknown price provider {value!r}.")
+        return value
 
 
 class PriceSerializer(serializers.ModelSerializer):
@@ -15,6 +28,22 @@ class PriceSerializer(serializers.ModelSerializer):
         fields = ["id", "asset", "value", "timestamp"]
 
 
+class PriceCandleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PriceCandle
+        fields = [
+            "id",
+            "asset",
+            "resolution",
+            "start",
+            "open",
+            "high",
+            "low",
+            "close",
+            "samples",
+        ]
+
+
 class AssetTransactionLinkSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssetTransactionLink
@@ -23,6 +52,7 @@ class AssetTransactionLinkSerializer(serializers.ModelSerializer):
 
 # === Virtual Exchange serializers ===
 
+
 class ExchangeOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExchangeOrder
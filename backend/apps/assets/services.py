@@ -1,36 +1,178 @@
-from datetime import timedelta
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
 
-import requests
 from django.utils import timezone
 from django.db import transaction as db_tx
 
-COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+from .client import ProviderError
+from .fetcher import ProviderJob, fetch_concurrently
+from .pricecache import price_cache
+from .providers import get_provider, provider_chain
 
+# Provider names in the order they are tried.
+Chain = Tuple[str, ...]
 
-def fetch_price_for_symbol(symbol: str) -> Optional[Decimal]:
-    """Return current USD price for a given CoinGecko symbol."""
-    try:
-        resp = requests.get(
-            COINGECKO_URL,
-            params={"ids": symbol.lower(), "vs_currencies": "usd"},
-            timeout=10,
+
+def _fetch_round(asks: Mapping[str, Set[str]]) -> Dict[str, Dict[str, Decimal]]:
+    """Ask each provider for its symbols, all providers concurrently."""
+    jobs = []
+    for name, symbols in asks.items():
+        try:
+            provider = get_provider(name)
+        except ProviderError:
+            continue
+        ids = sorted(symbols)
+        size = provider.batch_size
+        batches = [ids[i : i + size] for i in range(0, len(ids), size)]
+        jobs.append(
+            ProviderJob(
+                name,
+                provider.fetch_batch,
+                batches,
+                concurrency=provider.concurrency,
+                timeout=provider.timeout,
+            )
+        )
+    if len(jobs) == 1 and len(jobs[0].batches) == 1:
+        # A single request needs no event loop.
+        job = jobs[0]
+        try:
+            return {job.name: dict(job.fetch_batch(job.batches[0]))}
+        except ProviderError:
+            return {}
+    return fetch_concurrently(jobs).prices
+
+
+def fetch_chain_prices(
+    wanted: Mapping[Chain, Iterable[str]]
+) -> Dict[Chain, Dict[str, Decimal]]:
+    """Price symbols through their provider chains.
+
+    ``wanted`` maps a chain of provider names to the symbols to price with
+    it. Round ``n`` asks the ``n``-th provider of every chain for the
+    symbols still missing, so a symbol only reaches a fallback provider
+    when the ones before it had no price. Providers asked in the same
+    round run concurrently; each gets one request per ``batch_size``
+    symbols.
+    """
+    missing = {
+        chain: {symbol.lower() for symbol in symbols if symbol}
+        for chain, symbols in wanted.items()
+    }
+    found: Dict[Chain, Dict[str, Decimal]] = {chain: {} for chain in missing}
+    depth = 0
+    while True:
+        asks: Dict[str, Set[str]] = defaultdict(set)
+        for chain, todo in missing.items():
+            if todo and depth < len(chain):
+                asks[chain[depth]] |= todo
+        if not asks:
+            return found
+        prices = _fetch_round(asks)
+        for chain, todo in missing.items():
+            if todo and depth < len(chain):
+                got = prices.get(chain[depth], {})
+                for symbol in todo & got.keys():
+                    found[chain][symbol] = got[symbol]
+                todo.difference_update(got)
+        depth += 1
+
+
+def fetch_prices(symbols: Iterable[str], *, provider: str = "") -> Dict[str, Decimal]:
+    """Return current USD prices keyed by lower-cased provider symbol.
+
+    Symbols go through ``provider_chain(provider)``. Symbols that no
+    provider priced, or whose batches failed or timed out, are left out.
+    """
+    chain = provider_chain(provider)
+    return fetch_chain_prices({chain: symbols})[chain]
+
+
+def fetch_price_for_symbol(symbol: str, provider: str = "") -> Optional[Decimal]:
+    """Return current USD price for a given provider symbol."""
+    return fetch_prices([symbol], provider=provider).get(symbol.lower())
+
+
+def _cache_key(chain: Chain, symbol: str) -> str:
+    """Shared cache key of ``symbol`` priced through ``chain``.
+
+    Built from the normalized chain rather than an asset's ``provider``,
+    so a batched refresh and a single lookup agree on the key however the
+    asset names its provider.
+    """
+    return f"{','.join(chain)}:{symbol.lower()}"
+
+
+def _fetch_cache_key(key: str) -> Optional[Decimal]:
+    names, _, symbol = key.partition(":")
+    preferred = names.split(",")[0]
+    return fetch_price_for_symbol(symbol, provider=preferred)
+
+
+def refresh_prices(assets=None, *, batch_size: int = 500) -> int:
+    """Refresh the current price of ``assets`` (every asset by default).
+
+    Each distinct symbol is fetched once per provider chain however many
+    families track it. Prices are written back with one ``bulk_update``
+    and one ``bulk_create``. Returns the number of assets updated.
+    """
+    from .models import Asset, Price
+
+    if assets is None:
+        assets = Asset.objects.only("id", "family_id", "symbol", "provider")
+    assets = list(assets)
+    wanted: Dict[Chain, Set[str]] = defaultdict(set)
+    for asset in assets:
+        wanted[provider_chain(asset.provider)].add(asset.symbol)
+    prices = fetch_chain_prices(wanted)
+    fetched_at = time.time()
+    for chain, found in prices.items():
+        price_cache.store(
+            {_cache_key(chain, symbol): value for symbol, value in found.items()},
+            fetched_at,
+        )
+    now = datetime.fromtimestamp(fetched_at, tz=dt_timezone.utc)
+    updated = []
+    for asset in assets:
+        value = prices[provider_chain(asset.provider)].get(asset.symbol.lower())
+        if value is not None:
+            asset.current_price = value
+            asset.price_fetched_at = now
+            updated.append(asset)
+    with db_tx.atomic():
+        Asset.objects.bulk_update(
+            updated, ["current_price", "price_fetched_at"], batch_size=batch_size
+        )
+        Price.objects.bulk_create(
+            (
+                Price(
+                    family_id=asset.family_id,
+                    asset=asset,
+                    value=asset.current_price,
+                    timestamp=now,
+                )
+                for asset in updated
+            ),
+            batch_size=batch_size,
         )
-        resp.raise_for_status()
-        data = resp.json()
-        value = data.get(symbol.lower(), {}).get("usd")
-        if value is None:
-            return None
-        return Decimal(str(value))
-    except Exception:
-        return None
+    return len(updated)
 
 
 def get_price_for_asset(
     asset, *, force: bool = False, stale_minutes: int = 60
 ) -> Optional[Decimal]:
-    """Return price for asset using cached value if fresh."""
+    """Return price for asset using cached value if fresh.
+
+    A stale asset row is refreshed from the shared ``price_cache``, so
+    families tracking the same symbol share one upstream fetch. The row
+    and its price history are only written when the cache holds a newer
+    price than the row. ``force`` skips both caches' freshness checks but
+    still joins a fetch already in flight.
+    """
     if (
         not force
         and asset.current_price is not None
@@ -39,12 +181,20 @@ def get_price_for_asset(
     ):
         return asset.current_price
 
-    value = fetch_price_for_symbol(asset.symbol)
-    if value is None:
+    key = _cache_key(provider_chain(asset.provider), asset.symbol)
+    if force:
+        entry = price_cache.refresh(key, _fetch_cache_key)
+    else:
+        entry = price_cache.get(key, _fetch_cache_key, max_age=stale_minutes * 60)
+    if entry is None:
         return asset.current_price
 
+    value, fetched_at = entry
+    fetched_at = datetime.fromtimestamp(fetched_at, tz=dt_timezone.utc)
+    if asset.price_fetched_at is not None and asset.price_fetched_at >= fetched_at:
+        return value
     asset.current_price = value
-    asset.price_fetched_at = timezone.now()
+    asset.price_fetched_at = fetched_at
     asset.save(update_fields=["current_price", "price_fetched_at"])
     from .models import Price
 
@@ -1,12 +1,17 @@
 from celery import shared_task
 
-from .models import Asset
-from .services import get_price_for_asset
+from .rollups import compact_prices
+from .services import refresh_prices
 
 
 @shared_task
 def fetch_latest_prices():
-    """Fetch current prices for all assets from CoinGecko."""
-    for asset in Asset.objects.all():
-        get_price_for_asset(asset, force=True)
+    """Fetch current prices for all assets from CoinGecko in batches."""
+    refresh_prices()
     return "ok"
+
+
+@shared_task
+def compact_price_history():
+    """Roll price ticks up into OHLC candles and prune expired history."""
+    return compact_prices()
@@ -1,17 +1,39 @@
-from datetime import timedelta
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
-from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import mkdtemp
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 from apps.accounting.models import Account, Transaction
 from apps.core.models import User
 from apps.families.models import Family, Membership
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 
+from .client import ProviderClient, ProviderError, SharedRateLimit, TokenBucket
+from .fetcher import ProviderJob, fetch_concurrently
 from .gains import calculate_gain, gain_for_asset
-from .models import Asset, AssetTransactionLink, Price
-from .services import fetch_price_for_symbol, get_price_for_asset
+from .models import Asset, AssetTransactionLink, Price, PriceCandle
+from .pricecache import LOCK_SECONDS, PriceCache, price_cache
+from .providers import PROVIDERS, FakeProvider, StaticFileProvider, register
+from .rollups import compact_prices, delete_in_chunks, prune_prices, rollup_prices
+from .services import (
+    fetch_price_for_symbol,
+    fetch_prices,
+    get_price_for_asset,
+    refresh_prices,
+)
 from .tasks import fetch_latest_prices
 
 
@@ -48,11 +70,175 @@ class AssetsModelTests(TestCase):
         self.assertEqual(link.transaction, tx)
 
 
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Answers like CoinGecko's ``simple/price`` over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.server.calls.append(query)
+        if self.server.replies:
+            status, headers = self.server.replies.pop(0)
+            body = b"{}"
+        else:
+            status, headers = 200, {}
+            body = json.dumps(
+                {
+                    symbol: {"usd": self.server.quotes[symbol]}
+                    for symbol in query["ids"][0].split(",")
+                    if symbol in self.server.quotes
+                }
+            ).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_provider(test, quotes=None):
+    """Serve ``quotes`` on localhost and point the CoinGecko client at it.
+
+    Queue ``(status, headers)`` pairs on ``server.replies`` to answer the
+    next requests with those instead.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+    server.quotes = quotes or {}
+    server.calls = []
+    server.replies = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    client = ProviderClient("stub", requests_per_minute=60_000, burst=100, backoff=0.01)
+    test.addCleanup(client.session.close)
+    coingecko = PROVIDERS["coingecko"]
+    for name, value in (
+        ("url", f"http://127.0.0.1:{server.server_port}/"),
+        ("client", client),
+    ):
+        patcher = patch.object(coingecko, name, value)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    return server, client
+
+
+class ProviderClientTests(SimpleTestCase):
+    def test_reuses_connections_and_counts_requests(self):
+        server, client = start_stub_provider(self, {"bitcoin": 1})
+        for _ in range(5):
+            self.assertEqual(fetch_price_for_symbol("bitcoin"), Decimal("1"))
+        stats = client.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["successes"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["pool_hit_rate"], 0.8)
+        self.assertGreater(stats["latency_avg_ms"], 0)
+
+    def test_retries_throttling_and_server_errors(self):
+        server, client = start_stub_provider(self, {"bitcoin": 2})
+        server.replies = [(429, {"Retry-After": "0"}), (503, {})]
+        self.assertEqual(fetch_price_for_symbol("bitcoin"), Decimal("2"))
+        stats = client.stats()
+        self.assertEqual(
+            (stats["requests"], stats["retries"], stats["throttled"]), (3, 2, 1)
+        )
+
+        server.replies = [(500, {})] * (client.max_retries + 1)
+        with self.assertRaises(ProviderError):
+            client.get_json(PROVIDERS["coingecko"].url, {"ids": "bitcoin"})
+        self.assertEqual(client.stats()["failures"], 1)
+        # Price lookups report a failed batch as a missing price.
+        server.replies = [(500, {})] * (client.max_retries + 1)
+        self.assertIsNone(fetch_price_for_symbol("bitcoin"))
+
+    def test_retries_stop_within_the_budget(self):
+        server, client = start_stub_provider(self, {"bitcoin": 2})
+        self.assertGreater(LOCK_SECONDS, client.retry_budget)
+        server.replies = [(503, {"Retry-After": "1"})] * (client.max_retries + 1)
+        client.retry_budget = 0.5
+        started = time.monotonic()
+        with self.assertRaises(ProviderError):
+            client.get_json(PROVIDERS["coingecko"].url, {"ids": "bitcoin"})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(client.stats()["requests"], 1)
+
+    def test_token_bucket_spaces_requests(self):
+        server, client = start_stub_provider(self, {"bitcoin": 1})
+        client.bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(4):
+            client.get_json(PROVIDERS["coingecko"].url, {"ids": "bitcoin"})
+        self.assertGreaterEqual(time.monotonic() - started, 0.14)
+        self.assertEqual(client.stats()["rate_limited"], 3)
+
+    def test_shared_rate_limit_spans_processes(self):
+        cache.clear()
+        # Two limiters on one key stand in for two worker processes.
+        workers = [SharedRateLimit("test-quota", rate=20, capacity=2) for _ in "ab"]
+        started = time.monotonic()
+        waits = [workers[i % 2].acquire() for i in range(6)]
+        # Six requests at two per 0.1s window need at least three windows.
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertTrue(any(waits))
+
+
+class ConcurrentFetcherTests(SimpleTestCase):
+    @staticmethod
+    def provider(delay, price="1"):
+        def fetch_batch(batch):
+            time.sleep(delay)
+            if "broken" in batch:
+                raise ProviderError("broken")
+            return {symbol: Decimal(price) for symbol in batch}
+
+        return fetch_batch
+
+    def test_batches_run_concurrently(self):
+        batches = [[f"s{i}"] for i in range(12)]
+        started = time.monotonic()
+        result = fetch_concurrently(
+            [ProviderJob("a", self.provider(0.1), batches, concurrency=4, timeout=5)]
+        )
+        # Twelve 100 ms batches, four at a time: about 300 ms, not 1.2 s.
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(len(result.prices["a"]), 12)
+
+    def test_slow_provider_times_out_independently(self):
+        started = time.monotonic()
+        result = fetch_concurrently(
+            [
+                ProviderJob(
+                    "fast",
+                    self.provider(0.05, "2"),
+                    [["a"], ["b"], ["broken"]],
+                    concurrency=2,
+                    timeout=5,
+                ),
+                ProviderJob(
+                    "slow", self.provider(3), [["c"], ["d"]], concurrency=1, timeout=0.2
+                ),
+            ]
+        )
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result.prices["fast"], {"a": Decimal("2"), "b": Decimal("2")})
+        self.assertEqual(result.prices["slow"], {})
+        self.assertEqual(result.failed, {"fast": 1})
+        self.assertEqual(result.timed_out, {"slow": 2})
+
+
 class PriceServiceTests(TestCase):
-    @patch("apps.assets.services.requests.get")
-    def test_fetch_price_for_symbol(self, mock_get):
-        mock_get.return_value.json.return_value = {"bitcoin": {"usd": 123.45}}
-        mock_get.return_value.raise_for_status.return_value = None
+    def setUp(self):
+        cache.clear()
+        price_cache.clear()
+
+    def test_fetch_price_for_symbol(self):
+        start_stub_provider(self, {"bitcoin": 123.45})
         price = fetch_price_for_symbol("bitcoin")
         self.assertEqual(price, Decimal("123.45"))
 
@@ -90,6 +276,346 @@ class PriceServiceTests(TestCase):
         asset.refresh_from_db()
         self.assertEqual(asset.current_price, Decimal("3"))
 
+    def test_refresh_prices_batches_symbols_across_families(self):
+        server, _ = start_stub_provider(
+            self, {"bitcoin": 60000.5, "ethereum": 3000, "dogecoin": 0.1}
+        )
+        owner = User.objects.create_user("c@b.com")
+        families = [Family.objects.create(name=f"F{i}", owner=owner) for i in range(3)]
+        for family in families:
+            for symbol in ("bitcoin", "Ethereum", "dogecoin", "unknown"):
+                Asset.objects.create(family=family, name=symbol, symbol=symbol)
+
+        with patch.object(PROVIDERS["coingecko"], "batch_size", 2):
+            # Asset select, savepoint, bulk update, bulk insert, release.
+            with self.assertNumQueries(5):
+                updated = refresh_prices()
+        self.assertEqual(updated, 9)
+        self.assertEqual(
+            sorted(call["ids"][0] for call in server.calls),
+            ["bitcoin,dogecoin", "ethereum,unknown"],
+        )
+        self.assertEqual(
+            Asset.objects.filter(current_price=Decimal("60000.5")).count(), 3
+        )
+        self.assertEqual(Price.objects.filter(value=Decimal("3000")).count(), 3)
+        self.assertIsNone(Asset.objects.filter(symbol="unknown")[0].current_price)
+
+    @patch("apps.assets.services.fetch_price_for_symbol")
+    def test_stale_assets_share_one_fetch(self, mock_fetch):
+        mock_fetch.return_value = Decimal("5")
+        owner = User.objects.create_user("d@b.com")
+        stale = timezone.now() - timedelta(hours=2)
+        assets = [
+            Asset.objects.create(
+                family=Family.objects.create(name=f"F{i}", owner=owner),
+                name="Coin",
+                symbol="Coin" if i % 2 else "coin",
+                current_price=Decimal("1"),
+                price_fetched_at=stale,
+            )
+            for i in range(10)
+        ]
+        self.assertEqual(
+            [get_price_for_asset(asset) for asset in assets], [Decimal("5")] * 10
+        )
+        mock_fetch.assert_called_once_with("coin", provider="coingecko")
+        self.assertEqual(Price.objects.filter(value=Decimal("5")).count(), 10)
+
+    @patch("apps.assets.services.fetch_price_for_symbol")
+    @patch("apps.assets.services.fetch_chain_prices")
+    def test_refreshed_prices_serve_single_lookups(self, mock_chain, mock_fetch):
+        owner = User.objects.create_user("r@b.com")
+        refreshed = Asset.objects.create(
+            family=Family.objects.create(name="F1", owner=owner),
+            name="Bitcoin",
+            symbol="Bitcoin",
+        )
+        # Naming the first provider of the default chain is the same chain.
+        stale = Asset.objects.create(
+            family=Family.objects.create(name="F2", owner=owner),
+            name="Bitcoin",
+            symbol="bitcoin",
+            provider="coingecko",
+            current_price=Decimal("1"),
+            price_fetched_at=timezone.now() - timedelta(hours=2),
+        )
+        chain = ("coingecko", "static")
+        mock_chain.return_value = {chain: {"bitcoin": Decimal("7")}}
+        self.assertEqual(refresh_prices([refreshed]), 1)
+        price_cache.clear()  # As if the lookup ran in another worker.
+
+        self.assertEqual(get_price_for_asset(stale), Decimal("7"))
+        mock_fetch.assert_not_called()
+
+    def test_price_cache_coalesces_concurrent_misses(self):
+        calls = []
+
+        def slow_fetch(symbol):
+            calls.append(symbol)
+            time.sleep(0.1)
+            return Decimal("7")
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    price_cache.get("coin", slow_fetch, max_age=60)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, ["coin"])
+        self.assertEqual({value for value, _ in results}, {Decimal("7")})
+
+    def test_price_cache_waits_for_another_workers_fetch(self):
+        other_worker = PriceCache()
+        cache.add("asset-price-lock:coin", 1)
+        timer = threading.Timer(0.2, other_worker.store, [{"coin": Decimal("8")}])
+        timer.start()
+        fetch = Mock()
+        value, _ = price_cache.get("coin", fetch, max_age=60)
+        timer.join()
+        self.assertEqual(value, Decimal("8"))
+        fetch.assert_not_called()
+
+    def test_price_cache_keeps_a_lock_taken_over_by_another_worker(self):
+        def slow_fetch(symbol):
+            # The lock expired mid-fetch and another worker took it.
+            cache.set("asset-price-lock:coin", "other-worker")
+            return Decimal("9")
+
+        value, _ = price_cache.get("coin", slow_fetch, max_age=60)
+        self.assertEqual(value, Decimal("9"))
+        self.assertEqual(cache.get("asset-price-lock:coin"), "other-worker")
+        # A fetch that kept its lock releases it.
+        cache.delete("asset-price-lock:coin")
+        price_cache.refresh("coin", Mock(return_value=Decimal("1")))
+        self.assertIsNone(cache.get("asset-price-lock:coin"))
+
+    def test_price_cache_serves_stale_while_revalidating(self):
+        price_cache.store({"coin": Decimal("1")}, time.time() - 120)
+        fetch = Mock(return_value=Decimal("2"))
+        value, _ = price_cache.get("coin", fetch, max_age=60)
+        self.assertEqual(value, Decimal("1"))
+        price_cache.wait()
+        fetch.assert_called_once_with("coin")
+        value, _ = price_cache.get("coin", fetch, max_age=60)
+        self.assertEqual(value, Decimal("2"))
+
+
+class PriceProviderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        price_cache.clear()
+
+    def static_file(self, rows):
+        path = os.path.join(mkdtemp(), "prices.csv")
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["symbol", "price"])
+            writer.writerows(rows)
+        return path
+
+    def test_assets_use_their_provider_then_fall_back(self):
+        server, _ = start_stub_provider(self, {"bitcoin": 100})
+        path = self.static_file([["ACME", "12.50"], ["gold-bar", "2400"]])
+        owner = User.objects.create_user("e@b.com")
+        family = Family.objects.create(name="F", owner=owner)
+        bitcoin, gold, acme, fake = (
+            Asset.objects.create(family=family, name=n, symbol=sym, provider=prov)
+            for n, sym, prov in [
+                ("Bitcoin", "bitcoin", ""),
+                ("Gold", "gold-bar", ""),
+                ("Acme", "ACME", "static"),
+                ("Test", "TEST", "fake"),
+            ]
+        )
+        with (
+            override_settings(PRICE_STATIC_FILE=path),
+            patch.dict(PROVIDERS, {"fake": FakeProvider()}),
+        ):
+            self.assertEqual(refresh_prices(), 4)
+        for asset in (bitcoin, gold, acme, fake):
+            asset.refresh_from_db()
+        self.assertEqual(bitcoin.current_price, Decimal("100"))
+        # Not on CoinGecko, so the static file is next in PRICE_PROVIDERS.
+        self.assertEqual(gold.current_price, Decimal("2400"))
+        self.assertEqual(acme.current_price, Decimal("12.5"))
+        self.assertEqual(
+            fake.current_price,
+            FakeProvider().price_at("test", fake.price_fetched_at),
+        )
+        # Only CoinGecko's first-round symbols went over the network.
+        self.assertEqual(
+            sorted(call["ids"][0] for call in server.calls), ["bitcoin,gold-bar"]
+        )
+
+    def test_static_provider_reloads_changed_file(self):
+        path = self.static_file([["acme", "1"]])
+        provider = StaticFileProvider(path)
+        self.assertEqual(provider.fetch_batch(["acme", "x"]), {"acme": Decimal("1")})
+        with open(path, "a") as handle:
+            handle.write("x,2\n")
+        os.utime(path, (time.time() + 5, time.time() + 5))
+        self.assertEqual(provider.fetch_batch(["x"]), {"x": Decimal("2")})
+
+    def test_fake_provider_series_are_deterministic_and_plausible(self):
+        fake = FakeProvider()
+        start = timezone.now() - timedelta(days=30)
+        series = fake.series("bitcoin", start, 24 * 2 * 30)
+        self.assertEqual(series, fake.series("bitcoin", start, 24 * 2 * 30))
+        self.assertNotEqual(series, fake.series("ethereum", start, 24 * 2 * 30))
+        prices = [price for _, price in series]
+        self.assertTrue(all(price > 0 for price in prices))
+        moves = [abs(b / a - 1) for a, b in zip(prices, prices[1:])]
+        self.assertLess(max(moves), Decimal("0.2"))
+        self.assertGreater(len(set(prices)), len(prices) // 2)
+
+    @override_settings(PRICE_PROVIDERS=["fake"])
+    def test_refresh_thousands_of_symbols_with_fake_provider(self):
+        fake = FakeProvider(delay=0.5)
+        patcher = patch.dict(PROVIDERS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        register(fake)
+        symbols = [f"sym{i}" for i in range(3000)]
+        started = time.monotonic()
+        prices = fetch_prices(symbols)
+        # Three batches of 1000 run together: one batch's delay, not three.
+        self.assertLess(time.monotonic() - started, 0.5 * 2)
+        self.assertEqual(len(prices), 3000)
+        owner = User.objects.create_user("f@b.com")
+        family = Family.objects.create(name="Load", owner=owner)
+        Asset.objects.bulk_create(
+            Asset(family=family, name=symbol, symbol=symbol) for symbol in symbols
+        )
+        self.assertEqual(refresh_prices(), 3000)
+        self.assertEqual(Price.objects.filter(family=family).count(), 3000)
+
+
+class PriceRollupTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user("r@b.com")
+        self.family = Family.objects.create(name="F", owner=owner)
+        self.asset = Asset.objects.create(family=self.family, name="B", symbol="b")
+        # Two days of ticks every 30 minutes, ending half an hour in.
+        self.start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        self.now = self.start + timedelta(days=2, minutes=45)
+        Price.objects.bulk_create(
+            Price(
+                family=self.family,
+                asset=self.asset,
+                value=Decimal(100 + i % 7),
+                timestamp=self.start + timedelta(minutes=30 * i),
+            )
+            for i in range(2 * 48 + 2)
+        )
+
+    def candle(self, resolution, start):
+        return PriceCandle.objects.get(
+            asset=self.asset, resolution=resolution, start=start
+        )
+
+    def test_rolls_ticks_into_hourly_and_daily_candles(self):
+        result = compact_prices(now=self.now)
+        self.assertEqual(result["1h_written"], 48)
+        self.assertEqual(result["1d_written"], 2)
+        # The hour in progress at ``now`` is left for the next run.
+        self.assertFalse(
+            PriceCandle.objects.filter(start__gte=self.now - timedelta(minutes=45))
+        )
+        hour = self.candle(PriceCandle.HOUR, self.start + timedelta(hours=3))
+        self.assertEqual(
+            (hour.open, hour.high, hour.low, hour.close, hour.samples),
+            (Decimal(106), Decimal(106), Decimal(100), Decimal(100), 2),
+        )
+        day = self.candle(PriceCandle.DAY, self.start)
+        values = [100 + i % 7 for i in range(48)]
+        self.assertEqual(
+            (day.open, day.high, day.low, day.close, day.samples),
+            (values[0], max(values), min(values), values[-1], 48),
+        )
+        self.assertEqual(day.family, self.family)
+
+        # A later run only rebuilds from the newest candle onwards.
+        Price.objects.create(
+            family=self.family,
+            asset=self.asset,
+            value=Decimal(500),
+            timestamp=self.now + timedelta(minutes=5),
+        )
+        later = compact_prices(now=self.now + timedelta(hours=1))
+        self.assertEqual((later["1h_written"], later["1d_written"]), (2, 1))
+        self.assertEqual(
+            self.candle(PriceCandle.HOUR, self.start + timedelta(days=2)).high, 500
+        )
+        self.assertEqual(PriceCandle.objects.count(), 49 + 2)
+
+    def test_rollup_updates_existing_candles_in_place(self):
+        # Runs the backend's own upsert: ON CONFLICT on PostgreSQL and
+        # sqlite, ON DUPLICATE KEY UPDATE on MySQL.
+        rollup_prices(PriceCandle.HOUR, now=self.now)
+        first = self.candle(PriceCandle.HOUR, self.start)
+        Price.objects.create(
+            family=self.family,
+            asset=self.asset,
+            value=Decimal("500"),
+            timestamp=self.start + timedelta(minutes=10),
+        )
+        # A run resumes at the newest candle, so make the first one newest.
+        PriceCandle.objects.filter(resolution=PriceCandle.HOUR).exclude(
+            pk=first.pk
+        ).delete()
+        rollup_prices(PriceCandle.HOUR, now=self.now)
+        candle = self.candle(PriceCandle.HOUR, self.start)
+        self.assertEqual(candle.pk, first.pk)
+        self.assertEqual((candle.high, candle.samples), (Decimal("500"), 3))
+        self.assertEqual(
+            PriceCandle.objects.filter(
+                resolution=PriceCandle.HOUR, start=self.start
+            ).count(),
+            1,
+        )
+
+    @override_settings(PRICE_RETENTION_DAYS={"raw": 1, "1h": 1, "1d": 0})
+    def test_prunes_expired_history_in_chunks(self):
+        self.assertEqual(prune_prices(now=self.now), {})
+        rollup_prices(PriceCandle.HOUR, now=self.now)
+        rollup_prices(PriceCandle.DAY, now=self.now)
+        with patch(
+            "apps.assets.rollups.delete_in_chunks", wraps=delete_in_chunks
+        ) as deleter:
+            deleted = prune_prices(now=self.now, chunk_size=10)
+        cutoff = self.now - timedelta(days=1)
+        self.assertEqual(deleted["raw"], 50)
+        self.assertFalse(Price.objects.filter(timestamp__lt=cutoff))
+        # Hourly candles wait for the daily rollup that still needs them.
+        self.assertEqual(deleted["1h"], 24)
+        self.assertEqual(
+            PriceCandle.objects.filter(resolution=PriceCandle.HOUR)
+            .order_by("start")
+            .first()
+            .start,
+            self.start + timedelta(days=1),
+        )
+        self.assertEqual(
+            PriceCandle.objects.filter(resolution=PriceCandle.DAY).count(), 2
+        )
+        self.assertEqual(deleter.call_count, 2)
+
+    def test_delete_in_chunks_bounds_each_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            deleted = delete_in_chunks(Price.objects.all(), chunk_size=40)
+        self.assertEqual(deleted, 98)
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+        self.assertFalse(Price.objects.exists())
+
 
 class GainComputationTests(TestCase):
     def setUp(self):
@@ -149,10 +675,12 @@ class GainComputationTests(TestCase):
         gain = gain_for_asset(asset, "fifo")
         self.assertEqual(gain, Decimal("25"))
 
-    @patch("apps.assets.services.fetch_price_for_symbol")
+    @patch("apps.assets.services.fetch_chain_prices")
     def test_fetch_latest_prices_task(self, mock_fetch):
         asset = Asset.objects.create(family=self.family, name="Coin", symbol="coin")
-        mock_fetch.return_value = Decimal("1")
+        mock_fetch.side_effect = lambda wanted: {
+            chain: {"coin": Decimal("1")} for chain in wanted
+        }
         fetch_latest_prices()
         asset.refresh_from_db()
         self.assertEqual(asset.current_price, Decimal("1"))
@@ -179,8 +707,77 @@ class AssetAPITests(TestCase):
 
         resp = self.client.get("/api/assets/")
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(resp.data[0]["id"], asset.id)
-        self.assertEqual(resp.data[0]["current_price"], "123.4500")
+        self.assertEqual(resp.data["results"][0]["id"], asset.id)
+        self.assertEqual(resp.data["results"][0]["current_price"], "123.4500")
+
+    @patch("apps.assets.services.fetch_price_for_symbol")
+    def test_retrieve_tops_up_a_stale_price(self, mock_fetch):
+        cache.clear()
+        price_cache.clear()
+        mock_fetch.return_value = Decimal("7")
+        asset = Asset.objects.create(family=self.family, name="Coin", symbol="coin")
+        resp = self.client.get(f"/api/assets/{asset.id}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["current_price"], "7.0000")
+        # Now fresh: served from the row without another fetch.
+        resp = self.client.get(f"/api/assets/{asset.id}/")
+        self.assertEqual(resp.data["current_price"], "7.0000")
+        mock_fetch.assert_called_once_with("coin", provider="coingecko")
+        self.assertEqual(Price.objects.filter(asset=asset).count(), 1)
+
+    def test_asset_provider_must_be_registered(self):
+        resp = self.client.post(
+            "/api/assets/", {"name": "Acme", "symbol": "ACME", "provider": "nope"}
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("provider", resp.data)
+        # The fake provider is only registered when PRICE_FAKE_PROVIDER is set.
+        resp = self.client.post(
+            "/api/assets/", {"name": "Acme", "symbol": "ACME", "provider": "fake"}
+        )
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post(
+            "/api/assets/", {"name": "Acme", "symbol": "ACME", "provider": "static"}
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["provider"], "static")
+
+    def test_candles_for_charts(self):
+        asset = Asset.objects.create(family=self.family, name="B", symbol="b")
+        other = Family.objects.create(name="Other", owner=self.user)
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        for family, resolution, offset in [
+            (self.family, PriceCandle.DAY, 1),
+            (self.family, PriceCandle.DAY, 0),
+            (self.family, PriceCandle.HOUR, 0),
+            (other, PriceCandle.DAY, 2),
+        ]:
+            PriceCandle.objects.create(
+                family=family,
+                asset=asset,
+                resolution=resolution,
+                start=start + timedelta(days=offset),
+                open=1,
+                high=2,
+                low=1,
+                close=2,
+                samples=1,
+            )
+        resp = self.client.get(f"/api/asset-candles/?asset={asset.id}&resolution=1d")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            [row["start"] for row in resp.data["results"]],
+            ["2026-03-01T00:00:00Z", "2026-03-02T00:00:00Z"],
+        )
+        resp = self.client.get(
+            "/api/asset-candles/", {"resolution": "1d", "since": "2026-03-02T00:00"}
+        )
+        self.assertEqual(len(resp.data["results"]), 1)
+        resp = self.client.get("/api/asset-candles/")
+        self.assertEqual(len(resp.data["results"]), 1)
+        for params in ({"resolution": "5m"}, {"since": "yesterday"}):
+            resp = self.client.get("/api/asset-candles/", params)
+            self.assertEqual(resp.status_code, 400)
 
     def test_filter_asset_prices_by_asset(self):
         asset1 = Asset.objects.create(family=self.family, name="A1", symbol="A1")
@@ -194,5 +791,5 @@ class AssetAPITests(TestCase):
 
         resp = self.client.get(f"/api/asset-prices/?asset={asset1.id}")
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["asset"], asset1.id)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["asset"], asset1.id)
@@ -1,15 +1,39 @@
 from apps.families.mixins import FamilyQuerySetMixin
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import permissions, viewsets
-
-from .models import Asset, AssetTransactionLink, Price, ExchangeOrder, ExchangeTrade
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import (
+    Asset,
+    AssetTransactionLink,
+    Price,
+    PriceCandle,
+    ExchangeOrder,
+    ExchangeTrade,
+)
 from .serializers import (
     AssetSerializer,
     AssetTransactionLinkSerializer,
+    PriceCandleSerializer,
     PriceSerializer,
     ExchangeOrderSerializer,
     ExchangeTradeSerializer,
 )
-from .services import match_orders
+from .services import get_price_for_asset, match_orders
+
+
+def _parse_datetime_param(params, name):
+    try:
+        value = parse_datetime(params[name])
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Expected an ISO 8601 timestamp."})
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
 
 
 class AssetViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
@@ -20,6 +44,17 @@ class AssetViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(family=self.request.user.membership_set.first().family)
 
+    def retrieve(self, request, *args, **kwargs):
+        """Return the asset, topping up a stale price first.
+
+        ``fetch_latest_prices`` keeps listed prices current; a single asset
+        (a new one, or one the last refresh missed) goes through the shared
+        price cache, so concurrent views of a symbol share one fetch.
+        """
+        asset = self.get_object()
+        get_price_for_asset(asset)
+        return Response(self.get_serializer(asset).data)
+
 
 class PriceViewSet(FamilyQuerySetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Price.objects.all().order_by("-timestamp")
@@ -34,6 +69,32 @@ class PriceViewSet(FamilyQuerySetMixin, viewsets.ReadOnlyModelViewSet):
         return qs
 
 
+class PriceCandleViewSet(FamilyQuerySetMixin, viewsets.ReadOnlyModelViewSet):
+    """OHLC candles for price charts, oldest first.
+
+    Filter with ``asset``, ``resolution`` (``1h`` or ``1d``, default
+    ``1h``), and ``since``/``until`` ISO timestamps.
+    """
+
+    queryset = PriceCandle.objects.all().order_by("start")
+    serializer_class = PriceCandleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        params = self.request.query_params
+        resolution = params.get("resolution", PriceCandle.HOUR)
+        if resolution not in dict(PriceCandle.RESOLUTION_CHOICES):
+            raise ValidationError({"resolution": "Expected 1h or 1d."})
+        qs = super().get_queryset().filter(resolution=resolution)
+        asset_id = params.get("asset")
+        if asset_id:
+            qs = qs.filter(asset_id=asset_id)
+        for param, lookup in (("since", "start__gte"), ("until", "start__lt")):
+            if params.get(param):
+                qs = qs.filter(**{lookup: _parse_datetime_param(params, param)})
+        return qs
+
+
 class AssetTransactionLinkViewSet(FamilyQuerySetMixin, viewsets.ModelViewSet):
     queryset = AssetTransactionLink.objects.all().order_by("id")
     serializer_class = AssetTransactionLinkSerializer
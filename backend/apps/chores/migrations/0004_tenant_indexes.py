@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chores", "0003_pointexchange"),
+        ("families", "0002_alter_invitation_code"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="entry",
+            index=models.Index(
+                fields=["family", "due_date"], name="chores_entry_family_due_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="entry",
+            index=models.Index(
+                fields=["family", "status", "due_date"],
+                name="chores_entry_family_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="entry",
+            index=models.Index(
+                fields=["due_date", "status"], name="chores_entry_due_status_idx"
+            ),
+        ),
+    ]
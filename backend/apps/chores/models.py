@@ -37,6 +37,20 @@ class Entry(FamilyScopedModel):
         max_length=10, choices=Status.choices, default=Status.AWAITING
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["family", "due_date"], name="chores_entry_family_due_idx"
+            ),
+            models.Index(
+                fields=["family", "status", "due_date"],
+                name="chores_entry_family_status_idx",
+            ),
+            models.Index(
+                fields=["due_date", "status"], name="chores_entry_due_status_idx"
+            ),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return f"{self.chore} -> {self.assigned_to} on {self.due_date}"
 
@@ -138,5 +138,5 @@ class ChoreAPITests(TestCase):
 
         resp = self.client.get("/api/chore-entries/")
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["chore"], own_chore.id)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["chore"], own_chore.id)
@@ -0,0 +1,147 @@
+"""Print query plans and timings for the tenant-scoped list queries."""
+
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from apps.accounting.models import Account, Category, Transaction
+from apps.assets.models import Asset, Price
+from apps.chores.models import Chore, Entry
+from apps.core.models import User
+from apps.families.models import Family
+from apps.notifications.models import Notification
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_tx
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway synthetic dataset, then print EXPLAIN output and "
+        "timings for the hot list queries. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200_000)
+        parser.add_argument("--families", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with db_tx.atomic():
+            target = self.seed(options["rows"], options["families"])
+            self.report(self.queries(target), options["repeat"])
+            db_tx.set_rollback(True)
+
+    def seed(self, rows, families):
+        rng = random.Random(0)
+        user = User.objects.create_user(f"bench-{time.time_ns()}@example.com")
+        tenants = [
+            Family.objects.create(name=f"bench {i}", owner=user)
+            for i in range(families)
+        ]
+        per_family = max(1, rows // families)
+        start = date(2020, 1, 1)
+        now = timezone.now()
+        for family in tenants:
+            accounts = Account.objects.bulk_create(
+                Account(family=family, name=f"a{i}", type=Account.Type.ASSET)
+                for i in range(10)
+            )
+            categories = Category.objects.bulk_create(
+                Category(family=family, name=f"c{i}") for i in range(10)
+            )
+            chore = Chore.objects.create(family=family, name="bench", schedule="daily")
+            assets = Asset.objects.bulk_create(
+                Asset(family=family, name=f"s{i}", symbol=f"s{i}") for i in range(5)
+            )
+            batch = []
+            for i in range(per_family):
+                debit, credit = rng.sample(accounts, 2)
+                batch.append(
+                    Transaction(
+                        family=family,
+                        description="bench",
+                        amount=Decimal("1.00"),
+                        debit_account=debit,
+                        credit_account=credit,
+                        category=rng.choice(categories),
+                        date=start + timedelta(days=rng.randrange(2000)),
+                    )
+                )
+            Transaction.objects.bulk_create(batch, batch_size=2000)
+            Entry.objects.bulk_create(
+                (
+                    Entry(
+                        family=family,
+                        chore=chore,
+                        assigned_to=user,
+                        due_date=start + timedelta(days=rng.randrange(2000)),
+                        status=rng.choice(Entry.Status.values),
+                    )
+                    for _ in range(per_family)
+                ),
+                batch_size=2000,
+            )
+            Price.objects.bulk_create(
+                (
+                    Price(
+                        family=family,
+                        asset=rng.choice(assets),
+                        value=Decimal("1"),
+                        timestamp=now - timedelta(minutes=30 * i),
+                    )
+                    for i in range(per_family)
+                ),
+                batch_size=2000,
+            )
+        Notification.objects.bulk_create(
+            (
+                Notification(
+                    user=user,
+                    message="bench",
+                    created_at=now - timedelta(minutes=i),
+                )
+                for i in range(per_family)
+            ),
+            batch_size=2000,
+        )
+        return tenants[families // 2], user
+
+    def queries(self, target):
+        family, user = target
+        category = Category.objects.filter(family=family).first()
+        asset = Asset.objects.filter(family=family).first()
+        return {
+            "transactions page": Transaction.objects.filter(family=family).order_by(
+                "id"
+            )[:51],
+            "transactions by category": Transaction.objects.filter(
+                family=family, category=category
+            ).order_by("id")[:51],
+            "transactions by date range": Transaction.objects.filter(
+                family=family, date__range=(date(2021, 1, 1), date(2021, 1, 31))
+            ).order_by("id"),
+            "chore entries page": Entry.objects.filter(family=family).order_by(
+                "-due_date", "-id"
+            )[:51],
+            "chore entries by status": Entry.objects.filter(
+                family=family, status=Entry.Status.AWAITING
+            ).order_by("-due_date", "-id")[:51],
+            "asset prices page": Price.objects.filter(
+                family=family, asset=asset
+            ).order_by("-timestamp", "-id")[:51],
+            "notifications page": Notification.objects.filter(user=user).order_by(
+                "-created_at", "-id"
+            )[:51],
+        }
+
+    def report(self, queries, repeat):
+        for label, queryset in queries.items():
+            plan = queryset.explain()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label} ({elapsed:.2f} ms)"))
+            self.stdout.write(plan)
@@ -0,0 +1,162 @@
+"""Keyset (cursor) pagination shared by all list endpoints."""
+
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Paginate on the view's own ordering plus a primary key tie-breaker.
+
+    The cursor stores the ordering values of the last row served, and the
+    next page is selected with a lexicographic ``WHERE (a, id) > (x, y)``
+    filter. Every page therefore costs the same index range scan, and no
+    ``COUNT(*)`` is issued. Ordering fields, which may be annotations, must
+    be non-nullable.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 50
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                page_size = int(raw)
+            except ValueError:
+                pass
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """Return the queryset ordering with ``pk`` appended as tie-breaker.
+
+        An unordered queryset falls back to the model's ``Meta.ordering``,
+        then to ``pk``.
+        """
+        ordering = [str(field) for field in queryset.query.order_by]
+        if not ordering and queryset.query.default_ordering:
+            ordering = [
+                field
+                for field in queryset.model._meta.ordering
+                if isinstance(field, str)
+            ]
+        if not ordering:
+            ordering = ["pk"]
+        pk_name = queryset.model._meta.pk.name
+        names = {field.lstrip("-") for field in ordering}
+        if not names & {"pk", pk_name}:
+            prefix = "-" if ordering[0].startswith("-") else ""
+            ordering.append(f"{prefix}{pk_name}")
+        return ordering
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps({"p": position, "r": reverse}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw.encode()))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _after(self, ordering, position):
+        """Build the filter selecting rows strictly after ``position``."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if name == "pk":
+                position.append(instance.pk)
+                continue
+            try:
+                name = instance._meta.get_field(name).attname
+            except FieldDoesNotExist:
+                pass  # an annotation, such as a search rank
+            position.append(getattr(instance, name))
+        return position
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        return rows
+
+    def _link(self, instance, reverse):
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self._position(instance), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
@@ -1,8 +1,17 @@
 """Unit tests for the core app."""
 
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from apps.chores.models import Chore, Entry
+from apps.families.models import Family, Membership
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
 from .models import User
+from .pagination import KeysetPagination
 
 
 class UserModelTests(TestCase):
@@ -16,3 +25,61 @@ class UserModelTests(TestCase):
         user = User.objects.create_superuser("admin@example.com", "pass")
         self.assertTrue(user.is_staff)
         self.assertTrue(user.is_superuser)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user("parent@example.com", "pass")
+        family = Family.objects.create(name="Smith", owner=self.user)
+        Membership.objects.create(
+            user=self.user, family=family, role=Membership.Role.PARENT
+        )
+        self.client.force_authenticate(user=self.user)
+        chore = Chore.objects.create(family=family, name="Sweep", schedule="daily")
+        # Several entries share a due date so pages must split ties cleanly.
+        Entry.objects.bulk_create(
+            Entry(
+                family=family,
+                chore=chore,
+                assigned_to=self.user,
+                due_date=date(2025, 1, 1) + timedelta(days=i // 3),
+            )
+            for i in range(10)
+        )
+
+    def test_pages_follow_ordering_without_gaps_or_count(self):
+        expected = list(
+            Entry.objects.order_by("-due_date", "-id").values_list("id", flat=True)
+        )
+        seen = []
+        url = "/api/chore-entries/?page_size=4"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertFalse(
+                any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+            )
+            seen.extend(row["id"] for row in resp.data["results"])
+            last = resp.data
+            url = resp.data["next"]
+        self.assertEqual(seen, expected)
+
+        resp = self.client.get(last["previous"])
+        self.assertEqual([row["id"] for row in resp.data["results"]], expected[4:8])
+
+    def test_unordered_queryset_follows_meta_ordering(self):
+        paginator = KeysetPagination()
+        self.assertEqual(paginator.get_ordering(Entry.objects.all()), ["pk"])
+        with patch.object(Entry._meta, "ordering", ["-due_date"]):
+            self.assertEqual(
+                paginator.get_ordering(Entry.objects.all()), ["-due_date", "-id"]
+            )
+            self.assertEqual(
+                paginator.get_ordering(Entry.objects.order_by("id")), ["id"]
+            )
+
+    def test_invalid_cursor(self):
+        resp = self.client.get("/api/chore-entries/?cursor=bogus")
+        self.assertEqual(resp.status_code, 404)
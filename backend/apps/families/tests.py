@@ -52,8 +52,8 @@ class FamilyAPITests(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.family.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.family.id)
 
     def test_cannot_access_non_member_family(self):
         other_family = Family.objects.create(name="Jones", owner=self.other_user)
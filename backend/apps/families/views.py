@@ -61,7 +61,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
         qs = Invitation.objects.filter(family__memberships__user=self.request.user)
         if family_id:
             qs = qs.filter(family_id=family_id)
-        return qs.order_by("-created")
+        return qs.order_by("-created_at")
 
     def perform_create(self, serializer):
         serializer.save()
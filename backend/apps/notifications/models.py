@@ -17,5 +17,10 @@ class Notification(models.Model):
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="notif_user_created_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return self.message
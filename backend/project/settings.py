@@ -113,6 +113,24 @@ else:
         }
     }
 
+# Cache shared by web and worker processes (report results). Development on
+# SQLite uses a per-process in-memory cache instead of Redis.
+if os.environ.get("FAMPLUS_SQLITE"):
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env(
+                "CACHE_URL",
+                cast=str,
+                default="redis://127.0.0.1:6379/1",  # type: ignore[arg-type]
+            ),
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -152,6 +170,11 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+MEDIA_URL = "media/"
+MEDIA_ROOT = env(
+    "MEDIA_ROOT", cast=str, default=BASE_DIR / "media"  # type: ignore[arg-type]
+)
+
 # Custom user model
 AUTH_USER_MODEL = "core.User"
 
@@ -160,6 +183,8 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
 # Default primary key field type
@@ -179,6 +204,74 @@ CELERY_RESULT_BACKEND = env(
     default=CELERY_BROKER_URL, # type: ignore[arg-type]
 )
 
+# CSV uploads larger than this are imported by a background job.
+TRANSACTION_IMPORT_SYNC_MAX_BYTES = env(
+    "TRANSACTION_IMPORT_SYNC_MAX_BYTES",
+    cast=int,
+    default=1024 * 1024,  # type: ignore[arg-type]
+)
+TRANSACTION_IMPORT_CHUNK_SIZE = env(
+    "TRANSACTION_IMPORT_CHUNK_SIZE", cast=int, default=1000  # type: ignore[arg-type]
+)
+# A running import whose last chunk is older than this may be taken over.
+TRANSACTION_IMPORT_LEASE_SECONDS = env(
+    "TRANSACTION_IMPORT_LEASE_SECONDS", cast=int, default=300  # type: ignore[arg-type]
+)
+
+# Months covered by each account balance checkpoint (1 = monthly).
+BALANCE_CHECKPOINT_MONTHS = env(
+    "BALANCE_CHECKPOINT_MONTHS", cast=int, default=1  # type: ignore[arg-type]
+)
+
+# Families whose category suggestion index is kept in memory (LRU).
+CATEGORY_SUGGESTION_FAMILIES = env(
+    "CATEGORY_SUGGESTION_FAMILIES", cast=int, default=256  # type: ignore[arg-type]
+)
+
+# Price providers tried in order; an asset's own provider goes first.
+PRICE_PROVIDERS = env.list(
+    "PRICE_PROVIDERS", default=["coingecko", "static"]  # type: ignore[arg-type]
+)
+# ``symbol,price`` CSV read by the "static" provider (shares, collectibles).
+PRICE_STATIC_FILE = env(
+    "PRICE_STATIC_FILE", cast=str, default=""  # type: ignore[arg-type]
+)
+# Register the "fake" provider (development and load tests only).
+PRICE_FAKE_PROVIDER = env(
+    "PRICE_FAKE_PROVIDER", cast=bool, default=False  # type: ignore[arg-type]
+)
+# Days of price history kept per resolution: raw ticks, then hourly and
+# daily candles. 0 keeps that resolution forever.
+PRICE_RETENTION_DAYS = {
+    "raw": env(
+        "PRICE_RAW_RETENTION_DAYS", cast=int, default=7  # type: ignore[arg-type]
+    ),
+    "1h": env(
+        "PRICE_HOURLY_RETENTION_DAYS", cast=int, default=90  # type: ignore[arg-type]
+    ),
+    "1d": env(
+        "PRICE_DAILY_RETENTION_DAYS", cast=int, default=0  # type: ignore[arg-type]
+    ),
+}
+# Rows removed per DELETE when pruning price history.
+PRICE_DELETE_CHUNK_SIZE = env(
+    "PRICE_DELETE_CHUNK_SIZE", cast=int, default=5000  # type: ignore[arg-type]
+)
+
+# CoinGecko request quota shared by every web and Celery process through the
+# cache (Redis), so it is the deployment's total, not a per-worker figure.
+COINGECKO_REQUESTS_PER_MINUTE = env(
+    "COINGECKO_REQUESTS_PER_MINUTE", cast=float, default=30  # type: ignore[arg-type]
+)
+COINGECKO_BURST = env("COINGECKO_BURST", cast=int, default=5)  # type: ignore[arg-type]
+# Batches of one price refresh in flight at once, and the refresh's deadline.
+COINGECKO_CONCURRENCY = env(
+    "COINGECKO_CONCURRENCY", cast=int, default=4  # type: ignore[arg-type]
+)
+COINGECKO_FETCH_TIMEOUT = env(
+    "COINGECKO_FETCH_TIMEOUT", cast=float, default=600  # type: ignore[arg-type]
+)
+
 CELERY_BEAT_SCHEDULE = {
     "spawn_entries": {
         "task": "apps.chores.tasks.spawn_entries",
@@ -186,12 +279,32 @@ CELERY_BEAT_SCHEDULE = {
     },
     "daily_summary": {
         "task": "apps.accounting.tasks.daily_summary",
-        "schedule": crontab(minute="0", hour="1"),
+        "schedule": crontab(minute="*/15"),
+    },
+    "pay_monthly_interest": {
+        "task": "apps.accounting.tasks.pay_monthly_interest",
+        "schedule": crontab(minute="0", hour="2", day_of_month="1"),
+    },
+    "write_balance_checkpoints": {
+        "task": "apps.accounting.tasks.write_balance_checkpoints",
+        "schedule": crontab(minute="30", hour="1"),
+    },
+    "reconcile_budgets": {
+        "task": "apps.accounting.tasks.reconcile_budgets",
+        "schedule": crontab(minute="45", hour="1"),
+    },
+    "notify_over_budget": {
+        "task": "apps.accounting.tasks.notify_over_budget",
+        "schedule": crontab(minute="5"),
     },
     "fetch_latest_prices": {
         "task": "apps.assets.tasks.fetch_latest_prices",
         "schedule": crontab(minute="*/30"),
     },
+    "compact_price_history": {
+        "task": "apps.assets.tasks.compact_price_history",
+        "schedule": crontab(minute="10"),
+    },
     "send_due_chore_notifications": {
         "task": "apps.notifications.tasks.send_due_chore_notifications",
         "schedule": crontab(minute="0", hour="7"),
@@ -2,13 +2,17 @@
 
 from apps.accounting.views import (
     AccountViewSet,
+    BudgetViewSet,
     CategoryViewSet,
+    ImportJobViewSet,
     JournalViewSet,
+    ReportViewSet,
     TransactionViewSet,
 )
 from apps.assets.views import (
     AssetTransactionLinkViewSet,
     AssetViewSet,
+    PriceCandleViewSet,
     PriceViewSet,
     ExchangeOrderViewSet,
     ExchangeTradeViewSet,
@@ -30,9 +34,13 @@ router.register("chore-entries", EntryViewSet, basename="entry")
 router.register("accounts", AccountViewSet, basename="account")
 router.register("categories", CategoryViewSet, basename="category")
 router.register("journals", JournalViewSet, basename="journal")
+router.register("budgets", BudgetViewSet, basename="budget")
 router.register("transactions", TransactionViewSet, basename="transaction")
+router.register("import-jobs", ImportJobViewSet, basename="importjob")
+router.register("reports", ReportViewSet, basename="report")
 router.register("assets", AssetViewSet, basename="asset")
 router.register("asset-prices", PriceViewSet, basename="price")
+router.register("asset-candles", PriceCandleViewSet, basename="pricecandle")
 router.register(
     "asset-links",
     AssetTransactionLinkViewSet,
@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { api, fetchAll } from '@/lib/api';
 import { ResponsiveTable } from '@/components/ui/responsive-table';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -27,15 +27,12 @@ export function AccountsAdmin() {
 
   const { data: members } = useQuery<Member[]>({
     queryKey: ['members'],
-    queryFn: async () => (await api.get('/family-memberships/')).data,
+    queryFn: () => fetchAll<Member>('/family-memberships/'),
   });
 
   const { data: accounts, isLoading } = useQuery<Account[]>({
     queryKey: ['accounts-admin', filter],
-    queryFn: async () => {
-      const params = filter === 'all' ? {} : { owner: filter };
-      return (await api.get('/accounts/', { params })).data;
-    },
+    queryFn: () => fetchAll<Account>('/accounts/', filter === 'all' ? {} : { owner: filter }),
   });
 
   const addAccount = useMutation({
@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { api, fetchAll } from '@/lib/api';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { ResponsiveTable } from '@/components/ui/responsive-table';
@@ -39,15 +39,12 @@ export function ChoresAdmin() {
 
   const { data: members } = useQuery<Member[]>({
     queryKey: ['members'],
-    queryFn: async () => (await api.get('/family-memberships/')).data,
+    queryFn: () => fetchAll<Member>('/family-memberships/'),
   });
 
   const { data: chores, isLoading } = useQuery<Chore[]>({
     queryKey: ['chores-admin', filter],
-    queryFn: async () => {
-      const params = filter === 'all' ? {} : { assigned_to: filter };
-      return (await api.get('/chores/', { params })).data;
-    },
+    queryFn: () => fetchAll<Chore>('/chores/', filter === 'all' ? {} : { assigned_to: filter }),
   });
 
   const addChore = useMutation({
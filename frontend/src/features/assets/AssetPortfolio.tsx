@@ -10,7 +10,7 @@ import {
   Tooltip,
 } from 'chart.js';
 import { useQuery } from '@tanstack/react-query';
-import { api } from '../../lib/api';
+import { fetchAll } from '../../lib/api';
 import { Card, CardContent, CardHeader } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -23,11 +23,11 @@ interface Asset {
   current_price: string | null;
 }
 
-interface Price {
+interface Candle {
   id: number;
   asset: number;
-  value: string;
-  timestamp: string;
+  start: string;
+  close: string;
 }
 
 ChartJS.register(CategoryScale, LinearScale, PointElement, LineElement, TimeScale, Tooltip);
@@ -42,28 +42,26 @@ export default function AssetPortfolio() {
 
   const { data: assets, isLoading } = useQuery<Asset[]>({
     queryKey: ['assets'],
-    queryFn: async () => {
-      const res = await api.get('/assets/');
-      return res.data as Asset[];
-    },
+    queryFn: () => fetchAll<Asset>('/assets/'),
   });
 
-  const { data: prices } = useQuery<Price[]>({
-    queryKey: ['prices', selected],
+  // Daily candles for the last year; raw ticks are only kept for a week.
+  const { data: prices } = useQuery<Candle[]>({
+    queryKey: ['candles', selected],
     queryFn: async () => {
-      if (!selected) return [] as Price[];
-      const res = await api.get('/asset-prices/', { params: { asset: selected } });
-      return res.data as Price[];
+      if (!selected) return [] as Candle[];
+      const since = new Date(Date.now() - 365 * 24 * 60 * 60 * 1000).toISOString();
+      return fetchAll<Candle>('/asset-candles/', { asset: selected, resolution: '1d', since });
     },
     enabled: !!selected,
   });
 
   const chartData = {
-    labels: prices?.map((p) => p.timestamp) ?? [],
+    labels: prices?.map((p) => p.start) ?? [],
     datasets: [
       {
         label: 'Price',
-        data: prices?.map((p) => p.value) ?? [],
+        data: prices?.map((p) => p.close) ?? [],
         borderColor: 'rgb(37, 99, 235)',
         backgroundColor: 'rgba(37, 99, 235, 0.4)',
       },
@@ -1,6 +1,6 @@
 import { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { api, fetchAll, fetchPage, pageCursor } from '@/lib/api';
 import { Card, CardHeader, CardContent } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
@@ -40,25 +40,35 @@ export default function VirtualExchange() {
 
   const { data: assets } = useQuery<Asset[]>({
     queryKey: ['assets'],
-    queryFn: async () => (await api.get('/assets/')).data,
+    queryFn: () => fetchAll<Asset>('/assets/'),
   });
 
-  const { data: orders } = useQuery<Order[]>({
+  // Order and trade history grow without bound, so they are paged.
+  const {
+    data: orderPages,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ['orders', assetId],
-    queryFn: async () => (await api.get('/exchange-orders/', { params: { asset: assetId } })).data,
+    queryFn: ({ pageParam }) =>
+      fetchPage<Order>('/exchange-orders/', { asset: assetId }, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (page) => pageCursor(page.next),
     enabled: assetId != null,
   });
+  const orders = orderPages?.pages.flatMap((page) => page.results);
 
   const { data: trades } = useQuery<Trade[]>({
     queryKey: ['trades', assetId],
-    queryFn: async () => (await api.get('/exchange-trades/', { params: { asset: assetId } })).data,
+    queryFn: async () => (await fetchPage<Trade>('/exchange-trades/', { asset: assetId })).results,
     enabled: assetId != null,
   });
 
   // order book (all open orders)
   const { data: book } = useQuery<Order[]>({
     queryKey: ['orderbook', assetId],
-    queryFn: async () => (await api.get('/exchange-orders/', { params: { asset: assetId, book: 1 } })).data,
+    queryFn: () => fetchAll<Order>('/exchange-orders/', { asset: assetId, book: 1 }),
     enabled: assetId != null,
     staleTime: 5000,
     refetchInterval: 5000,
@@ -154,6 +164,16 @@ export default function VirtualExchange() {
                 ))}
               </tbody>
             </Table>
+            {hasNextPage && (
+              <Button
+                variant="link"
+                size="sm"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                Load more
+              </Button>
+            )}
           </div>
         )}
 
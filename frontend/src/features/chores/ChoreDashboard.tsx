@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { api, fetchAll, fetchPage, pageCursor } from '@/lib/api';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Card, CardContent, CardHeader } from '@/components/ui/card';
@@ -19,17 +19,18 @@ interface Chore { id: number; name: string; points: number; }
 export default function ChoreDashboard() {
   const queryClient = useQueryClient();
 
-  const { data: entries, isLoading } = useQuery<Entry[]>({
+  // Entries accumulate every day, so they are paged rather than fetched whole.
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['chore-entries'],
-    queryFn: async () => {
-      const res = await api.get('/chore-entries/');
-      return res.data as Entry[];
-    },
+    queryFn: ({ pageParam }) => fetchPage<Entry>('/chore-entries/', {}, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (page) => pageCursor(page.next),
   });
+  const entries = data?.pages.flatMap((page) => page.results);
 
   const { data: chores } = useQuery<Chore[]>({
     queryKey: ['chores'],
-    queryFn: async () => (await api.get('/chores/')).data,
+    queryFn: () => fetchAll<Chore>('/chores/'),
   });
 
   const approveMutation = useMutation({
@@ -105,6 +106,16 @@ export default function ChoreDashboard() {
             ]}
           />
         )}
+        {hasNextPage && (
+          <Button
+            size="sm"
+            className="mt-4"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+          >
+            {isFetchingNextPage ? 'Loading…' : 'Load more'}
+          </Button>
+        )}
       </CardContent>
     </Card>
   );
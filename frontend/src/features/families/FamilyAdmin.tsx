@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { api } from '@/lib/api';
+import { api, fetchAll } from '@/lib/api';
 import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardHeader } from '@/components/ui/card';
@@ -26,10 +26,7 @@ export default function FamilyAdmin() {
     isPending: isLoading,
   } = useQuery<Family[]>({
     queryKey: ['families'],
-    queryFn: async () => {
-      const res = await api.get('/families/');
-      return res.data as Family[];
-    },
+    queryFn: () => fetchAll<Family>('/families/'),
   });
 
   const createFamily = useMutation({
@@ -64,15 +61,13 @@ export default function FamilyAdmin() {
 
   const { data: members } = useQuery<Membership[]>({
     queryKey: ['members', selectedFamily?.id],
-    queryFn: async () =>
-      (await api.get('/family-memberships/', { params: { family: selectedFamily?.id } })).data,
+    queryFn: () => fetchAll<Membership>('/family-memberships/', { family: selectedFamily?.id }),
     enabled: !!selectedFamily,
   });
 
   const { data: invites } = useQuery<Invitation[]>({
     queryKey: ['invites', selectedFamily?.id],
-    queryFn: async () =>
-      (await api.get('/family-invitations/', { params: { family: selectedFamily?.id } })).data,
+    queryFn: () => fetchAll<Invitation>('/family-invitations/', { family: selectedFamily?.id }),
     enabled: !!selectedFamily,
   });
 
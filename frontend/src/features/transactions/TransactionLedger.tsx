@@ -1,6 +1,7 @@
 import { useState } from 'react';
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
-import { api } from '../../lib/api';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { api, fetchAll, fetchPage, pageCursor } from '../../lib/api';
+import { Button } from '@/components/ui/button';
 import { Select } from '@/components/ui/select';
 import { ResponsiveTable } from '@/components/ui/responsive-table';
 
@@ -24,24 +25,22 @@ export default function TransactionLedger() {
 
   const { data: categories } = useQuery<Category[]>({
     queryKey: ['categories'],
-    queryFn: async () => {
-      const res = await api.get('/categories/');
-      return res.data as Category[];
-    },
+    queryFn: () => fetchAll<Category>('/categories/'),
   });
 
-  const {
-    data: transactions,
-    isLoading,
-  } = useQuery<Transaction[]>({
+  // One page at a time: the ledger grows with the family's whole history.
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['transactions', categoryFilter],
-    queryFn: async () => {
-      const res = await api.get('/transactions/', {
-        params: categoryFilter === 'all' ? {} : { category: categoryFilter },
-      });
-      return res.data as Transaction[];
-    },
+    queryFn: ({ pageParam }) =>
+      fetchPage<Transaction>(
+        '/transactions/',
+        categoryFilter === 'all' ? {} : { category: categoryFilter },
+        pageParam,
+      ),
+    initialPageParam: null as string | null,
+    getNextPageParam: (page) => pageCursor(page.next),
   });
+  const transactions = data?.pages.flatMap((page) => page.results);
 
   const updateCategory = useMutation({
     mutationFn: ({ id, category }: { id: number; category: number | null }) =>
@@ -120,6 +119,11 @@ export default function TransactionLedger() {
           ]}
         />
       )}
+      {hasNextPage && (
+        <Button className="mt-4" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+          {isFetchingNextPage ? 'Loading...' : 'Load more'}
+        </Button>
+      )}
     </div>
   );
 }
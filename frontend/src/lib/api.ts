@@ -65,6 +65,48 @@ api.interceptors.response.use(
   }
 );
 
+// One page of a keyset-paginated list endpoint.
+export interface Page<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+// Largest page the backend serves (KeysetPagination.max_page_size).
+const MAX_PAGE_SIZE = 500;
+
+// Cursor carried by a page's `next` or `previous` link; null at either end.
+export function pageCursor(link: string | null): string | null {
+  return link ? new URL(link).searchParams.get('cursor') : null;
+}
+
+// Fetch one page of a list endpoint, starting at `cursor` (null for the first).
+export async function fetchPage<T>(
+  url: string,
+  params: Record<string, unknown> = {},
+  cursor: string | null = null,
+): Promise<Page<T>> {
+  const res = await api.get<Page<T>>(url, { params: { ...params, ...(cursor && { cursor }) } });
+  return res.data;
+}
+
+// Fetch every row of a list endpoint by following its `next` cursors.
+// Only for small lookup lists (accounts, categories, chores); long histories
+// such as the ledger page through `fetchPage` instead.
+export async function fetchAll<T>(
+  url: string,
+  params: Record<string, unknown> = {},
+): Promise<T[]> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage<T>(url, { ...params, page_size: MAX_PAGE_SIZE }, cursor);
+    rows.push(...page.results);
+    cursor = pageCursor(page.next);
+  } while (cursor);
+  return rows;
+}
+
 // Helper for typed fetch calls (alternative to axios)
 export async function typedFetch<T>(
   url: string,